@@ -0,0 +1,23 @@
+# arquivos_json.py - Gravação atômica dos arquivos de estado em JSON (manifesto, cache, marcas do Drive, estado HTTP)
+#
+# Só usa a biblioteca padrão: é importado pelo busca_http, que precisa continuar leve (ver scraper_semanal.py).
+
+import os
+import json
+
+# --- Configurações ---
+# Arquivos de estado dos scrapers (ids do Drive, marca da listagem, validadores HTTP). Ficam numa subpasta do
+# cache dos boletins para irem junto no actions/cache, mas separados das entradas que o podar_cache remove.
+PASTA_ESTADO = os.path.join(".cache_boletins", "estado")
+
+def gravar_json(caminho, dados, indent=2, sort_keys=True):
+    """Grava `dados` em `caminho` por um arquivo temporário renomeado no fim.
+
+    Quem lê o arquivo (outro processo, ou a próxima execução depois de uma queda) vê o conteúdo antigo ou o
+    novo, nunca um JSON pela metade. O temporário leva o pid para que processos concorrentes não o dividam.
+    """
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+    with open(caminho_tmp, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=indent, sort_keys=sort_keys)
+    os.replace(caminho_tmp, caminho)
@@ -0,0 +1,176 @@
+# banco_sqlite.py - Banco SQLite local (pontos, boletins e observações diárias), gravado em transações com upsert
+
+import sqlite3
+import argparse
+import pandas as pd
+from destinos import Destino
+from historico_parquet import carregar_historico
+
+# --- Configurações ---
+ARQUIVO_SQLITE = "balneabilidade.sqlite3"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pontos (
+    id_ponto    TEXT PRIMARY KEY,
+    nome_praia  TEXT,
+    zona        TEXT,
+    latitude    REAL,
+    longitude   REAL
+);
+CREATE TABLE IF NOT EXISTS boletins (
+    numero_boletim   TEXT PRIMARY KEY,
+    data_inicio      TEXT,
+    data_fim         TEXT,
+    periodo_validade TEXT,
+    link_boletim     TEXT,
+    data_extracao    TEXT
+);
+-- A chave primária começa por numero_boletim e já serve de índice para as buscas e remoções por boletim
+CREATE TABLE IF NOT EXISTS observacoes (
+    numero_boletim TEXT NOT NULL REFERENCES boletins (numero_boletim),
+    id_ponto       TEXT NOT NULL REFERENCES pontos (id_ponto),
+    data_coleta    TEXT NOT NULL,
+    status         TEXT,
+    PRIMARY KEY (numero_boletim, id_ponto, data_coleta)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_observacoes_ponto_data ON observacoes (id_ponto, data_coleta);
+"""
+
+# O último boletim gravado define nome, zona e coordenadas do ponto; coordenadas vazias não apagam as conhecidas
+_UPSERT_PONTO = """
+INSERT INTO pontos (id_ponto, nome_praia, zona, latitude, longitude) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id_ponto) DO UPDATE SET
+    nome_praia = excluded.nome_praia,
+    zona = excluded.zona,
+    latitude = COALESCE(excluded.latitude, pontos.latitude),
+    longitude = COALESCE(excluded.longitude, pontos.longitude)
+"""
+# O link do Drive/site é mantido quando o boletim é regravado a partir de um PDF local (link vazio)
+_UPSERT_BOLETIM = """
+INSERT INTO boletins (numero_boletim, data_inicio, data_fim, periodo_validade, link_boletim, data_extracao)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (numero_boletim) DO UPDATE SET
+    data_inicio = excluded.data_inicio,
+    data_fim = excluded.data_fim,
+    periodo_validade = excluded.periodo_validade,
+    link_boletim = COALESCE(NULLIF(excluded.link_boletim, ''), boletins.link_boletim),
+    data_extracao = excluded.data_extracao
+"""
+_INSERE_OBSERVACAO = "INSERT INTO observacoes (numero_boletim, id_ponto, data_coleta, status) VALUES (?, ?, ?, ?)"
+
+def abrir_banco(arquivo=ARQUIVO_SQLITE):
+    """Abre (criando as tabelas se preciso) o banco em modo WAL: leitores não bloqueiam a gravação."""
+    conexao = sqlite3.connect(arquivo)
+    conexao.execute("PRAGMA journal_mode = WAL")
+    conexao.execute("PRAGMA synchronous = NORMAL")  # seguro com WAL; só a última transação pode se perder numa queda de energia
+    conexao.execute("PRAGMA foreign_keys = ON")
+    conexao.executescript(ESQUEMA)
+    return conexao
+
+def _linhas(df, colunas):
+    # sqlite3 não aceita NaN/NaT como nulo nem tipos do numpy como inteiros
+    return df[colunas].astype(object).where(df[colunas].notna(), None).values.tolist()
+
+def _texto_data(serie, formato="%Y-%m-%d"):
+    return pd.to_datetime(serie).dt.strftime(formato)
+
+def _por_dia(df):
+    # Tabela de uma linha por período (expandir=False): gera as observações de cada dia do período
+    if "data_coleta" in df.columns:
+        return df.assign(data_coleta=_texto_data(df["data_coleta"]))
+    dias = [pd.date_range(inicio, fim, freq="D") for inicio, fim in zip(df["data_inicio"], df["data_fim"])]
+    df = df.loc[df.index.repeat([len(d) for d in dias])].copy()
+    df["data_coleta"] = [dia.strftime("%Y-%m-%d") for periodo in dias for dia in periodo]
+    return df
+
+def gravar_boletins_sqlite(conexao, df):
+    """Grava os boletins de `df` numa única transação e devolve o número de observações gravadas.
+
+    Pontos e boletins são atualizados por upsert; as observações de cada boletim presente em `df` são
+    substituídas por inteiro, de modo que regravar um boletim (inclusive com menos pontos) não deixa sobras.
+    """
+    if df.empty: return 0
+    df = _por_dia(df.reset_index(drop=True))
+    df["numero_boletim"] = df["numero_boletim"].astype(str)
+
+    pontos = df.drop_duplicates("id_ponto", keep="last")
+    grupos = df.groupby("numero_boletim", sort=False)
+    boletins = grupos.first()
+    boletins["data_inicio"] = grupos["data_coleta"].min()
+    boletins["data_fim"] = grupos["data_coleta"].max()
+    boletins["data_extracao"] = _texto_data(boletins["data_extracao"], "%Y-%m-%d %H:%M:%S")
+    boletins = boletins.reset_index()
+    observacoes = df.drop_duplicates(["numero_boletim", "id_ponto", "data_coleta"], keep="last")
+
+    with conexao:  # commit no fim, rollback se algo falhar
+        conexao.executemany(_UPSERT_PONTO, _linhas(pontos, ["id_ponto", "nome_praia", "zona", "latitude", "longitude"]))
+        conexao.executemany(_UPSERT_BOLETIM, _linhas(boletins, ["numero_boletim", "data_inicio", "data_fim",
+                                                                "periodo_validade", "link_boletim", "data_extracao"]))
+        conexao.executemany("DELETE FROM observacoes WHERE numero_boletim = ?", [[b] for b in boletins["numero_boletim"]])
+        conexao.executemany(_INSERE_OBSERVACAO, _linhas(observacoes, ["numero_boletim", "id_ponto", "data_coleta", "status"]))
+    return len(observacoes)
+
+def carregar_observacoes(conexao, id_ponto=None, inicio=None, fim=None):
+    """Observações no formato da planilha (colunas de COLUNAS_FINAIS), filtradas por ponto e período (aaaa-mm-dd)."""
+    condicoes, parametros = [], []
+    if id_ponto is not None:
+        condicoes.append("o.id_ponto = ?"); parametros.append(id_ponto)
+    if inicio is not None:
+        condicoes.append("o.data_coleta >= ?"); parametros.append(str(inicio))
+    if fim is not None:
+        condicoes.append("o.data_coleta <= ?"); parametros.append(str(fim))
+    consulta = f"""
+        SELECT o.id_ponto, o.data_coleta, p.nome_praia, p.zona, o.status, p.latitude, p.longitude,
+               o.numero_boletim, b.link_boletim, b.data_extracao, b.periodo_validade
+        FROM observacoes o
+        JOIN pontos p ON p.id_ponto = o.id_ponto
+        JOIN boletins b ON b.numero_boletim = o.numero_boletim
+        {"WHERE " + " AND ".join(condicoes) if condicoes else ""}
+        ORDER BY o.numero_boletim, o.data_coleta, o.id_ponto
+    """
+    return pd.read_sql_query(consulta, conexao, params=parametros)
+
+class DestinoSQLite(Destino):
+    """Grava os boletins no banco SQLite local; toda a fila vai numa transação só em `descarregar()`."""
+
+    nome = "sqlite"
+
+    def __init__(self, arquivo=ARQUIVO_SQLITE):
+        self.arquivo = arquivo
+        self.conexao = abrir_banco(arquivo)
+        self._pendentes = []
+        self.transacoes = 0
+
+    def boletins_existentes(self):
+        return {numero for (numero,) in self.conexao.execute("SELECT numero_boletim FROM boletins")}
+
+    def adicionar(self, df):
+        if df.empty: return 0
+        self._pendentes.append(df)
+        return len(df)
+
+    def descarregar(self):
+        if not self._pendentes: return 0
+        linhas = gravar_boletins_sqlite(self.conexao, pd.concat(self._pendentes, ignore_index=True))
+        self._pendentes = []
+        self.transacoes += 1
+        return linhas
+
+    def metricas(self):
+        return {"transacoes_sqlite": self.transacoes}
+
+    def fechar(self):
+        self.conexao.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cria/atualiza o banco SQLite local dos boletins.")
+    parser.add_argument("--arquivo", default=ARQUIVO_SQLITE, help="Arquivo do banco SQLite.")
+    parser.add_argument("--de-parquet", metavar="PASTA", help="Grava no banco todos os boletins do dataset Parquet.")
+    args = parser.parse_args()
+
+    conexao = abrir_banco(args.arquivo)
+    if args.de_parquet:
+        print(f"{gravar_boletins_sqlite(conexao, carregar_historico(args.de_parquet))} observações gravadas.")
+    for tabela in ("pontos", "boletins", "observacoes"):
+        print(f"{tabela}: {conexao.execute(f'SELECT COUNT(*) FROM {tabela}').fetchone()[0]} linhas")
+    conexao.close()
@@ -0,0 +1,74 @@
+# benchmarks/bench_abertura_pdf.py - Latência por PDF e pico de memória: fluxo antigo x documento aberto uma vez
+#
+# Uso: python benchmarks/bench_abertura_pdf.py [--limite N]
+# Cada modo roda em um subprocesso próprio para que o pico de RSS de um não contamine o outro.
+
+import sys
+import json
+import argparse
+import subprocess
+import warnings
+
+from comum import listar_pdfs, percentil, pico_rss_mb, cronometrar
+from core_parser import DocumentoBoletim, extrair_metadados_pdf, processar_pdf_completo
+
+def _fluxo_antigo(caminho):
+    # Como os scrapers faziam: uma abertura só para o número do boletim e outra para o processamento.
+    extrair_metadados_pdf(caminho)
+    return processar_pdf_completo(caminho)
+
+def _fluxo_documento(caminho):
+    with DocumentoBoletim(caminho) as doc:
+        doc.metadados()
+        return doc.processar()
+
+def _somente_metadados(caminho):
+    with DocumentoBoletim(caminho) as doc:
+        return doc.metadados()
+
+MODOS = {
+    "antes": _fluxo_antigo,
+    "depois": _fluxo_documento,
+    "metadados": _somente_metadados,
+}
+
+def medir_modo(modo, limite=None):
+    caminhos = listar_pdfs()[:limite]
+    funcao = MODOS[modo]
+    latencias = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for caminho in caminhos:
+            _, segundos = cronometrar(funcao, caminho)
+            latencias.append(segundos)
+    return {
+        "modo": modo,
+        "arquivos": len(caminhos),
+        "total_s": sum(latencias),
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p95_ms": percentil(latencias, 95) * 1000,
+        "pico_rss_mb": pico_rss_mb(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o fluxo antigo de abertura dos PDFs com o DocumentoBoletim.")
+    parser.add_argument("--limite", type=int, default=None, help="Usa apenas os N primeiros PDFs.")
+    parser.add_argument("--modo", choices=MODOS, help=argparse.SUPPRESS)  # usado pelos subprocessos
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(medir_modo(args.modo, args.limite)))
+        return
+
+    print(f"{'modo':<10} {'arquivos':>8} {'total (s)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'pico RSS (MB)':>14}")
+    for modo in MODOS:
+        comando = [sys.executable, __file__, "--modo", modo]
+        if args.limite:
+            comando += ["--limite", str(args.limite)]
+        saida = subprocess.run(comando, check=True, capture_output=True, text=True).stdout
+        r = json.loads(saida.strip().splitlines()[-1])
+        rss = f"{r['pico_rss_mb']:.1f}" if r["pico_rss_mb"] is not None else "n/d"
+        print(f"{r['modo']:<10} {r['arquivos']:>8} {r['total_s']:>10.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {rss:>14}")
+
+if __name__ == "__main__":
+    main()
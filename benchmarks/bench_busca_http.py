@@ -0,0 +1,67 @@
+# benchmarks/bench_busca_http.py - Pedidos e bytes do scraper semanal contra um servidor local da SEMACE
+#
+# Uso: python benchmarks/bench_busca_http.py
+# Reproduz o caminho de rede do scraper_semanal em semanas sucessivas e compara o fluxo antigo (requests.get
+# sem condicionais nem sessão) com o BuscaCondicional.
+
+import os
+import tempfile
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from comum import listar_pdfs
+from servidor_semace_falso import ServidorSemaceFalso
+from busca_http import BuscaCondicional
+
+def _primeiro_link(html, url_pagina):
+    soup = BeautifulSoup(html, "html.parser")
+    links = [a["href"] for a in soup.find_all("a", href=True) if "Boletim das Praias de Fortaleza" in a.get_text()]
+    return urljoin(url_pagina, links[0])
+
+def _semana_antiga(servidor, destino):
+    res = requests.get(servidor.url_pagina)
+    url_pdf = _primeiro_link(res.text, servidor.url_pagina)
+    res_pdf = requests.get(url_pdf, stream=True)
+    with open(destino, "wb") as f:
+        f.write(res_pdf.content)
+
+def _semana_nova(servidor, destino, arquivo_estado):
+    # Mesmo roteiro do scraper_semanal.main, sem a parte do Google
+    busca = BuscaCondicional(arquivo_estado=arquivo_estado)
+    html = busca.buscar_texto(servidor.url_pagina)
+    if html is None:
+        return
+    url_pdf = _primeiro_link(html, servidor.url_pagina)
+    if not busca.ja_processado(url_pdf) and busca.baixar_arquivo(url_pdf, destino):
+        busca.marcar_processado(url_pdf, os.path.basename(url_pdf))
+    busca.salvar()
+
+def main():
+    pdfs = listar_pdfs()
+    pasta = tempfile.mkdtemp()
+    destino, arquivo_estado = os.path.join(pasta, "boletim.pdf"), os.path.join(pasta, "estado_http.json")
+    # Semana 1: boletim novo; semana 2: nada muda; semana 3: a página muda mas o último boletim é o mesmo;
+    # semana 4: sai um boletim novo.
+    roteiro = [("boletim novo", None), ("sem alterações", None), ("página alterada", "alterar"), ("boletim novo", "publicar")]
+
+    print(f"{'semana':<22}{'fluxo':<10}{'pedidos':>9}{'304':>6}{'bytes':>9}{'conexões':>10}")
+    for nome_fluxo, fluxo in (("antigo", _semana_antiga), ("novo", _semana_nova)):
+        with ServidorSemaceFalso(pdfs[:5]) as servidor:
+            for semana, (descricao, evento) in enumerate(roteiro, start=1):
+                if evento == "alterar":
+                    servidor.aviso = "Praias monitoradas semanalmente."
+                elif evento == "publicar":
+                    servidor.publicar(pdfs[5])
+                servidor.zerar_contadores()
+                if fluxo is _semana_nova:
+                    fluxo(servidor, destino, arquivo_estado)
+                else:
+                    fluxo(servidor, destino)
+                c = servidor.contadores
+                print(f"{f'{semana}. {descricao}':<22}{nome_fluxo:<10}{c['pedidos']:>9}{c['respostas_304']:>6}"
+                      f"{c['bytes']:>9}{len(servidor.conexoes):>10}")
+
+if __name__ == "__main__":
+    main()
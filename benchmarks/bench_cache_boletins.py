@@ -0,0 +1,62 @@
+# benchmarks/bench_cache_boletins.py - Leitura pelo cache em disco x processamento do PDF, e poda do cache
+#
+# Uso: python benchmarks/bench_cache_boletins.py [--limite N]
+# Processa N PDFs de pdfs_historicos com um cache vazio, depois de novo com o cache cheio. Em seguida grava
+# entradas ao lado dos arquivos de estado dos scrapers (ids do Drive, marca da listagem, estado HTTP) e de
+# uma entrada de outra versão do parser, e confere que a poda só apaga a entrada antiga.
+
+import os
+import time
+import argparse
+import tempfile
+import warnings
+
+import pandas as pd
+
+from comum import listar_pdfs
+from arquivos_json import gravar_json
+from cache_boletins import DocumentoComCache, gravar_cache, podar_cache
+
+ARQUIVOS_ESTADO = ["ids_drive.json", "listagem_drive.json", "estado_http.json"]
+
+def _processar_todos(pdfs, pasta_cache):
+    inicio = time.perf_counter()
+    linhas = 0
+    for pdf in pdfs:
+        with DocumentoComCache(pdf, pasta_cache) as doc:
+            linhas += len(doc.processar())
+    return linhas, time.perf_counter() - inicio
+
+def conferir_poda(pasta_cache):
+    """Grava uma entrada com arquivos de estado e uma entrada antiga na pasta; devolve o que sobrou."""
+    for nome in ARQUIVOS_ESTADO:
+        gravar_json(os.path.join(pasta_cache, nome), {"conteudo": nome})
+        gravar_json(os.path.join(pasta_cache, "estado", nome), {"conteudo": nome})
+    gravar_json(os.path.join(pasta_cache, f"{'0' * 64}-camelot-{'0' * 12}.json"), {})
+    pontos = pd.DataFrame({"nome_praia": ["01L - P. do Futuro"], "status_sigla": ["P"]})
+    gravar_cache("1" * 64, "000000000-BOL", "01/01/2025 a 07/01/2025", pontos, pasta_cache)
+    podar_cache(pasta_cache, tamanho_maximo=0)  # com limite zero até as entradas atuais saem; o estado fica
+    return sorted(os.listdir(pasta_cache)), sorted(os.listdir(os.path.join(pasta_cache, "estado")))
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o cache dos boletins e confere que a poda preserva o estado.")
+    parser.add_argument("--limite", type=int, default=10, help="Quantos PDFs processar.")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    pdfs = listar_pdfs()[:args.limite]
+    pasta_cache = tempfile.mkdtemp()
+    linhas_frio, segundos_frio = _processar_todos(pdfs, pasta_cache)
+    linhas_quente, segundos_quente = _processar_todos(pdfs, pasta_cache)
+    print(f"{len(pdfs)} PDFs: sem cache {segundos_frio:.2f}s, com cache {segundos_quente:.3f}s "
+          f"({segundos_frio / segundos_quente:.0f}x)")
+    assert linhas_frio == linhas_quente, "o cache precisa devolver as mesmas linhas do processamento"
+
+    restantes, estado = conferir_poda(tempfile.mkdtemp())
+    print(f"Depois da poda: {restantes}; estado/: {estado}")
+    assert set(ARQUIVOS_ESTADO) <= set(restantes), "a poda do cache não pode apagar arquivos de estado"
+    assert estado == sorted(ARQUIVOS_ESTADO), "a poda do cache não pode apagar a pasta de estado"
+    assert not any(nome.startswith("0" * 64) for nome in restantes), "a entrada de outra versão deveria sair"
+
+if __name__ == "__main__":
+    main()
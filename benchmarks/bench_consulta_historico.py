@@ -0,0 +1,91 @@
+# benchmarks/bench_consulta_historico.py - Consultas ao histórico: filtros pandas sobre o CSV x IndiceHistorico
+#
+# Uso: python benchmarks/bench_consulta_historico.py [--csv historico_completo.csv] [--repeticoes N]
+# O jeito "ingênuo" é o que os consumidores do CSV fazem hoje: ler o arquivo inteiro e filtrar com pandas a
+# cada pergunta. Também é medido o pandas com o DataFrame já na memória, para separar o custo da leitura do
+# custo do filtro. As respostas dos dois lados são comparadas antes da medição.
+
+import time
+import argparse
+
+import pandas as pd
+
+from comum import RAIZ_PROJETO, cronometrar
+from consulta_historico import COLUNAS_INDICE, STATUS_IMPROPRIA, IndiceHistorico
+from historico_parquet import ARQUIVO_CSV_PLANILHA
+
+def _ler_csv(arquivo):
+    return pd.read_csv(arquivo, encoding="utf-8-sig", usecols=COLUNAS_INDICE, dtype=str)
+
+# --- Consultas em pandas ---
+def _sem_repeticoes(df):
+    # Mesma regra do índice: para o mesmo ponto e dia, vale o boletim de número maior
+    return df.sort_values("numero_boletim", kind="stable").drop_duplicates(["id_ponto", "data_coleta"], keep="last")
+
+def pandas_status_em(df, id_ponto, data):
+    linhas = _sem_repeticoes(df[(df["id_ponto"] == id_ponto) & (df["data_coleta"] == data)])
+    return linhas["status"].iloc[-1] if len(linhas) else None
+
+def pandas_taxa_impropria(df, id_ponto, inicio, fim):
+    linhas = _sem_repeticoes(df[(df["id_ponto"] == id_ponto) & (df["data_coleta"] >= inicio) & (df["data_coleta"] <= fim)])
+    return (linhas["status"] == STATUS_IMPROPRIA).mean() if len(linhas) else None
+
+def pandas_status_por_zona(df):
+    ultimo_dia = df["data_coleta"].max()
+    linhas = _sem_repeticoes(df[df["data_coleta"] == ultimo_dia])
+    contagem = linhas.groupby(["zona", "status"]).size()
+    return {zona: {status: int(n) for status, n in grupo.droplevel(0).items()} for zona, grupo in contagem.groupby(level=0)}
+
+def pandas_sequencia(df, id_ponto):
+    linhas = _sem_repeticoes(df[df["id_ponto"] == id_ponto]).sort_values("data_coleta", ascending=False)
+    dias = pd.to_datetime(linhas["data_coleta"])
+    atual = linhas["status"].iloc[0]
+    # A sequência acaba na primeira mudança de situação ou no primeiro dia sem boletim
+    quebra = (linhas["status"] != atual) | (dias.diff(-1).shift(1).fillna(pd.Timedelta(days=1)) != pd.Timedelta(days=1))
+    return atual, int(quebra.to_numpy().argmax()) if quebra.any() else len(linhas)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara consultas ao histórico em pandas com o IndiceHistorico.")
+    parser.add_argument("--csv", default=f"{RAIZ_PROJETO}/{ARQUIVO_CSV_PLANILHA}", help="CSV no formato da planilha.")
+    parser.add_argument("--repeticoes", type=int, default=200, help="Repetições de cada consulta no índice.")
+    args = parser.parse_args()
+
+    df, tempo_leitura = cronometrar(_ler_csv, args.csv, repeticoes=3)
+    indice, tempo_indice = cronometrar(IndiceHistorico.construir, df, repeticoes=3)
+    ultimo_dia = str(indice.dia_inicial + (indice.n_dias - 1))
+    ano = ultimo_dia[:4]
+    print(f"{len(df)} linhas, {len(indice.pontos)} pontos, {indice.n_dias} dias")
+    print(f"Leitura do CSV: {tempo_leitura * 1000:.1f} ms; montagem do índice: {tempo_indice * 1000:.1f} ms "
+          f"({indice.observado.nbytes + indice.impropria.nbytes} bytes de matriz)")
+
+    # Um ponto desconhecido não é erro em nenhuma consulta: responde como um ponto sem boletim
+    assert indice.status_em("99X", ultimo_dia) is None
+    assert indice.taxa_impropria("99X") is None
+    assert indice.sequencia("99X") == (None, 0)
+
+    consultas = [
+        ("status 12C em 2025-03-10",
+         lambda d: pandas_status_em(d, "12C", "2025-03-10"), lambda: indice.status_em("12C", "2025-03-10")),
+        (f"% dias impróprios 12C em {ano}",
+         lambda d: pandas_taxa_impropria(d, "12C", f"{ano}-01-01", f"{ano}-12-31"),
+         lambda: indice.taxa_impropria("12C", inicio=f"{ano}-01-01", fim=f"{ano}-12-31")),
+        ("situação atual por zona", pandas_status_por_zona, lambda: indice.status_por_zona()),
+        ("sequência atual 12C", lambda d: pandas_sequencia(d, "12C"), lambda: indice.sequencia("12C")),
+    ]
+
+    print(f"\n{'consulta':<30}{'CSV+pandas (ms)':>17}{'pandas (ms)':>13}{'índice (µs)':>13}{'ganho':>9}")
+    for nome, com_pandas, com_indice in consultas:
+        esperado, resposta = com_pandas(df), com_indice()
+        if esperado != resposta and not (isinstance(esperado, float) and abs(esperado - resposta) < 1e-12):
+            raise SystemExit(f"Respostas diferentes em '{nome}': pandas {esperado!r}, índice {resposta!r}")
+        _, tempo_csv = cronometrar(lambda: com_pandas(_ler_csv(args.csv)), repeticoes=3)
+        _, tempo_pandas = cronometrar(com_pandas, df, repeticoes=20)
+        inicio = time.perf_counter()
+        for _ in range(args.repeticoes):
+            com_indice()
+        tempo_consulta = (time.perf_counter() - inicio) / args.repeticoes
+        print(f"{nome:<30}{tempo_csv * 1000:>17.2f}{tempo_pandas * 1000:>13.3f}{tempo_consulta * 1e6:>13.1f}"
+              f"{tempo_pandas / tempo_consulta:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
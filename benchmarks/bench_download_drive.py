@@ -0,0 +1,76 @@
+# benchmarks/bench_download_drive.py - Vazão do scraper histórico contra um Drive falso com latência simulada
+#
+# Uso: python benchmarks/bench_download_drive.py [--arquivos 120] [--latencia 0.2] [--paralelos 4] [--motor pdfplumber]
+# Compara o fluxo antigo (download serial para um arquivo temporário, depois o processamento) com o
+# download concorrente para a memória, e mostra quantos downloads o filtro por nome/id evita.
+
+import io
+import os
+import time
+import argparse
+import tempfile
+import warnings
+
+from comum import listar_pdfs
+from falsos_google import ServicoDriveFalso
+from googleapiclient.http import MediaIoBaseDownload
+from core_parser import DocumentoBoletim, MOTORES_TABELA
+from drive_boletins import baixar_em_paralelo, filtrar_novos, numero_pelo_nome
+
+def _fluxo_serial(servico, arquivos, motor, paralelos):
+    # Como o scraper_historico fazia: um arquivo de cada vez, sempre pelo mesmo PDF temporário
+    linhas = 0
+    caminho_tmp = os.path.join(tempfile.mkdtemp(), "boletim_historico_temp.pdf")
+    for arquivo in arquivos:
+        fh = io.FileIO(caminho_tmp, "wb")
+        downloader = MediaIoBaseDownload(fh, servico.files().get_media(fileId=arquivo["id"]))
+        done = False
+        while done is False:
+            _, done = downloader.next_chunk()
+        fh.close()
+        with DocumentoBoletim(caminho_tmp, motor) as doc:
+            linhas += len(doc.processar())
+        os.remove(caminho_tmp)
+    return linhas
+
+def _fluxo_concorrente(servico, arquivos, motor, paralelos):
+    linhas = 0
+    for _, conteudo, erro, _ in baixar_em_paralelo(arquivos, lambda: servico, paralelos):
+        if erro: raise erro
+        with DocumentoBoletim(conteudo, motor) as doc:
+            linhas += len(doc.processar())
+    return linhas
+
+MODOS = {"serial": _fluxo_serial, "concorrente": _fluxo_concorrente}
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão do download + processamento dos boletins do Drive.")
+    parser.add_argument("--arquivos", type=int, default=120, help="Tamanho da pasta simulada (os PDFs se repetem).")
+    parser.add_argument("--latencia", type=float, default=0.2, help="Latência simulada por pedido ao Drive, em segundos.")
+    parser.add_argument("--paralelos", type=int, default=4, help="Downloads simultâneos no modo concorrente.")
+    parser.add_argument("--motor", choices=MOTORES_TABELA, default="pdfplumber", help="Motor de extração das tabelas.")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    pdfs = listar_pdfs()
+    caminhos = [pdfs[i % len(pdfs)] for i in range(args.arquivos)]
+
+    print(f"{args.arquivos} arquivos, latência {args.latencia:.2f}s, motor {args.motor}")
+    print(f"{'modo':<14}{'tempo (s)':>10}{'arquivos/s':>12}{'linhas':>9}{'get_media':>11}")
+    for nome, fluxo in MODOS.items():
+        servico = ServicoDriveFalso(caminhos, latencia=args.latencia)
+        inicio = time.perf_counter()
+        linhas = fluxo(servico, servico.arquivos, args.motor, args.paralelos)
+        segundos = time.perf_counter() - inicio
+        print(f"{nome:<14}{segundos:>10.2f}{args.arquivos / segundos:>12.1f}{linhas:>9}{servico.chamadas['get_media']:>11}")
+
+    # Com metade dos boletins já na planilha, o filtro evita os downloads antes de qualquer pedido ao Drive
+    servico = ServicoDriveFalso(caminhos, latencia=args.latencia)
+    numeros = sorted({numero_pelo_nome(a["name"]) for a in servico.arquivos})
+    existentes = set(numeros[: len(numeros) // 2])
+    novos = filtrar_novos(servico.arquivos, existentes)
+    print(f"\nCom {len(existentes)} de {len(numeros)} boletins já na planilha: "
+          f"{len(novos)} de {len(servico.arquivos)} arquivos precisam ser baixados.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_escritor_planilha.py - Chamadas à API do Sheets: append por boletim x EscritorPlanilha
+#
+# Uso: python benchmarks/bench_escritor_planilha.py
+# Usa uma planilha falsa em memória (mesma interface do gspread.Worksheet usada pelos scrapers) que conta as
+# chamadas e pode simular cota excedida (429), respostas perdidas de escritas que foram aplicadas e falhas na
+# leitura que confere o que já foi gravado antes de reenviar.
+
+from comum import RAIZ_PROJETO
+from falsos_google import PlanilhaFalsa
+from escritor_planilha import EscritorPlanilha, COLUNA_BOLETIM
+from historico_parquet import carregar_historico
+
+def _por_boletim(df):
+    return [grupo for _, grupo in df.groupby("numero_boletim", sort=False)]
+
+def main():
+    df = carregar_historico(f"{RAIZ_PROJETO}/historico_parquet")
+    boletins = _por_boletim(df)
+    total_linhas = len(df)
+
+    cenarios = []
+    antiga = PlanilhaFalsa()
+    for grupo in boletins:
+        # Como os scrapers faziam: um append_rows por boletim novo
+        antiga.append_rows(grupo.fillna('').astype(str).values.tolist(), value_input_option="USER_ENTERED")
+    cenarios.append(("append por boletim", antiga))
+
+    for nome, planilha in (("escritor", PlanilhaFalsa()),
+                           ("escritor + 2x 429", PlanilhaFalsa(falhas_429=2)),
+                           ("escritor + resposta perdida", PlanilhaFalsa(respostas_perdidas=1)),
+                           ("perdida + conferência 503", PlanilhaFalsa(respostas_perdidas=1, falhas_leitura=2))):
+        escritor = EscritorPlanilha(planilha, dormir=lambda segundos: None)
+        for grupo in boletins:
+            escritor.adicionar(grupo)
+        escritor.descarregar()
+        cenarios.append((nome, planilha))
+
+    print(f"{len(boletins)} boletins, {total_linhas} linhas")
+    print(f"{'cenário':<28} {'append_rows':>11} {'col_values':>10} {'linhas gravadas':>16} {'duplicadas':>10}")
+    for nome, planilha in cenarios:
+        gravadas = len(planilha.linhas) - 1
+        print(f"{nome:<28} {planilha.chamadas['append_rows']:>11} {planilha.chamadas['col_values']:>10} "
+              f"{gravadas:>16} {gravadas - total_linhas:>10}")
+        assert gravadas == total_linhas, f"{nome}: linhas duplicadas ou perdidas"
+        assert len(set(planilha.col_values(COLUNA_BOLETIM)[1:])) == len(boletins)
+
+if __name__ == "__main__":
+    main()
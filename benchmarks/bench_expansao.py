@@ -0,0 +1,57 @@
+# benchmarks/bench_expansao.py - Expansão por dia: laço com pd.concat (antigo) x repetição vetorizada
+#
+# Uso: python benchmarks/bench_expansao.py [--repeticoes N]
+# Usa uma tabela sintética com todos os pontos cadastrados e períodos cada vez mais longos.
+
+import argparse
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from comum import cronometrar
+from coordenadas import COORDENADAS_POR_CODIGO
+from core_parser import montar_tabela_final
+
+PERIODOS_DIAS = [7, 31, 92, 366]
+
+def _expansao_antiga(df_pontos, numero_boletim, periodo):
+    # Mesmo enriquecimento, seguido do laço que existia em processar_pdf_completo, para comparação
+    df = montar_tabela_final(df_pontos, numero_boletim, periodo, expandir=False)
+    df = df.drop(columns=["data_inicio", "data_fim"])
+    inicio_str, fim_str = [p.strip() for p in periodo.split("a")]
+    atual, dt_fim = datetime.strptime(inicio_str, "%d/%m/%Y"), datetime.strptime(fim_str, "%d/%m/%Y")
+    df_final = pd.DataFrame()
+    while atual <= dt_fim:
+        df_dia = df.copy()
+        df_dia["data_coleta"] = atual.strftime("%Y-%m-%d")
+        df_final = pd.concat([df_final, df_dia], ignore_index=True)
+        atual += timedelta(days=1)
+    return df_final
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a expansão por dia antiga com a vetorizada.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Melhor tempo entre N execuções.")
+    args = parser.parse_args()
+
+    df_pontos = pd.DataFrame({
+        "nome_praia": [f"{codigo} - P. do Futuro - Ponto sintético" for codigo in COORDENADAS_POR_CODIGO],
+        "status_sigla": ["P", "I"] * (len(COORDENADAS_POR_CODIGO) // 2) + ["P"] * (len(COORDENADAS_POR_CODIGO) % 2),
+    })
+
+    print(f"{'dias':>5} {'linhas':>7} {'antigo (ms)':>12} {'vetorizado (ms)':>16} {'por período (ms)':>17} {'ganho':>7}")
+    for n_dias in PERIODOS_DIAS:
+        inicio = datetime(2025, 1, 1)
+        periodo = f"{inicio:%d/%m/%Y} a {inicio + timedelta(days=n_dias - 1):%d/%m/%Y}"
+        df_antigo, t_antigo = cronometrar(_expansao_antiga, df_pontos, "000000000-BOL", periodo,
+                                          repeticoes=args.repeticoes)
+        df_novo, t_novo = cronometrar(montar_tabela_final, df_pontos, "000000000-BOL", periodo,
+                                      repeticoes=args.repeticoes)
+        _, t_periodo = cronometrar(montar_tabela_final, df_pontos, "000000000-BOL", periodo, expandir=False,
+                                   repeticoes=args.repeticoes)
+        assert len(df_antigo) == len(df_novo)
+        assert df_antigo["data_coleta"].tolist() == df_novo["data_coleta"].dt.strftime("%Y-%m-%d").tolist()
+        print(f"{n_dias:>5} {len(df_novo):>7} {t_antigo * 1000:>12.1f} {t_novo * 1000:>16.1f} {t_periodo * 1000:>17.1f} "
+              f"{t_antigo / t_novo:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_importacao.py - Tempo de importação dos scrapers (-X importtime) e módulos carregados sem boletim novo
+#
+# Uso: python benchmarks/bench_importacao.py [--repeticoes 5] [--maximo-ms 400]
+# Cada módulo é importado num processo novo com `python -X importtime`; vale o menor tempo das repetições
+# (a primeira pode incluir a compilação dos .pyc). Depois o scraper_semanal roda de verdade contra o site
+# falso em dois cenários sem boletim novo: página sem mudança (304) e página mudada com os links já gravados.
+# Nesses cenários nenhum dos MODULOS_PESADOS pode ser carregado; se for, ou se o tempo passar de --maximo-ms,
+# o script sai com código 1.
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+from comum import RAIZ_PROJETO, listar_pdfs
+from servidor_semace_falso import ServidorSemaceFalso
+from busca_http import ARQUIVO_ESTADO_HTTP, BuscaCondicional
+
+ENTRADAS = ["scraper_semanal", "scraper_historico", "core_parser"]
+MODULOS_PESADOS = ["pandas", "numpy", "camelot", "cv2", "pdfplumber", "gspread", "googleapiclient", "google.oauth2"]
+
+# Executado num processo novo, com o diretório de trabalho numa pasta temporária (estado HTTP e métricas)
+_SCRIPT_SEM_NOVIDADE = """
+import sys, json, time
+inicio = time.perf_counter()
+import scraper_semanal
+importacao = time.perf_counter() - inicio
+scraper_semanal.URL_BASE = sys.argv[1]
+status = scraper_semanal.executar(scraper_semanal.Execucao("scraper_semanal"))
+print(json.dumps({"status": status, "importacao_s": importacao, "total_s": time.perf_counter() - inicio,
+                  "carregados": [m for m in json.loads(sys.argv[2]) if m in sys.modules]}))
+"""
+
+def _ambiente():
+    ambiente = dict(os.environ)
+    ambiente["PYTHONPATH"] = os.pathsep.join(filter(None, [RAIZ_PROJETO, ambiente.get("PYTHONPATH")]))
+    return ambiente
+
+def medir_importacao(modulo):
+    """(tempo total em ms, [(importação direta, ms), ...]) a partir da saída de -X importtime."""
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"], cwd=RAIZ_PROJETO,
+                           env=_ambiente(), capture_output=True, text=True, check=True).stderr
+    total, diretas, filhos = None, [], []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        # -X importtime indenta cada nível com dois espaços e lista os filhos antes do módulo que os importou
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        if nivel == 1:
+            filhos.append((nome.strip(), int(cumulativo) / 1000))
+        elif nivel == 0:
+            if nome.strip() == modulo:
+                total, diretas = int(cumulativo) / 1000, filhos
+            filhos = []
+    return total, sorted(diretas, key=lambda item: -item[1])
+
+def rodar_sem_novidade(url_pagina, pasta):
+    saida = subprocess.run([sys.executable, "-c", _SCRIPT_SEM_NOVIDADE, url_pagina, json.dumps(MODULOS_PESADOS)],
+                           cwd=pasta, env=_ambiente(), capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação dos scrapers.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Processos por medição; vale o menor tempo.")
+    parser.add_argument("--maximo-ms", type=float, default=400.0,
+                        help="Tempo máximo aceito para o scraper_semanal terminar sem boletim novo.")
+    args = parser.parse_args()
+    falhou = False
+
+    print(f"{'módulo':<20}{'importação (ms)':>16}   importações diretas mais caras")
+    for modulo in ENTRADAS:
+        medicoes = [medir_importacao(modulo) for _ in range(args.repeticoes)]
+        total, diretas = min(medicoes, key=lambda medicao: medicao[0])
+        mais_caras = ", ".join(f"{nome} {ms:.0f}" for nome, ms in diretas[:4])
+        print(f"{modulo:<20}{total:>16.1f}   {mais_caras}")
+
+    pdfs = listar_pdfs()[-3:]
+    with ServidorSemaceFalso(pdfs) as servidor:
+        pasta = tempfile.mkdtemp()
+        # Estado de uma execução anterior que já gravou todos os boletins da página
+        busca = BuscaCondicional(arquivo_estado=os.path.join(pasta, ARQUIVO_ESTADO_HTTP))
+        busca.buscar_texto(servidor.url_pagina)
+        for nome in servidor.links:
+            busca.marcar_processado(f"{servidor.url_base}/arquivos/{nome}", None)
+        busca.salvar()
+
+        print(f"\n{'cenário sem boletim novo':<34}{'status':>14}{'import (ms)':>13}{'total (ms)':>12}   pesados carregados")
+        for cenario, mudar_pagina in (("página sem mudança (304)", False), ("página mudada, links gravados", True)):
+            resultados = []
+            for i in range(args.repeticoes):
+                if mudar_pagina:
+                    servidor.aviso = f"Aviso {i}"  # cada execução grava o ETag novo; a seguinte precisa de outra mudança
+                resultados.append(rodar_sem_novidade(servidor.url_pagina, pasta))
+            melhor = min(resultados, key=lambda r: r["total_s"])
+            carregados = sorted({m for r in resultados for m in r["carregados"]})
+            print(f"{cenario:<34}{melhor['status']:>14}{melhor['importacao_s'] * 1000:>13.1f}"
+                  f"{melhor['total_s'] * 1000:>12.1f}   {', '.join(carregados) or '-'}")
+            if carregados or melhor["status"] != "sem_novidades" or melhor["total_s"] * 1000 > args.maximo_ms:
+                falhou = True
+
+    if falhou:
+        print("\nO caminho sem boletim novo ficou mais pesado do que devia.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_indice_boletins.py - Custo da verificação de duplicatas: coluna inteira x índice de boletins
+#
+# Uso: python benchmarks/bench_indice_boletins.py [--semanas N]
+# Simula N semanas de boletins (reaproveitando o histórico) numa planilha falsa e compara as células lidas
+# ao procurar os boletins já gravados: a coluna 8 inteira (antigo) ou o IndiceBoletins (DestinoPlanilha).
+
+import argparse
+
+from comum import RAIZ_PROJETO
+from falsos_google import PlanilhaFalsa
+from escritor_planilha import COLUNA_BOLETIM, EscritorPlanilha
+from historico_parquet import carregar_historico
+from indice_boletins import IndiceBoletins
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a leitura da coluna de boletins com o índice compacto.")
+    parser.add_argument("--semanas", type=int, default=200, help="Quantidade de boletins simulados.")
+    args = parser.parse_args()
+
+    df = carregar_historico(f"{RAIZ_PROJETO}/historico_parquet")
+    grupos = [g for _, g in df.groupby("numero_boletim", sort=False)]
+
+    sheet = PlanilhaFalsa()
+    indice = IndiceBoletins.abrir(sheet)  # cria a aba do índice, só com o cabeçalho
+    escritor = EscritorPlanilha(sheet, indice=indice)
+    for semana in range(args.semanas):
+        grupo = grupos[semana % len(grupos)].copy()
+        grupo["numero_boletim"] = f"{semana:09d}-BOL"
+        escritor.adicionar(grupo)
+    escritor.descarregar()
+
+    sheet.celulas_lidas = 0
+    antigos = set(sheet.col_values(COLUNA_BOLETIM)[1:])
+    celulas_coluna = sheet.celulas_lidas
+
+    sheet.celulas_lidas = indice.aba_indice.celulas_lidas = 0
+    leituras_coluna = sheet.chamadas["col_values"]
+    novos = IndiceBoletins.abrir(sheet).carregar()
+    celulas_indice = sheet.celulas_lidas + indice.aba_indice.celulas_lidas
+    assert antigos == novos
+    # Um índice criado nesta execução e preenchido pelo escritor já vale na seguinte, sem ler a coluna inteira
+    assert sheet.chamadas["col_values"] == leituras_coluna, "o índice recém-criado não deveria ser reconstruído"
+
+    # Linhas escritas por fora do pipeline deixam o índice desatualizado: ele deve ser refeito sozinho
+    sheet.append_rows([["x"] * (COLUNA_BOLETIM - 1) + ["MANUAL-BOL"]])
+    assert "MANUAL-BOL" in IndiceBoletins.abrir(sheet).carregar()
+
+    print(f"{args.semanas} boletins, {len(sheet.linhas) - 2} linhas na aba de dados")
+    print(f"coluna inteira: {celulas_coluna:>8} células lidas")
+    print(f"índice:         {celulas_indice:>8} células lidas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_listagem_drive.py - Custo da listagem da pasta do Drive: página única, paginada e incremental
+#
+# Uso: python benchmarks/bench_listagem_drive.py [--arquivos 2500] [--novos 3]
+# Numa pasta falsa com mais de uma página de arquivos, compara a chamada única antiga (que perde tudo depois
+# da primeira página), a listagem paginada completa e a listagem incremental a partir da marca salva.
+
+import os
+import argparse
+import tempfile
+
+from comum import listar_pdfs
+from falsos_google import ServicoDriveFalso
+from drive_boletins import carregar_marca_listagem, listar_pdfs_drive, salvar_marca_listagem
+
+CONSULTA = "'pasta' in parents and mimeType='application/pdf'"
+
+def _listagem_antiga(servico):
+    resposta = servico.files().list(q=CONSULTA, pageSize=1000, fields="files(id, name)").execute()
+    return resposta.get("files", [])
+
+def _medir(servico, nome, funcao):
+    servico.chamadas.clear()
+    arquivos = funcao()
+    print(f"{nome:<34}{len(arquivos):>10}{servico.chamadas.get('list', 0):>8}{servico.chamadas.get('itens_listados', 0):>14}")
+    return arquivos
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara as formas de listar a pasta de boletins no Drive.")
+    parser.add_argument("--arquivos", type=int, default=2500, help="Arquivos na pasta simulada.")
+    parser.add_argument("--novos", type=int, default=3, help="Arquivos publicados entre duas execuções.")
+    args = parser.parse_args()
+
+    pdfs = listar_pdfs()
+    servico = ServicoDriveFalso([pdfs[i % len(pdfs)] for i in range(args.arquivos)], latencia=0)
+    arquivo_marca = os.path.join(tempfile.mkdtemp(), "listagem_drive.json")
+
+    print(f"{'listagem':<34}{'arquivos':>10}{'list':>8}{'itens lidos':>14}")
+    _medir(servico, "antiga (uma chamada)", lambda: _listagem_antiga(servico))
+    completos = _medir(servico, "paginada completa", lambda: listar_pdfs_drive(servico, CONSULTA)[0])
+    assert len(completos) == args.arquivos
+    salvar_marca_listagem("pasta", completos, arquivo_marca)
+
+    for i in range(args.novos):
+        servico.adicionar_arquivo(pdfs[i % len(pdfs)])
+    marca = carregar_marca_listagem("pasta", arquivo_marca)
+    novos = _medir(servico, f"incremental (+{args.novos} publicados)",
+                   lambda: listar_pdfs_drive(servico, CONSULTA, modificados_desde=marca)[0])
+    # A marca usa ">=", então o último arquivo da execução anterior volta junto; o filtro por id o descarta.
+    assert {a["id"] for a in servico.arquivos[-args.novos:]} <= {a["id"] for a in novos}
+    salvar_marca_listagem("pasta", novos, arquivo_marca)
+
+    marca = carregar_marca_listagem("pasta", arquivo_marca)
+    _medir(servico, "incremental (nada novo)", lambda: listar_pdfs_drive(servico, CONSULTA, modificados_desde=marca)[0])
+
+if __name__ == "__main__":
+    main()
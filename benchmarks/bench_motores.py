@@ -0,0 +1,55 @@
+# benchmarks/bench_motores.py - Paridade e desempenho dos motores de tabela (camelot x pdfplumber)
+#
+# Uso: python benchmarks/bench_motores.py [--limite N]
+# Para cada PDF de pdfs_historicos compara as linhas finais produzidas pelos dois motores e mede o tempo
+# de extração de cada um. Termina com código 1 se algum boletim divergir.
+
+import sys
+import argparse
+import warnings
+
+from comum import listar_pdfs, percentil, cronometrar
+from core_parser import DocumentoBoletim, MOTORES_TABELA
+
+COLUNAS_COMPARADAS = ["id_ponto", "data_coleta", "nome_praia", "zona", "status", "latitude", "longitude",
+                      "numero_boletim", "periodo_validade"]
+
+def _processar(caminho, motor):
+    with DocumentoBoletim(caminho, motor) as doc:
+        doc.metadados()  # fora da disputa: a leitura dos metadados é igual para os dois motores
+        _, segundos = cronometrar(doc.pontos)
+        df = doc.processar()
+    return df, segundos
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os motores de extração de tabelas do core_parser.")
+    parser.add_argument("--limite", type=int, default=None, help="Usa apenas os N primeiros PDFs.")
+    args = parser.parse_args()
+
+    tempos = {motor: [] for motor in MOTORES_TABELA}
+    divergentes = []
+    caminhos = listar_pdfs()[:args.limite]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for caminho in caminhos:
+            resultados = {}
+            for motor in MOTORES_TABELA:
+                df, segundos = _processar(caminho, motor)
+                tempos[motor].append(segundos)
+                resultados[motor] = df.reindex(columns=COLUNAS_COMPARADAS).reset_index(drop=True)
+            referencia, candidato = (resultados[m] for m in MOTORES_TABELA)
+            if not referencia.equals(candidato):
+                divergentes.append((caminho, len(referencia), len(candidato)))
+
+    print(f"{'motor':<11} {'total (s)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for motor, latencias in tempos.items():
+        print(f"{motor:<11} {sum(latencias):>10.2f} {percentil(latencias, 50) * 1000:>9.1f} {percentil(latencias, 95) * 1000:>9.1f}")
+
+    print(f"\nParidade: {len(caminhos) - len(divergentes)}/{len(caminhos)} boletins com linhas idênticas.")
+    for caminho, n_ref, n_cand in divergentes:
+        print(f"  -> Divergente: {caminho} ({n_ref} x {n_cand} linhas)")
+    if divergentes:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_normalizacao.py - Normalização das tabelas brutas: iterrows/apply (antigo) x pandas vetorizado
+#
+# Uso: python benchmarks/bench_normalizacao.py [--motor camelot|pdfplumber] [--escala N]
+#                                              [--salvar tabelas.json | --carregar tabelas.json]
+# As tabelas brutas são extraídas uma única vez (ou carregadas de um arquivo salvo antes) e depois reprocessadas
+# N vezes, simulando um arquivo de vários anos sem o custo do motor de PDF no laço medido.
+
+import json
+import time
+import argparse
+import warnings
+
+import pandas as pd
+
+from comum import listar_pdfs
+from core_parser import (DocumentoBoletim, MOTORES_TABELA, _normalizar_tabelas, classify_zona,
+                         clean_status_token, extract_point_code, is_noise_row, normalizar_tabelas_em_lote)
+
+def _normalizar_antigo(tabelas_brutas):
+    # Reprodução da normalização linha a linha que existia em processar_pdf_completo, para comparação
+    dfs_norm = []
+    for df_raw in tabelas_brutas:
+        if df_raw.shape[1] < 2: continue
+        df_raw = df_raw.iloc[:, :2].copy()
+        df_raw.columns = ["Nome", "Status"]
+        linhas = []
+        for _, row in df_raw.iterrows():
+            nomes = [x.strip() for x in str(row["Nome"]).split("\n") if x.strip()]
+            status_tokens = [clean_status_token(x) for x in str(row["Status"]).split("\n")]
+            status_tokens = [x for x in status_tokens if x]
+            if not nomes or not status_tokens: continue
+            if len(status_tokens) == 1 and len(nomes) > 1:
+                for n in nomes:
+                    if not is_noise_row(n, status_tokens[0]):
+                        linhas.append({"nome_praia": n, "status_sigla": status_tokens[0]})
+            else:
+                for n, s in zip(nomes, status_tokens):
+                    if not is_noise_row(n, s):
+                        linhas.append({"nome_praia": n, "status_sigla": s})
+        if linhas:
+            dfs_norm.append(pd.DataFrame(linhas))
+    if not dfs_norm: return pd.DataFrame()
+    df = pd.concat(dfs_norm, ignore_index=True)
+    df["nome_praia"] = df["nome_praia"].apply(lambda x: " ".join(x.split()))
+    df = df.drop_duplicates(subset=["nome_praia"]).reset_index(drop=True)
+    df["id_ponto"] = df["nome_praia"].apply(extract_point_code)
+    df["zona"] = df["nome_praia"].apply(classify_zona.__wrapped__)  # sem a memoização
+    return df
+
+def _normalizar_novo(tabelas_brutas):
+    df = _normalizar_tabelas(tabelas_brutas)
+    if df.empty: return df
+    df["id_ponto"] = df["nome_praia"].str[:3].str.strip().str.upper()
+    df["zona"] = df["nome_praia"].map(classify_zona)
+    return df
+
+def _normalizar_lote(boletins):
+    # Todo o arquivo em uma única passada; o enriquecimento também roda uma vez sobre todos os pontos
+    df = pd.concat(normalizar_tabelas_em_lote(boletins), ignore_index=True)
+    df["id_ponto"] = df["nome_praia"].str[:3].str.strip().str.upper()
+    df["zona"] = df["nome_praia"].map(classify_zona)
+    return df
+
+def extrair_tabelas_brutas(motor):
+    boletins = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for caminho in listar_pdfs():
+            with DocumentoBoletim(caminho, motor) as doc:
+                numero_boletim, periodo = doc.metadados()
+                if not numero_boletim or not periodo:
+                    continue
+                metodo = doc._tabelas_pdfplumber if motor == "pdfplumber" else doc._tabelas_camelot
+                boletins.append([t.astype(str) for t in metodo()])
+    return boletins
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a normalização antiga das tabelas com a vetorizada.")
+    parser.add_argument("--motor", choices=MOTORES_TABELA, default="pdfplumber", help="Motor usado na extração.")
+    parser.add_argument("--escala", type=int, default=10, help="Quantas vezes reprocessar o conjunto de boletins.")
+    parser.add_argument("--salvar", help="Salva as tabelas brutas extraídas neste arquivo JSON.")
+    parser.add_argument("--carregar", help="Usa as tabelas brutas de um JSON salvo antes, sem abrir os PDFs.")
+    args = parser.parse_args()
+
+    if args.carregar:
+        with open(args.carregar, encoding="utf-8") as f:
+            boletins = [[pd.DataFrame(t) for t in tabelas] for tabelas in json.load(f)]
+    else:
+        boletins = extrair_tabelas_brutas(args.motor)
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f:
+            json.dump([[t.values.tolist() for t in tabelas] for tabelas in boletins], f, ensure_ascii=False)
+
+    for tabelas in boletins:
+        antigo, novo = _normalizar_antigo(tabelas), _normalizar_novo(tabelas)
+        assert antigo.equals(novo) or (antigo.empty and novo.empty), "normalização divergente"
+
+    total_linhas = sum(len(t) for tabelas in boletins for t in tabelas) * args.escala
+    print(f"{len(boletins)} boletins x {args.escala} = {len(boletins) * args.escala} boletins, "
+          f"{total_linhas} linhas brutas")
+    for nome, funcao in (("antigo", _normalizar_antigo), ("vetorizado", _normalizar_novo)):
+        inicio = time.perf_counter()
+        for _ in range(args.escala):
+            for tabelas in boletins:
+                funcao(tabelas)
+        segundos = time.perf_counter() - inicio
+        print(f"{nome:<11} {segundos:>8.2f}s  {total_linhas / segundos:>10.0f} linhas brutas/s")
+
+    inicio = time.perf_counter()
+    _normalizar_lote(boletins * args.escala)
+    segundos = time.perf_counter() - inicio
+    print(f"{'em lote':<11} {segundos:>8.2f}s  {total_linhas / segundos:>10.0f} linhas brutas/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# benchmarks/bench_pipeline.py - Tempo e memória de cada etapa do processamento, sobre os PDFs de pdfs_historicos
+#
+# Uso: python benchmarks/bench_pipeline.py [--motor camelot|pdfplumber] [--limite N] [--memoria]
+#                                          [--perfil arquivo.prof] [--saida resultado.json]
+#                                          [--comparar anterior.json] [--tolerancia 0.2]
+# Cada etapa é um método público do DocumentoBoletim, chamado na ordem em que processar() os usa: abertura
+# (doc.pdf), metadados(), pontos() (extração e normalização das tabelas) e processar() (enriquecimento e
+# expansão por dia, com o resto já guardado pelo documento). Assim é medido o código que os scrapers rodam.
+# As falhas que o documento guarda em doc.erros são contadas na etapa em que ocorreram. O JSON de saída
+# pode ser comparado com o de outro commit via --comparar, que sai com código 1 se alguma etapa piorar além
+# da tolerância. Compare execuções feitas com as mesmas opções: --memoria e --perfil deixam tudo mais lento.
+# Com o pdfplumber, a leitura do conteúdo das páginas acontece na primeira extração de texto e por isso
+# aparece em "metadados"; a extração das tabelas reaproveita as páginas já lidas.
+
+import sys
+import json
+import time
+import cProfile
+import pstats
+import argparse
+import platform
+import warnings
+import subprocess
+import tracemalloc
+
+from comum import RAIZ_PROJETO, listar_pdfs, percentil, pico_rss_mb
+from core_parser import DocumentoBoletim, MOTORES_TABELA, MOTOR_PADRAO
+
+ETAPAS = ["abertura", "metadados", "pontos", "processar"]
+# Etapa do benchmark -> chave de DocumentoBoletim.erros em que o documento guarda a falha engolida
+ERROS_DOCUMENTO = {"metadados": "metadados", "pontos": "extracao"}
+
+class Medidor:
+    """Acumula, por etapa, a duração de cada execução e (com `memoria=True`) o pico de memória alocada."""
+
+    def __init__(self, memoria=False):
+        self.memoria = memoria
+        self.tempos = {etapa: [] for etapa in ETAPAS}
+        self.picos = {etapa: 0 for etapa in ETAPAS}
+        self.erros = {etapa: 0 for etapa in ETAPAS}
+
+    def medir(self, etapa, funcao, doc=None):
+        if self.memoria:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao()
+        except Exception:
+            self.erros[etapa] += 1
+            raise
+        finally:
+            self.tempos[etapa].append(time.perf_counter() - inicio)
+            if self.memoria:
+                self.picos[etapa] = max(self.picos[etapa], tracemalloc.get_traced_memory()[1] - base)
+        # O DocumentoBoletim não propaga as falhas das etapas; elas aparecem em doc.erros
+        erro = doc.erros.get(ERROS_DOCUMENTO.get(etapa)) if doc is not None else None
+        if erro is not None:
+            self.erros[etapa] += 1
+            raise erro
+        return resultado
+
+def _processar(caminho, motor, medidor):
+    # Cada método guarda o que calculou, então a etapa seguinte mede só o trabalho que ainda falta
+    with DocumentoBoletim(caminho, motor) as doc:
+        medidor.medir("abertura", lambda: doc.pdf.pages)
+        numero_boletim, periodo = medidor.medir("metadados", doc.metadados, doc)
+        if not numero_boletim or not periodo:
+            return 0
+        medidor.medir("pontos", doc.pontos, doc)
+        return len(medidor.medir("processar", doc.processar))
+
+def _commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ_PROJETO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def executar(motor, limite=None, memoria=False, perfil=None):
+    caminhos = listar_pdfs()[:limite]
+    medidor = Medidor(memoria)
+    latencias, linhas, falhas = [], 0, []
+    perfilador = cProfile.Profile() if perfil else None
+    if memoria:
+        tracemalloc.start()
+    warnings.filterwarnings("ignore")
+    inicio_total = time.perf_counter()
+    for caminho in caminhos:
+        inicio = time.perf_counter()
+        if perfilador: perfilador.enable()
+        try:
+            linhas += _processar(caminho, motor, medidor)
+        except Exception as e:
+            falhas.append({"arquivo": caminho.rsplit("/", 1)[-1], "erro": repr(e)})
+        finally:
+            if perfilador: perfilador.disable()
+        latencias.append(time.perf_counter() - inicio)
+    total = time.perf_counter() - inicio_total
+    if memoria:
+        tracemalloc.stop()
+    if perfilador:
+        perfilador.dump_stats(perfil)
+
+    etapas = {}
+    for etapa in ETAPAS:
+        tempos = medidor.tempos[etapa]
+        etapas[etapa] = {
+            "execucoes": len(tempos),
+            "total_s": round(sum(tempos), 4),
+            "p50_ms": round(percentil(tempos, 50) * 1000, 3),
+            "p95_ms": round(percentil(tempos, 95) * 1000, 3),
+            "erros": medidor.erros[etapa],
+            "pico_memoria_mb": round(medidor.picos[etapa] / (1024 * 1024), 2) if memoria else None,
+        }
+    return {
+        "commit": _commit_atual(),
+        "python": platform.python_version(),
+        "motor": motor,
+        "arquivos": len(caminhos),
+        "linhas": linhas,
+        "total_s": round(total, 4),
+        "arquivos_por_s": round(len(caminhos) / total, 3) if total else None,
+        "linhas_por_s": round(linhas / total, 1) if total else None,
+        "p50_ms": round(percentil(latencias, 50) * 1000, 3),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 3),
+        "pico_rss_mb": pico_rss_mb(),
+        "etapas": etapas,
+        "falhas": falhas,
+    }
+
+def comparar(atual, anterior, tolerancia):
+    """Imprime a variação do p50 de cada etapa e devolve as etapas que pioraram além da tolerância."""
+    piores = []
+    print(f"\nComparação com o commit {anterior.get('commit') or '?'} (tolerância {tolerancia:.0%}):")
+    for etapa in ETAPAS:
+        if etapa not in anterior["etapas"]:
+            print(f"  {etapa:<15}sem medição no resultado anterior (etapas: {', '.join(anterior['etapas'])})")
+            continue
+        antes, depois = anterior["etapas"][etapa]["p50_ms"], atual["etapas"][etapa]["p50_ms"]
+        variacao = (depois - antes) / antes if antes else 0.0
+        marca = "  <- regressão" if variacao > tolerancia else ""
+        print(f"  {etapa:<15}{antes:>10.2f} ms -> {depois:>10.2f} ms  ({variacao:+.1%}){marca}")
+        if marca:
+            piores.append(etapa)
+    if atual["linhas"] != anterior["linhas"]:
+        print(f"  Atenção: {anterior['linhas']} linhas antes, {atual['linhas']} agora.")
+    return piores
+
+def imprimir(resultado):
+    print(f"{resultado['arquivos']} arquivos, {resultado['linhas']} linhas, motor {resultado['motor']}: "
+          f"{resultado['total_s']:.2f}s ({resultado['arquivos_por_s']} arquivos/s, {resultado['linhas_por_s']} linhas/s)")
+    print(f"Latência por PDF: p50 {resultado['p50_ms']:.1f} ms, p95 {resultado['p95_ms']:.1f} ms")
+    print(f"{'etapa':<16}{'total (s)':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'erros':>7}{'pico (MB)':>11}")
+    for etapa, r in resultado["etapas"].items():
+        pico = f"{r['pico_memoria_mb']:.2f}" if r["pico_memoria_mb"] is not None else "-"
+        print(f"{etapa:<16}{r['total_s']:>10.3f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['erros']:>7}{pico:>11}")
+    for falha in resultado["falhas"]:
+        print(f"  -> {falha['arquivo']}: {falha['erro']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede cada etapa do processamento dos boletins.")
+    parser.add_argument("--motor", choices=MOTORES_TABELA, default=MOTOR_PADRAO, help="Motor de extração das tabelas.")
+    parser.add_argument("--limite", type=int, default=None, help="Usa apenas os N primeiros PDFs.")
+    parser.add_argument("--memoria", action="store_true", help="Mede o pico de memória de cada etapa (tracemalloc; mais lento).")
+    parser.add_argument("--perfil", metavar="ARQUIVO", help="Grava um perfil do cProfile e mostra as funções mais caras.")
+    parser.add_argument("--saida", metavar="JSON", help="Grava o resultado neste arquivo.")
+    parser.add_argument("--comparar", metavar="JSON", help="Compara com o resultado de uma execução anterior.")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora relativa aceita no p50 de cada etapa.")
+    args = parser.parse_args()
+
+    resultado = executar(args.motor, args.limite, args.memoria, args.perfil)
+    imprimir(resultado)
+    if args.perfil:
+        print(f"\nPerfil gravado em {args.perfil}. Funções mais caras (tempo acumulado):")
+        pstats.Stats(args.perfil).sort_stats("cumulative").print_stats(15)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        if comparar(resultado, anterior, args.tolerancia):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
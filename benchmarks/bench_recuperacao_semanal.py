@@ -0,0 +1,72 @@
+# benchmarks/bench_recuperacao_semanal.py - Modo de recuperação do scraper semanal contra um site e uma planilha falsos
+#
+# Uso: python benchmarks/bench_recuperacao_semanal.py [--publicados 6] [--perdidos 4] [--sem-pontos 1]
+#                                                     [--motor pdfplumber]
+# A planilha começa sem os `--perdidos` boletins mais recentes da página (semanas em que a execução falhou).
+# Uma única execução de scraper_semanal.main deve gravar todos eles, numa só chamada de append_rows. A página
+# também lista `--sem-pontos` boletins mensais, que são lidos sem erro mas não têm pontos: a execução seguinte,
+# sem nada publicado, deve terminar num 304 sem baixar nenhum PDF.
+
+import os
+import time
+import argparse
+import tempfile
+import warnings
+
+from comum import RAIZ_PROJETO, listar_pdfs
+from falsos_google import PlanilhaFalsa
+from servidor_semace_falso import ServidorSemaceFalso
+import core_parser
+import scraper_semanal
+from escritor_planilha import EscritorPlanilha
+from indice_boletins import IndiceBoletins
+from historico_parquet import boletins_gravados
+
+def main():
+    parser = argparse.ArgumentParser(description="Recuperação de boletins perdidos pelo scraper semanal.")
+    parser.add_argument("--publicados", type=int, default=6, help="Boletins listados na página.")
+    parser.add_argument("--perdidos", type=int, default=4, help="Quantos dos mais recentes faltam na planilha.")
+    parser.add_argument("--sem-pontos", type=int, default=1, help="Boletins sem pontos (mensais) na página.")
+    parser.add_argument("--motor", choices=core_parser.MOTORES_TABELA, default="pdfplumber")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    core_parser.MOTOR_PADRAO = args.motor
+    core_parser.DocumentoBoletim.__init__.__defaults__ = (args.motor,)
+
+    # Os boletins com pontos são os que estão no dataset histórico; os demais são os resumos mensais
+    gravados = boletins_gravados(os.path.join(RAIZ_PROJETO, "historico_parquet"))
+    pdfs = [c for c in listar_pdfs() if core_parser.numero_pelo_nome(c) in gravados][-args.publicados:]
+    sem_pontos = [c for c in listar_pdfs() if core_parser.numero_pelo_nome(c) not in gravados][-args.sem_pontos:]
+    sem_pontos = sem_pontos if args.sem_pontos else []
+    sheet = PlanilhaFalsa()
+    # A planilha já tem os boletins mais antigos da página
+    escritor = EscritorPlanilha(sheet, indice=IndiceBoletins.abrir(sheet))
+    for caminho in pdfs[: args.publicados - args.perdidos]:
+        with core_parser.DocumentoBoletim(caminho, args.motor) as doc:
+            escritor.adicionar(doc.processar())
+    escritor.descarregar()
+    boletins_antes = len(set(sheet.col_values(8)[1:]))
+    sheet.chamadas = {chave: 0 for chave in sheet.chamadas}
+
+    os.chdir(tempfile.mkdtemp())  # estado HTTP e PDFs temporários longe do projeto
+    with ServidorSemaceFalso(sorted(pdfs + sem_pontos, key=os.path.basename)) as servidor:
+        scraper_semanal.URL_BASE = servidor.url_pagina
+        scraper_semanal.conectar_google_apis = lambda: (sheet, None)
+        inicio = time.perf_counter()
+        scraper_semanal.main()
+        segundos = time.perf_counter() - inicio
+        boletins_depois = len(set(sheet.col_values(8)[1:]))
+        print("-" * 60)
+        print(f"Boletins na planilha: {boletins_antes} -> {boletins_depois} em {segundos:.2f}s "
+              f"({sheet.chamadas['append_rows']} chamada(s) de append_rows, {servidor.contadores['pedidos']} pedido(s) HTTP)")
+        assert boletins_depois == boletins_antes + args.perdidos
+
+        servidor.zerar_contadores()
+        scraper_semanal.main()
+        print(f"Execução seguinte: {servidor.contadores['pedidos']} pedido(s), "
+              f"{servidor.contadores['respostas_304']} resposta(s) 304, {servidor.contadores['bytes']} bytes")
+        # Um boletim sem pontos não pode ficar pendente: a semana sem novidade é um 304 e nenhum byte
+        assert servidor.contadores["respostas_304"] == 1 and servidor.contadores["bytes"] == 0
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_sqlite.py - Gravação e consultas no banco SQLite local, a partir do dataset Parquet
+#
+# Uso: python benchmarks/bench_sqlite.py [--repeticoes 200]
+# Grava o histórico num banco novo de duas formas: uma transação por boletim (como o importador incremental)
+# e uma transação só (como o descarregar dos scrapers). Depois regrava tudo para conferir que as contagens
+# não mudam (upsert) e mede consultas por ponto e período, que usam o índice (id_ponto, data_coleta).
+
+import os
+import time
+import argparse
+import tempfile
+
+from comum import RAIZ_PROJETO, cronometrar
+from banco_sqlite import abrir_banco, carregar_observacoes, gravar_boletins_sqlite
+from historico_parquet import carregar_historico
+
+def _contagens(conexao):
+    return {tabela: conexao.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+            for tabela in ("pontos", "boletins", "observacoes")}
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a gravação e as consultas no banco SQLite local.")
+    parser.add_argument("--repeticoes", type=int, default=200, help="Repetições de cada consulta.")
+    args = parser.parse_args()
+
+    df = carregar_historico(os.path.join(RAIZ_PROJETO, "historico_parquet"))
+    pasta = tempfile.mkdtemp()
+    print(f"{len(df)} linhas de {df['numero_boletim'].nunique()} boletins")
+
+    conexao = abrir_banco(os.path.join(pasta, "por_boletim.sqlite3"))
+    inicio = time.perf_counter()
+    for _, grupo in df.groupby("numero_boletim", sort=False):
+        gravar_boletins_sqlite(conexao, grupo)
+    print(f"Uma transação por boletim: {time.perf_counter() - inicio:.3f}s")
+    conexao.close()
+
+    conexao = abrir_banco(os.path.join(pasta, "lote.sqlite3"))
+    _, segundos = cronometrar(gravar_boletins_sqlite, conexao, df)
+    antes = _contagens(conexao)
+    _, segundos_regravacao = cronometrar(gravar_boletins_sqlite, conexao, df)
+    depois = _contagens(conexao)
+    print(f"Uma transação só: {segundos:.3f}s; regravando tudo: {segundos_regravacao:.3f}s")
+    print(f"Contagens {antes} -> {depois}")
+    assert antes == depois, "regravar os mesmos boletins não pode mudar as contagens"
+
+    ultimo_dia = conexao.execute("SELECT MAX(data_coleta) FROM observacoes").fetchone()[0]
+    ano = ultimo_dia[:4]
+    consultas = [
+        ("status 12C num dia", "SELECT status FROM observacoes WHERE id_ponto = ? AND data_coleta = ?",
+         ("12C", f"{ano}-03-10")),
+        (f"% dias impróprios 12C em {ano}",
+         "SELECT AVG(status = 'Imprópria para banho') FROM observacoes WHERE id_ponto = ? AND data_coleta BETWEEN ? AND ?",
+         ("12C", f"{ano}-01-01", f"{ano}-12-31")),
+        ("linhas de um boletim", "SELECT COUNT(*) FROM observacoes WHERE numero_boletim = ?",
+         (str(df["numero_boletim"].iloc[-1]),)),
+        ("boletins gravados", "SELECT numero_boletim FROM boletins", ()),
+    ]
+    print(f"\n{'consulta':<32}{'µs':>10}   plano")
+    for nome, sql, parametros in consultas:
+        plano = "; ".join(linha[-1] for linha in conexao.execute(f"EXPLAIN QUERY PLAN {sql}", parametros))
+        inicio = time.perf_counter()
+        for _ in range(args.repeticoes):
+            conexao.execute(sql, parametros).fetchall()
+        print(f"{nome:<32}{(time.perf_counter() - inicio) / args.repeticoes * 1e6:>10.1f}   {plano}")
+    _, segundos = cronometrar(carregar_observacoes, conexao, "12C", f"{ano}-01-01", f"{ano}-12-31", repeticoes=20)
+    print(f"{'carregar_observacoes 12C ' + ano:<32}{segundos * 1e6:>10.1f}   (DataFrame no formato da planilha)")
+    conexao.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# benchmarks/comum.py - Funções compartilhadas pelos scripts de benchmark
+
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_PDFS = os.path.join(RAIZ_PROJETO, "pdfs_historicos")
+
+# Permite importar os módulos do projeto (core_parser, etc.) ao rodar `python benchmarks/<script>.py`
+if RAIZ_PROJETO not in sys.path:
+    sys.path.insert(0, RAIZ_PROJETO)
+
+# O mesmo cálculo dos resumos dos scrapers, para que benchmarks e métricas de produção sejam comparáveis
+from instrumentacao import percentil  # noqa: E402
+
+def listar_pdfs(pasta=PASTA_PDFS):
+    return sorted(os.path.join(pasta, f) for f in os.listdir(pasta) if f.lower().endswith(".pdf"))
+
+def pico_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+def cronometrar(funcao, *args, repeticoes=1, **kwargs):
+    """Executa `funcao` `repeticoes` vezes e devolve (último resultado, melhor tempo em segundos)."""
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*args, **kwargs)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
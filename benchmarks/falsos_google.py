@@ -0,0 +1,196 @@
+# benchmarks/falsos_google.py - Imitações em memória das APIs do Google usadas pelos scrapers
+#
+# Implementam só a parte da interface do gspread e do cliente do Drive que o pipeline usa, contando as chamadas e as células
+# lidas, para medir e exercitar o código sem credenciais nem rede.
+
+import os
+import re
+import json
+import time
+import threading
+
+import httplib2
+import requests
+import gspread
+from googleapiclient.http import HttpRequest
+
+def erro_api(codigo):
+    resposta = requests.Response()
+    resposta.status_code = codigo
+    resposta._content = json.dumps({"error": {"code": codigo, "message": "simulado", "status": "SIMULADO"}}).encode()
+    return gspread.exceptions.APIError(resposta)
+
+def _coluna_a1(letras):
+    numero = 0
+    for letra in letras:
+        numero = numero * 26 + ord(letra) - ord("A") + 1
+    return numero
+
+class PlanilhaFalsa:
+    """Imita um gspread.Worksheet: append_rows, col_values, get, get_all_values, clear e update."""
+
+    def __init__(self, falhas_429=0, respostas_perdidas=0, planilha_mae=None, cabecalho=None, falhas_leitura=0):
+        self.linhas = [cabecalho or ["cabecalho"] * 11]
+        self.chamadas = {"append_rows": 0, "col_values": 0, "get": 0, "get_all_values": 0, "clear": 0, "update": 0}
+        self.celulas_lidas = 0
+        self.falhas_429 = falhas_429
+        self.respostas_perdidas = respostas_perdidas
+        self.falhas_leitura = falhas_leitura  # col_values que falham com 503 antes de responder
+        self.spreadsheet = planilha_mae or ArquivoPlanilhaFalso()
+
+    def append_rows(self, linhas, value_input_option=None):
+        self.chamadas["append_rows"] += 1
+        if self.falhas_429:
+            self.falhas_429 -= 1
+            raise erro_api(429)
+        self.linhas.extend([list(linha) for linha in linhas])
+        if self.respostas_perdidas:
+            # A escrita foi aplicada, mas o cliente recebe um erro (ex.: timeout do gateway)
+            self.respostas_perdidas -= 1
+            raise erro_api(503)
+
+    def col_values(self, coluna):
+        self.chamadas["col_values"] += 1
+        if self.falhas_leitura:
+            self.falhas_leitura -= 1
+            raise erro_api(503)
+        valores = [linha[coluna - 1] if len(linha) >= coluna else "" for linha in self.linhas]
+        while valores and valores[-1] == "":
+            valores.pop()
+        self.celulas_lidas += len(valores)
+        return valores
+
+    def get(self, intervalo):
+        # Só intervalos de uma coluna, como "H10:H11"
+        self.chamadas["get"] += 1
+        inicio, fim = intervalo.split(":")
+        coluna = _coluna_a1(re.match(r"[A-Z]+", inicio).group())
+        linha_ini, linha_fim = int(re.search(r"\d+", inicio).group()), int(re.search(r"\d+", fim).group())
+        valores = []
+        for n in range(linha_ini, linha_fim + 1):
+            linha = self.linhas[n - 1] if n <= len(self.linhas) else []
+            valores.append([linha[coluna - 1]] if len(linha) >= coluna and linha[coluna - 1] != "" else [])
+        while valores and not valores[-1]:
+            valores.pop()
+        self.celulas_lidas += len(valores)
+        return valores
+
+    def get_all_values(self):
+        self.chamadas["get_all_values"] += 1
+        linhas = [linha for linha in self.linhas if any(linha)]
+        self.celulas_lidas += sum(len(linha) for linha in linhas)
+        return [list(linha) for linha in linhas]
+
+    def clear(self):
+        self.chamadas["clear"] += 1
+        self.linhas = []
+
+    def update(self, values=None, range_name=None, **kwargs):
+        self.chamadas["update"] += 1
+        self.linhas = [list(linha) for linha in values]
+
+class ArquivoPlanilhaFalso:
+    """Imita um gspread.Spreadsheet com worksheet() e add_worksheet()."""
+
+    def __init__(self):
+        self.abas = {}
+
+    def worksheet(self, titulo):
+        if titulo not in self.abas:
+            raise gspread.exceptions.WorksheetNotFound(titulo)
+        return self.abas[titulo]
+
+    def add_worksheet(self, title, rows=1000, cols=26):
+        aba = PlanilhaFalsa(planilha_mae=self)
+        aba.linhas = []
+        self.abas[title] = aba
+        return aba
+
+# --- Google Drive ---
+class _HttpDriveFalso:
+    """Faz o papel do httplib2.Http: responde aos pedidos de mídia com o conteúdo do arquivo, com latência simulada."""
+
+    def __init__(self, servico):
+        self.servico = servico
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        file_id = uri.rsplit("/", 1)[1]
+        conteudo = self.servico.conteudos[file_id]
+        inicio, fim = 0, len(conteudo) - 1
+        intervalo = (headers or {}).get("range")
+        if intervalo:
+            pedido_ini, pedido_fim = intervalo.split("=", 1)[1].split("-")
+            inicio, fim = int(pedido_ini), min(int(pedido_fim), len(conteudo) - 1)
+        parte = conteudo[inicio:fim + 1]
+        self.servico.contar("bytes", len(parte))
+        time.sleep(self.servico.latencia + len(parte) / self.servico.banda)
+        resposta = httplib2.Response({"status": 206, "content-range": f"bytes {inicio}-{fim}/{len(conteudo)}"})
+        return resposta, parte
+
+class _ArquivosDriveFalsos:
+    def __init__(self, servico):
+        self.servico = servico
+
+    def list(self, q=None, pageSize=100, pageToken=None, fields=None, orderBy=None, **kwargs):
+        servico = self.servico
+        arquivos = servico.arquivos
+        # Só o filtro por data é interpretado; o resto da consulta vale para todos os arquivos da pasta falsa
+        desde = re.search(r"modifiedTime >= '([^']+)'", q or "")
+        if desde:
+            arquivos = [a for a in arquivos if a["modifiedTime"] >= desde.group(1)]
+        inicio, tamanho = int(pageToken or 0), min(pageSize, 1000)
+        pagina = arquivos[inicio:inicio + tamanho]
+        servico.contar("itens_listados", len(pagina))
+        resposta = {"files": [dict(a) for a in pagina]}
+        if inicio + tamanho < len(arquivos):
+            resposta["nextPageToken"] = str(inicio + tamanho)
+        return _ExecucaoFalsa(servico, "list", resposta)
+
+    def get_media(self, fileId, **kwargs):
+        self.servico.contar("get_media")
+        return HttpRequest(_HttpDriveFalso(self.servico), lambda resp, conteudo: conteudo,
+                           f"https://drive.falso/files/{fileId}")
+
+class _ExecucaoFalsa:
+    def __init__(self, servico, chamada, resposta):
+        self.servico, self.chamada, self.resposta = servico, chamada, resposta
+
+    def execute(self, **kwargs):
+        self.servico.contar(self.chamada)
+        time.sleep(self.servico.latencia)
+        return self.resposta
+
+class ServicoDriveFalso:
+    """Imita o cliente `build('drive', 'v3')` para uma pasta com os PDFs de `caminhos`.
+
+    Os downloads passam pelo MediaIoBaseDownload de verdade; só a rede é trocada por `latencia` segundos por
+    pedido mais o tempo de transferir os bytes a `banda` bytes/s. Um mesmo objeto pode ser compartilhado por
+    vários "clientes" (um por thread), que somam as chamadas no mesmo contador.
+    """
+
+    def __init__(self, caminhos, latencia=0.2, banda=2 * 1024 * 1024):
+        self.latencia = latencia
+        self.banda = banda
+        self.arquivos, self.conteudos = [], {}
+        self.chamadas = {}
+        self._trava = threading.Lock()
+        for caminho in caminhos:
+            self.adicionar_arquivo(caminho)
+
+    def adicionar_arquivo(self, caminho, modificado_em=None):
+        """Coloca um PDF na pasta. Sem `modificado_em`, cada arquivo novo é um segundo mais recente que o anterior."""
+        file_id = f"id{len(self.arquivos):05d}"
+        with open(caminho, "rb") as f:
+            self.conteudos[file_id] = f.read()
+        if modificado_em is None:
+            modificado_em = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(1.7e9 + len(self.arquivos)))
+        arquivo = {"id": file_id, "name": os.path.basename(caminho), "modifiedTime": modificado_em}
+        self.arquivos.append(arquivo)
+        return arquivo
+
+    def contar(self, chamada, quantidade=1):
+        with self._trava:
+            self.chamadas[chamada] = self.chamadas.get(chamada, 0) + quantidade
+
+    def files(self):
+        return _ArquivosDriveFalsos(self)
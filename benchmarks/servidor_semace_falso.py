@@ -0,0 +1,97 @@
+# benchmarks/servidor_semace_falso.py - Servidor HTTP local que imita a página de boletins da SEMACE
+#
+# Serve uma página com links "Boletim das Praias de Fortaleza" para PDFs de pdfs_historicos, com ETag e
+# Last-Modified, respondendo 304 a pedidos condicionais. Conta pedidos, respostas 304, bytes e conexões TCP.
+
+import os
+import hashlib
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CAMINHO_PAGINA = "/boletim-de-balneabilidade/"
+
+class ServidorSemaceFalso:
+    """Uso: `with ServidorSemaceFalso(caminhos_pdf) as servidor: requests.get(servidor.url_pagina)`.
+
+    `publicar(caminho)` coloca um novo boletim no topo da página, como a SEMACE faz a cada semana.
+    """
+
+    def __init__(self, caminhos_pdf=()):
+        self.pdfs = {}          # nome na URL -> conteúdo
+        self.links = []         # nomes na ordem da página (mais recente primeiro)
+        self.contadores = {"pedidos": 0, "respostas_304": 0, "bytes": 0}
+        self.conexoes = set()
+        self.aviso = ""         # texto livre no topo da página; mudá-lo altera a página sem mudar os links
+        self._trava = threading.Lock()
+        servidor = self
+
+        class _Manipulador(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # mantém a conexão aberta entre pedidos (keep-alive)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                servidor._atender(self)
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), _Manipulador)
+        self.url_base = f"http://127.0.0.1:{self._http.server_address[1]}"
+        self.url_pagina = self.url_base + CAMINHO_PAGINA
+        for caminho in caminhos_pdf:  # do mais antigo para o mais recente, que fica no topo
+            self.publicar(caminho)
+
+    def __enter__(self):
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._http.shutdown()
+        self._http.server_close()
+
+    def publicar(self, caminho_pdf):
+        nome = os.path.basename(caminho_pdf).replace(" ", "_")
+        with open(caminho_pdf, "rb") as f:
+            self.pdfs[nome] = f.read()
+        self.links.insert(0, nome)
+        return f"{self.url_base}/arquivos/{nome}"
+
+    def zerar_contadores(self):
+        with self._trava:
+            self.contadores = {chave: 0 for chave in self.contadores}
+            self.conexoes = set()
+
+    def _pagina(self):
+        itens = "".join(f'<li><a href="/arquivos/{nome}">Boletim das Praias de Fortaleza - {nome}</a></li>'
+                        for nome in self.links)
+        return f"<html><body><h1>Boletins</h1><p>{self.aviso}</p><ul>{itens}</ul></body></html>".encode("utf-8")
+
+    def _atender(self, pedido):
+        if pedido.path == CAMINHO_PAGINA:
+            corpo, tipo = self._pagina(), "text/html; charset=utf-8"
+        elif pedido.path.startswith("/arquivos/") and pedido.path[len("/arquivos/"):] in self.pdfs:
+            corpo, tipo = self.pdfs[pedido.path[len("/arquivos/"):]], "application/pdf"
+        else:
+            pedido.send_error(404)
+            return
+        etag = '"' + hashlib.sha1(corpo).hexdigest() + '"'
+        with self._trava:
+            self.contadores["pedidos"] += 1
+            self.conexoes.add(pedido.client_address)
+        if pedido.headers.get("If-None-Match") == etag:
+            with self._trava:
+                self.contadores["respostas_304"] += 1
+            pedido.send_response(304)
+            pedido.send_header("ETag", etag)
+            pedido.send_header("Content-Length", "0")
+            pedido.end_headers()
+            return
+        with self._trava:
+            self.contadores["bytes"] += len(corpo)
+        pedido.send_response(200)
+        pedido.send_header("Content-Type", tipo)
+        pedido.send_header("Content-Length", str(len(corpo)))
+        pedido.send_header("ETag", etag)
+        pedido.send_header("Last-Modified", formatdate(usegmt=True))
+        pedido.end_headers()
+        pedido.wfile.write(corpo)
@@ -0,0 +1,136 @@
+# busca_http.py - Requisições condicionais (ETag/Last-Modified) ao site da SEMACE, com sessão reaproveitada
+
+import os
+import json
+import time
+import hashlib
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from arquivos_json import PASTA_ESTADO, gravar_json
+
+# --- Configurações ---
+# Validadores HTTP por URL e URLs de boletins já gravados na planilha, guardados entre execuções
+ARQUIVO_ESTADO_HTTP = os.path.join(PASTA_ESTADO, "estado_http.json")
+TIMEOUT = (10, 60)                  # segundos para conectar e para cada leitura
+TAMANHO_BLOCO = 256 * 1024
+TENTATIVAS = 3
+DOWNLOADS_PARALELOS = 4
+
+def criar_sessao(conexoes=4):
+    """Sessão com pool de conexões (keep-alive) e novas tentativas para falhas temporárias do servidor."""
+    sessao = requests.Session()
+    tentativas = Retry(total=TENTATIVAS, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+                       allowed_methods=("GET", "HEAD"))
+    adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes, max_retries=tentativas)
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    return sessao
+
+class BuscaCondicional:
+    """Busca páginas e PDFs só quando mudaram desde a última execução.
+
+    Guarda o ETag e o Last-Modified de cada URL e os reenvia (If-None-Match / If-Modified-Since); uma
+    resposta 304 custa apenas os cabeçalhos. O estado só vai para o disco em `salvar()`, que deve ser
+    chamado depois que os dados chegaram à planilha, para que uma execução que falhou seja refeita por inteiro.
+    """
+
+    def __init__(self, sessao=None, arquivo_estado=ARQUIVO_ESTADO_HTTP, timeout=TIMEOUT):
+        self.sessao = sessao or criar_sessao()
+        self.arquivo_estado = arquivo_estado
+        self.timeout = timeout
+        try:
+            with open(arquivo_estado, "r", encoding="utf-8") as f:
+                estado = json.load(f)
+        except (OSError, ValueError):
+            estado = {}
+        self.validadores = estado.get("validadores", {})   # url -> {"etag", "last_modified"}
+        self.processados = estado.get("processados", {})   # url do PDF -> numero_boletim
+        self.bytes_baixados = 0
+        self._trava = threading.Lock()
+
+    def _cabecalhos(self, url):
+        validador = self.validadores.get(url, {})
+        cabecalhos = {}
+        if validador.get("etag"):
+            cabecalhos["If-None-Match"] = validador["etag"]
+        if validador.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = validador["last_modified"]
+        return cabecalhos
+
+    def _guardar_validadores(self, url, resposta):
+        etag, modificado = resposta.headers.get("ETag"), resposta.headers.get("Last-Modified")
+        if etag or modificado:
+            self.validadores[url] = {"etag": etag, "last_modified": modificado}
+
+    def buscar_texto(self, url, condicional=True):
+        """Conteúdo da página, ou None se ela não mudou desde a última vez (HTTP 304)."""
+        cabecalhos = self._cabecalhos(url) if condicional else {}
+        resposta = self.sessao.get(url, headers=cabecalhos, timeout=self.timeout)
+        if resposta.status_code == 304:
+            return None
+        resposta.raise_for_status()
+        self.bytes_baixados += len(resposta.content)
+        self._guardar_validadores(url, resposta)
+        return resposta.text
+
+    def baixar_arquivo(self, url, destino, condicional=True):
+        """Grava o PDF em `destino` aos blocos, sem carregá-lo inteiro na memória.
+
+        Devolve False (sem tocar em `destino`) se o servidor respondeu 304.
+        """
+        cabecalhos = self._cabecalhos(url) if condicional else {}
+        with self.sessao.get(url, headers=cabecalhos, timeout=self.timeout, stream=True) as resposta:
+            if resposta.status_code == 304:
+                return False
+            resposta.raise_for_status()
+            caminho_tmp = f"{destino}.parcial"
+            with open(caminho_tmp, "wb") as f:
+                for bloco in resposta.iter_content(TAMANHO_BLOCO):
+                    f.write(bloco)
+                    with self._trava:
+                        self.bytes_baixados += len(bloco)
+            os.replace(caminho_tmp, destino)
+            self._guardar_validadores(url, resposta)
+        return True
+
+    def baixar_varios(self, urls, pasta_destino, max_paralelos=DOWNLOADS_PARALELOS):
+        """Baixa `urls` com até `max_paralelos` conexões simultâneas da mesma sessão.
+
+        Gera (url, caminho, erro, segundos) à medida que cada download termina; `caminho` é None quando o
+        servidor respondeu 304 ou houve erro.
+        """
+        os.makedirs(pasta_destino, exist_ok=True)
+
+        def _baixar(url):
+            destino = os.path.join(pasta_destino, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".pdf")
+            inicio = time.perf_counter()
+            try:
+                return (destino if self.baixar_arquivo(url, destino) else None), time.perf_counter() - inicio
+            except Exception as e:
+                e.segundos = time.perf_counter() - inicio
+                raise
+
+        with ThreadPoolExecutor(max_workers=max_paralelos) as executor:
+            futuros = {executor.submit(_baixar, url): url for url in urls}
+            for futuro in as_completed(futuros):
+                try:
+                    caminho, segundos = futuro.result()
+                    yield futuros[futuro], caminho, None, segundos
+                except Exception as e:
+                    yield futuros[futuro], None, e, getattr(e, "segundos", 0.0)
+
+    def ja_processado(self, url):
+        return url in self.processados
+
+    def marcar_processado(self, url, numero_boletim):
+        self.processados[url] = numero_boletim
+
+    def descartar_validadores(self, url):
+        """Esquece os validadores de `url`, forçando uma resposta completa na próxima execução."""
+        self.validadores.pop(url, None)
+
+    def salvar(self):
+        gravar_json(self.arquivo_estado, {"validadores": self.validadores, "processados": self.processados})
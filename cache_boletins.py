@@ -0,0 +1,131 @@
+# cache_boletins.py - Cache em disco das tabelas extraídas de cada boletim
+
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+import core_parser
+from core_parser import DocumentoBoletim, MOTOR_PADRAO
+from arquivos_json import gravar_json
+
+# --- Configurações ---
+PASTA_CACHE = ".cache_boletins"
+TAMANHO_MAXIMO_CACHE = 200 * 1024 * 1024  # bytes; as entradas menos usadas são removidas acima deste limite
+
+def _hash_bytes(dados: bytes) -> str:
+    return hashlib.sha256(dados).hexdigest()
+
+def hash_arquivo(caminho_pdf) -> str:
+    h = hashlib.sha256()
+    with open(caminho_pdf, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+# Qualquer alteração no código do core_parser muda a versão e invalida o cache automaticamente.
+with open(core_parser.__file__, "rb") as _f:
+    VERSAO_PARSER = _hash_bytes(_f.read())[:12]
+
+# Nome das entradas: <sha256 do PDF>-<motor>-<versão do parser>.json; o resto da pasta não é do cache
+_NOME_ENTRADA = re.compile(r"^[0-9a-f]{64}-[a-z]+-([0-9a-f]{12})\.json$")
+
+def _caminho_entrada(hash_pdf, pasta_cache=PASTA_CACHE, motor=MOTOR_PADRAO):
+    return os.path.join(pasta_cache, f"{hash_pdf}-{motor}-{VERSAO_PARSER}.json")
+
+def ler_cache(hash_pdf, pasta_cache=PASTA_CACHE, motor=MOTOR_PADRAO):
+    """Retorna (numero_boletim, periodo, df_pontos) do cache, ou None se o boletim ainda não foi processado."""
+    caminho = _caminho_entrada(hash_pdf, pasta_cache, motor)
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            entrada = json.load(f)
+    except (OSError, ValueError):
+        return None
+    os.utime(caminho)  # marca como usado recentemente para a remoção por tamanho
+    df_pontos = pd.DataFrame(entrada["pontos"], columns=["nome_praia", "status_sigla"])
+    return entrada["numero_boletim"], entrada["periodo"], df_pontos
+
+def gravar_cache(hash_pdf, numero_boletim, periodo, df_pontos, pasta_cache=PASTA_CACHE, motor=MOTOR_PADRAO):
+    pontos = df_pontos[["nome_praia", "status_sigla"]].values.tolist() if not df_pontos.empty else []
+    entrada = {
+        "versao_parser": VERSAO_PARSER,
+        "numero_boletim": numero_boletim,
+        "periodo": periodo,
+        "pontos": pontos,
+    }
+    caminho = _caminho_entrada(hash_pdf, pasta_cache, motor)
+    # Processos concorrentes nunca leem uma entrada pela metade
+    gravar_json(caminho, entrada, indent=None, sort_keys=False)
+    podar_cache(pasta_cache)
+
+def podar_cache(pasta_cache=PASTA_CACHE, tamanho_maximo=TAMANHO_MAXIMO_CACHE):
+    """Remove entradas de versões antigas do parser e, se preciso, as menos usadas até caber no limite.
+
+    Só arquivos com o nome de uma entrada do cache são considerados; os demais da pasta nunca são apagados.
+    """
+    try:
+        nomes = [(n, _NOME_ENTRADA.match(n)) for n in os.listdir(pasta_cache)]
+    except OSError:
+        return
+    entradas = []
+    for nome, entrada in nomes:
+        if entrada is None: continue
+        caminho = os.path.join(pasta_cache, nome)
+        try:
+            if entrada.group(1) != VERSAO_PARSER:
+                os.remove(caminho)
+                continue
+            st = os.stat(caminho)
+        except OSError:
+            continue
+        entradas.append((st.st_mtime, st.st_size, caminho))
+
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= tamanho_maximo:
+            break
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+        total -= tamanho
+
+# --- Documento com Cache ---
+class DocumentoComCache(DocumentoBoletim):
+    """DocumentoBoletim que consulta o cache antes de abrir o PDF e grava nele a tabela extraída."""
+
+    def __init__(self, origem, pasta_cache=PASTA_CACHE, motor=MOTOR_PADRAO):
+        super().__init__(origem, motor)
+        self.pasta_cache = pasta_cache
+        if isinstance(origem, (bytes, bytearray)):
+            self.hash_pdf = _hash_bytes(origem)
+        else:
+            self.hash_pdf = hash_arquivo(origem)
+        em_cache = ler_cache(self.hash_pdf, pasta_cache, motor)
+        if em_cache is not None:
+            self._metadados = em_cache[:2]
+            self._pontos = em_cache[2]
+
+    def pontos(self):
+        if self._pontos is None:
+            df_pontos = super().pontos()
+            numero_boletim, periodo = self.metadados()
+            # Só uma leitura sem erros vai para o cache; uma falha passageira (nos metadados ou na extração)
+            # gravada como boletim vazio seria devolvida em todas as execuções seguintes
+            if not self.erros:
+                gravar_cache(self.hash_pdf, numero_boletim, periodo, df_pontos, self.pasta_cache, self.motor)
+        return self._pontos
+
+def extrair_pontos_com_cache(caminho_pdf, pasta_cache=PASTA_CACHE, motor=MOTOR_PADRAO):
+    with DocumentoComCache(caminho_pdf, pasta_cache, motor) as doc:
+        numero_boletim, periodo = doc.metadados()
+        return numero_boletim, periodo, doc.pontos()
+
+def metadados_com_cache(caminho_pdf, pasta_cache=PASTA_CACHE):
+    """Como extrair_metadados_pdf, mas usa o cache quando o boletim já foi processado antes."""
+    with DocumentoComCache(caminho_pdf, pasta_cache) as doc:
+        return doc.metadados()
+
+def processar_pdf_com_cache(caminho_pdf, link_boletim="", pasta_cache=PASTA_CACHE, motor=MOTOR_PADRAO, expandir=True):
+    with DocumentoComCache(caminho_pdf, pasta_cache, motor) as doc:
+        return doc.processar(link_boletim, expandir)
@@ -0,0 +1,178 @@
+# consulta_historico.py - Consultas rápidas ao histórico: índice em memória com a situação de cada ponto por dia
+
+import argparse
+import numpy as np
+import pandas as pd
+from banco_sqlite import ARQUIVO_SQLITE, abrir_banco, carregar_observacoes
+from historico_parquet import ARQUIVO_CSV_PLANILHA, PASTA_HISTORICO_PARQUET, carregar_historico
+
+STATUS_PROPRIA = "Própria para banho"
+STATUS_IMPROPRIA = "Imprópria para banho"
+COLUNAS_INDICE = ["id_ponto", "data_coleta", "zona", "status", "numero_boletim"]
+
+# Quantidade de bits 1 em cada valor de byte, para contar dias direto na matriz compactada
+_BITS_POR_BYTE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+def _dia(data):
+    return np.datetime64(pd.Timestamp(data).date(), "D")
+
+class IndiceHistorico:
+    """Situação de cada ponto em cada dia, em duas matrizes de bits (pontos x dias) compactadas por np.packbits.
+
+    `observado` marca os dias cobertos por algum boletim e `impropria` os dias em que o ponto estava impróprio.
+    Os pontos viram posições inteiras (ordem alfabética do id) e os dias, números a partir do primeiro dia do
+    histórico. Quando dois boletins cobrem o mesmo dia, vale o de número maior (o publicado por último).
+    """
+
+    def __init__(self, pontos, zonas, dia_inicial, observado, impropria, n_dias):
+        self.pontos = pontos                          # array de ids, na ordem das linhas das matrizes
+        self.zonas = zonas                            # zona de cada linha
+        self.posicao = {p: i for i, p in enumerate(pontos)}
+        self.dia_inicial = dia_inicial
+        self.n_dias = n_dias
+        self.observado = observado                    # uint8, pontos x ceil(n_dias / 8)
+        self.impropria = impropria
+
+    @classmethod
+    def construir(cls, df):
+        """Monta o índice a partir da tabela diária (colunas id_ponto, data_coleta, zona, status, numero_boletim)."""
+        df = df[COLUNAS_INDICE].dropna(subset=["id_ponto", "data_coleta"])
+        df = df.sort_values("numero_boletim", kind="stable")
+        df = df.drop_duplicates(subset=["id_ponto", "data_coleta"], keep="last")
+
+        pontos, linha = np.unique(df["id_ponto"].astype(str).to_numpy(), return_inverse=True)
+        dias = pd.to_datetime(df["data_coleta"]).to_numpy().astype("datetime64[D]")
+        dia_inicial = dias.min()
+        coluna = (dias - dia_inicial).astype(np.int64)
+        n_dias = int(coluna.max()) + 1
+
+        observado = np.zeros((len(pontos), n_dias), dtype=bool)
+        impropria = np.zeros((len(pontos), n_dias), dtype=bool)
+        observado[linha, coluna] = True
+        impropria[linha, coluna] = (df["status"] == STATUS_IMPROPRIA).to_numpy()
+
+        zonas = pd.Series(df["zona"].astype(str).to_numpy()).groupby(linha).last().reindex(range(len(pontos))).to_numpy()
+        return cls(pontos, zonas, dia_inicial, np.packbits(observado, axis=1), np.packbits(impropria, axis=1), n_dias)
+
+    @classmethod
+    def carregar(cls, pasta=PASTA_HISTORICO_PARQUET):
+        return cls.construir(carregar_historico(pasta, colunas=COLUNAS_INDICE))
+
+    @classmethod
+    def de_csv(cls, arquivo=ARQUIVO_CSV_PLANILHA):
+        return cls.construir(pd.read_csv(arquivo, encoding="utf-8-sig", usecols=COLUNAS_INDICE, dtype=str))
+
+    @classmethod
+    def de_sqlite(cls, arquivo=ARQUIVO_SQLITE):
+        conexao = abrir_banco(arquivo)
+        try:
+            return cls.construir(carregar_observacoes(conexao))
+        finally:
+            conexao.close()
+
+    # --- Acesso aos bits ---
+    def _coluna(self, data):
+        coluna = int((_dia(data) - self.dia_inicial).astype(np.int64))
+        return coluna if 0 <= coluna < self.n_dias else None
+
+    def _intervalo(self, inicio, fim):
+        # Converte datas (inclusivas) em colunas, limitadas ao período coberto pelo histórico
+        c0 = 0 if inicio is None else max(int((_dia(inicio) - self.dia_inicial).astype(np.int64)), 0)
+        c1 = self.n_dias - 1 if fim is None else min(int((_dia(fim) - self.dia_inicial).astype(np.int64)), self.n_dias - 1)
+        return c0, c1
+
+    def _bit(self, plano, linha, coluna):
+        return bool(plano[linha, coluna >> 3] & (0x80 >> (coluna & 7)))
+
+    def _contar(self, plano, linhas, c0, c1):
+        # Conta os bits 1 das colunas c0..c1 (inclusive) nas linhas pedidas, sem descompactar a matriz
+        if c1 < c0: return 0
+        b0, b1 = c0 >> 3, c1 >> 3
+        trecho = plano[linhas, b0:b1 + 1].copy()
+        trecho[..., 0] &= 0xFF >> (c0 & 7)
+        trecho[..., -1] &= (0xFF << (7 - (c1 & 7))) & 0xFF
+        return int(_BITS_POR_BYTE[trecho].sum())
+
+    def _linhas(self, id_ponto=None, zona=None):
+        if id_ponto is not None:
+            return [self.posicao[id_ponto]] if id_ponto in self.posicao else []
+        if zona is not None:
+            return np.flatnonzero(self.zonas == zona)
+        return slice(None)
+
+    # --- Consultas ---
+    # Um ponto que não aparece no histórico é tratado como sem boletim: None (ou (None, 0) na sequência)
+    def status_em(self, id_ponto, data):
+        """Situação do ponto no dia, ou None se nenhum boletim cobre esse dia."""
+        linha, coluna = self.posicao.get(id_ponto), self._coluna(data)
+        if linha is None or coluna is None or not self._bit(self.observado, linha, coluna):
+            return None
+        return STATUS_IMPROPRIA if self._bit(self.impropria, linha, coluna) else STATUS_PROPRIA
+
+    def sequencia(self, id_ponto, data=None):
+        """(situação, dias seguidos nessa situação até `data`), por padrão até o último dia observado do ponto."""
+        linha = self.posicao.get(id_ponto)
+        if linha is None:
+            return None, 0
+        observado = np.unpackbits(self.observado[linha], count=self.n_dias).astype(bool)
+        coluna = self._coluna(data) if data is not None else int(np.flatnonzero(observado)[-1])
+        if coluna is None or not observado[coluna]:
+            return None, 0
+        impropria = np.unpackbits(self.impropria[linha], count=self.n_dias)[: coluna + 1].astype(bool)
+        atual = impropria[coluna]
+        # A sequência termina no último dia anterior com outra situação ou sem boletim
+        quebras = np.flatnonzero((impropria != atual) | ~observado[: coluna + 1])
+        inicio = quebras[-1] + 1 if len(quebras) else 0
+        return (STATUS_IMPROPRIA if atual else STATUS_PROPRIA), int(coluna - inicio + 1)
+
+    def taxa_impropria(self, id_ponto=None, zona=None, inicio=None, fim=None):
+        """Fração dos dias com boletim em que o ponto (ou a zona, ou todos) estava impróprio no período."""
+        linhas = self._linhas(id_ponto, zona)
+        c0, c1 = self._intervalo(inicio, fim)
+        observados = self._contar(self.observado, linhas, c0, c1)
+        return self._contar(self.impropria, linhas, c0, c1) / observados if observados else None
+
+    def taxa_impropria_por_ponto(self, inicio=None, fim=None):
+        return {p: self.taxa_impropria(p, inicio=inicio, fim=fim) for p in self.pontos}
+
+    def taxa_impropria_por_zona(self, inicio=None, fim=None):
+        return {z: self.taxa_impropria(zona=z, inicio=inicio, fim=fim) for z in sorted(set(self.zonas))}
+
+    def status_por_zona(self, data=None):
+        """Quantos pontos de cada zona estavam próprios/impróprios no dia (por padrão, o último do histórico)."""
+        coluna = self.n_dias - 1 if data is None else self._coluna(data)
+        if coluna is None: return {}
+        byte, mascara = coluna >> 3, 0x80 >> (coluna & 7)
+        observado = (self.observado[:, byte] & mascara).astype(bool)
+        impropria = (self.impropria[:, byte] & mascara).astype(bool)
+        resultado = {}
+        for zona in sorted(set(self.zonas)):
+            na_zona = (self.zonas == zona) & observado
+            improprios = int((na_zona & impropria).sum())
+            resultado[zona] = {STATUS_PROPRIA: int(na_zona.sum()) - improprios, STATUS_IMPROPRIA: improprios}
+        return resultado
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resumo da balneabilidade a partir do histórico em Parquet.")
+    parser.add_argument("--pasta", default=PASTA_HISTORICO_PARQUET, help="Pasta do dataset Parquet.")
+    fonte = parser.add_mutually_exclusive_group()
+    fonte.add_argument("--csv", metavar="ARQUIVO", help="Lê o CSV da planilha em vez do dataset Parquet.")
+    fonte.add_argument("--sqlite", metavar="ARQUIVO", help="Lê o banco SQLite local em vez do dataset Parquet.")
+    parser.add_argument("--inicio", help="Primeiro dia do período (aaaa-mm-dd).")
+    parser.add_argument("--fim", help="Último dia do período (aaaa-mm-dd).")
+    args = parser.parse_args()
+
+    if args.csv:
+        indice = IndiceHistorico.de_csv(args.csv)
+    elif args.sqlite:
+        indice = IndiceHistorico.de_sqlite(args.sqlite)
+    else:
+        indice = IndiceHistorico.carregar(args.pasta)
+    ultimo_dia = indice.dia_inicial + np.timedelta64(indice.n_dias - 1, "D")
+    print(f"{len(indice.pontos)} pontos, {indice.n_dias} dias ({indice.dia_inicial} a {ultimo_dia}).")
+    print(f"\nSituação em {ultimo_dia} por zona:")
+    for zona, contagem in indice.status_por_zona().items():
+        print(f"  {zona:<8} {contagem[STATUS_PROPRIA]:>3} próprios, {contagem[STATUS_IMPROPRIA]:>3} impróprios")
+    print("\nDias impróprios no período:")
+    for zona, taxa in indice.taxa_impropria_por_zona(args.inicio, args.fim).items():
+        print(f"  {zona:<8} {taxa:.1%}" if taxa is not None else f"  {zona:<8} sem dados")
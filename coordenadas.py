@@ -21,7 +21,7 @@ COORDENADAS_POR_CODIGO = {
     "16C": "-3.7251629851799564, -38.49667740963063",
     "17C": "-3.7237702642754376, -38.500652437528764",
     "18C": "-3.722008145836255, -38.50640041246369",
-    "19C": "-3.720513556755591, -3.50955939375314",
+    "19C": "-3.720513556755591, -38.50955939375314",
     "20C": "-3.7183126988172153, -38.51694544649395",
     "69C": "-3.7190454689893016, -38.51332320025104",
     "22O": "-3.718587076916991, -38.53244295754537",
@@ -34,4 +34,42 @@ COORDENADAS_POR_CODIGO = {
     "29O": "-3.69499606239996, -38.579964125958966",
     "30O": "-3.693798305915436, -38.58376844156292",
     "31O": "-3.6932983239755615, -38.58761246540475",
-}
\ No newline at end of file
+}
+
+# --- Nome de cada ponto, como aparece nos boletins ---
+
+NOMES_POR_CODIGO = {
+    "01L": "01L - P. do Futuro - Praia do Caça e Pesca. Na altura da rua Germiniano Jurema.",
+    "02L": "02L - P. do Futuro - Na altura da Capela de Santa Terezinha. Próximo ao Posto Guarda-vidas 09.",
+    "03L": "03L - P. do Futuro - Na altura da rua Embratel. Próximo ao Posto Guarda-vidas 08.",
+    "04L": "04L - P. do Futuro - Na altura da rua Francisco Montenegro. Próximo ao Posto Guarda-vidas 06.",
+    "05L": "05L - P. do Futuro - Na altura da rua Antônio Atualpa Rodrigues.",
+    "06L": "06L - P. do Futuro - Na altura da av. Carlos Jereissati.",
+    "07L": "07L - P. do Futuro - Na altura da rua Gerôncio Brígido Neto. Próximo ao Posto Guarda-vidas 01.",
+    "08L": "08L - P. do Futuro - Na altura da rua Clóvis Mota. Em frente ao Clube dos Oficiais da Polícia e Bombeiro Militares.",
+    "09L": "09L - P. do Futuro - Na altura da Areninha Praia do Futuro I.",
+    "10L": "10L - P. do Futuro - Na altura da rua Ismael Pordeus.",
+    "11L": "11L - P. do Titanzinho - Praia do Titanzinho.",
+    "32L": "32L - P. da Abreulândia - Na altura da rua Teófilo Ramos.",
+    "67L": "67L - P. da Sabiaguaba - Na altura da rua Sabiaguaba.",
+    "12C": "12C - P. do Mucuripe - Porto dos Botes. Na altura da rua Interna.",
+    "13C": "13C - P. do Mucuripe - Ao lado do Mercado dos Peixes do Mucuripe.",
+    "14C": "14C - P. do Mucuripe - Na altura da Estátua Iracema do Mucuripe.",
+    "15C": "15C - P. do Mucuripe - Na altura do Jardim Japonês e da Arena Beira Mar.",
+    "16C": "16C - P. do Meireles - Na altura da av. Desembargador Moreira. Próximo à Feirinha da Beira Mar.",
+    "17C": "17C - P. do Meireles - Na altura da rua José Vilar. Próximo ao Posto Guarda-vidas 06.",
+    "18C": "18C - P. do Meireles - Na altura da av. Rui Barbosa. No Aterro.",
+    "19C": "19C - P. de Iracema - Na altura da Estátua de Iracema Guardiã. No Aterrinho.",
+    "20C": "20C - P. de Iracema - Na altura da av. Almirante Tamandaré. Próximo à Ponte Metálica.",
+    "69C": "69C - P. de Iracema - Praia dos Crush. Na altura do Centro Cultural Belchior",
+    "22O": "22O - P. da Leste Oeste - Próximo à Igreja de Santa Edwiges.",
+    "23O": "23O - P. do Pirambu - Praia da Leste. Na altura da av. Filomeno Gomes.",
+    "24O": "24O - P. do Pirambu - Praia da Formosa. Na altura do Posto de Saúde Guiomar Arruda.",
+    "25O": "25O - P. da Colônia - Ao final da av. Pasteur. Próximo à Estação Elevatória Arpoador, da Cagece.",
+    "26O": "26O - P. da Colônia - Praia do “L”. Na altura da rua Dr. Theberge.",
+    "27O": "27O - P. Barra do Ceará - Praia do Coqueirinho. Próximo ao Projeto 4 varas (Horta).",
+    "28O": "28O - P. Barra do Ceará - Praia das Goiabeiras. Na altura da rua Coqueiro Verde.",
+    "29O": "29O - P. Barra do Ceará - Na altura da rua Bom Jesus.",
+    "30O": "30O - P. Barra do Ceará - Praia da Barra do Ceará. Na altura da rua Rita das Goiabeiras.",
+    "31O": "31O - P. Barra do Ceará - Foz do Rio Ceará.",
+}
@@ -1,33 +1,72 @@
 # core_parser.py (VERSÃO FINAL)
 
-import pdfplumber
-import camelot
+import io
+import re
+import numpy as np
 import pandas as pd
 import unicodedata
-from datetime import datetime, timedelta
-from coordenadas import COORDENADAS_POR_CODIGO
+from functools import lru_cache
+from datetime import datetime
+from registro_pontos import REGISTRO_PONTOS
+
+# Motores de extração de tabelas disponíveis em processar_pdf_completo
+MOTORES_TABELA = ("camelot", "pdfplumber")
+MOTOR_PADRAO = "camelot"
+# Distância horizontal mínima (pt) entre o nome do ponto e a sigla P/I para separá-los em colunas
+ESPACO_MIN_COLUNA = 8
+# Tolerância vertical (pt) para considerar duas palavras na mesma linha
+TOLERANCIA_LINHA = 3
+
+# Termos que identificam linhas de cabeçalho/rodapé nas tabelas extraídas
+TERMOS_RUIDO = ["nome", "status", "trecho", "ponto", "boletim", "semace"]
+
+# Número do boletim no nome dos arquivos publicados pela SEMACE
+_NUMERO_NO_NOME = re.compile(r"(\d{9})-BOL")
+
+# Colunas da tabela final: uma linha por ponto e dia, ou uma linha por ponto e boletim (expandir=False)
+COLUNAS_FINAIS = [
+    "id_ponto", "data_coleta", "nome_praia", "zona", "status",
+    "latitude", "longitude", "numero_boletim", "link_boletim",
+    "data_extracao", "periodo_validade"
+]
+COLUNAS_POR_PERIODO = [
+    "id_ponto", "data_inicio", "data_fim", "nome_praia", "zona", "status",
+    "latitude", "longitude", "numero_boletim", "link_boletim",
+    "data_extracao", "periodo_validade"
+]
 
 # --- Funções Auxiliares (sem alterações) ---
 def extract_point_code(nome: str) -> str:
     return (nome[:3] or "").strip().upper()
 
-def expand_periodo(periodo_str: str):
+def numero_pelo_nome(nome_arquivo: str):
+    """Número do boletim contido no nome do arquivo ou na URL (ex.: "Boletim - 202501311-BOL4315...pdf"), ou None."""
+    achado = _NUMERO_NO_NOME.search(nome_arquivo or "")
+    return f"{achado.group(1)}-BOL" if achado else None
+
+def intervalo_periodo(periodo_str: str):
+    """Retorna (inicio, fim) do período "dd/mm/aaaa a dd/mm/aaaa" como Timestamps, ou None se for inválido."""
     try:
         inicio_str, fim_str = [p.strip() for p in periodo_str.split("a")]
-        dt_inicio = datetime.strptime(inicio_str, "%d/%m/%Y")
-        dt_fim = datetime.strptime(fim_str, "%d/%m/%Y")
-        dias = []
-        atual = dt_inicio
-        while atual <= dt_fim:
-            dias.append(atual.strftime("%Y-%m-%d"))
-            atual += timedelta(days=1)
-        return dias
+        dt_inicio = pd.to_datetime(inicio_str, format="%d/%m/%Y")
+        dt_fim = pd.to_datetime(fim_str, format="%d/%m/%Y")
     except Exception:
+        return None
+    if dt_fim < dt_inicio:
+        return None
+    return dt_inicio, dt_fim
+
+def expand_periodo(periodo_str: str):
+    intervalo = intervalo_periodo(periodo_str)
+    if intervalo is None:
         return []
+    return pd.date_range(*intervalo, freq="D").strftime("%Y-%m-%d").tolist()
 
+@lru_cache(maxsize=4096)
 def strip_accents(s: str) -> str:
     return "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn")
 
+@lru_cache(maxsize=4096)
 def classify_zona(nome: str) -> str:
     n = strip_accents((nome or "").lower())
     leste_kw = ["futuro", "caca e pesca", "abreulandia", "sabiaguaba", "titanzinho"]
@@ -44,80 +83,233 @@ def clean_status_token(tok: str) -> str:
 
 def is_noise_row(nome: str, status: str) -> bool:
     txt = f"{str(nome)} {str(status)}".lower()
-    noise_terms = ["nome", "status", "trecho", "ponto", "boletim", "semace"]
     if len(txt.strip()) < 3: return True
-    return any(term in txt for term in noise_terms)
+    return any(term in txt for term in TERMOS_RUIDO)
 
 # --- Funções Principais de Processamento ---
-def extrair_metadados_pdf(caminho_pdf):
-    try:
-        with pdfplumber.open(caminho_pdf) as pdf:
-            texto_pg1 = pdf.pages[0].extract_text()
-            texto_pg1 = " ".join(texto_pg1.split())
-            numero_boletim, periodo = "", ""
-            if "Nº" in texto_pg1 and "Período:" in texto_pg1:
-                bol_index = texto_pg1.find("Nº")
-                per_index = texto_pg1.find("Período:", bol_index)
-                numero_boletim = texto_pg1[bol_index + 2:per_index].strip().replace("o", "")
-                tipos_index = texto_pg1.find("Tipos de amostras:", per_index)
-                periodo_raw = texto_pg1[per_index + len("Período:"):tipos_index if tipos_index != -1 else None].strip()
-                partes = periodo_raw.replace(" de ", "/").split()
-                if len(partes) >= 3 and partes[1].lower() == 'a':
-                    periodo = f"{partes[0]} a {partes[2]}"
-                else:
-                    periodo = periodo_raw
-                return numero_boletim, periodo
-    except Exception:
-        return None, None
+def _metadados_do_texto(texto_pg1):
+    texto_pg1 = " ".join(texto_pg1.split())
+    numero_boletim, periodo = "", ""
+    if "Nº" in texto_pg1 and "Período:" in texto_pg1:
+        bol_index = texto_pg1.find("Nº")
+        per_index = texto_pg1.find("Período:", bol_index)
+        numero_boletim = texto_pg1[bol_index + 2:per_index].strip().replace("o", "")
+        tipos_index = texto_pg1.find("Tipos de amostras:", per_index)
+        periodo_raw = texto_pg1[per_index + len("Período:"):tipos_index if tipos_index != -1 else None].strip()
+        partes = periodo_raw.replace(" de ", "/").split()
+        if len(partes) >= 3 and partes[1].lower() == 'a':
+            periodo = f"{partes[0]} a {partes[2]}"
+        else:
+            periodo = periodo_raw
+        return numero_boletim, periodo
     return None, None
 
-def processar_pdf_completo(caminho_pdf, link_boletim=""):
-    numero_boletim, periodo = extrair_metadados_pdf(caminho_pdf)
-    if not numero_boletim or not periodo:
-        return pd.DataFrame()
+def _explodir_linhas(coluna):
+    """Quebra cada célula nas suas linhas de texto. Devolve (id da linha de origem, texto sem espaços nas bordas)."""
+    partes = coluna.astype(str).str.split("\n").explode()
+    return partes.index.to_numpy(), partes.str.strip()
 
-    try:
-        tables = camelot.read_pdf(caminho_pdf, pages="1-end", flavor="stream")
-    except Exception:
-        return pd.DataFrame()
-    
-    dfs_norm = []
-    for t in tables:
-        df_raw = t.df.copy()
-        if df_raw.shape[1] < 2: continue
-        df_raw = df_raw.iloc[:, :2]
-        df_raw.columns = ["Nome", "Status"]
-        linhas = []
-        for _, row in df_raw.iterrows():
-            nomes = [x.strip() for x in str(row["Nome"]).split("\n") if x.strip()]
-            status_tokens = [clean_status_token(x) for x in str(row["Status"]).split("\n")]
-            status_tokens = [x for x in status_tokens if x]
-            if not nomes or not status_tokens: continue
-            if len(status_tokens) == 1 and len(nomes) > 1:
-                for n in nomes:
-                    if not is_noise_row(n, status_tokens[0]):
-                        linhas.append({"nome_praia": n, "status_sigla": status_tokens[0]})
-            else:
-                for n, s in zip(nomes, status_tokens):
-                    if not is_noise_row(n, s):
-                        linhas.append({"nome_praia": n, "status_sigla": s})
-        if linhas:
-            dfs_norm.append(pd.DataFrame(linhas))
-
-    if not dfs_norm: return pd.DataFrame()
-
-    df = pd.concat(dfs_norm, ignore_index=True)
-    df["nome_praia"] = df["nome_praia"].apply(lambda x: " ".join(x.split()))
-    df = df.drop_duplicates(subset=["nome_praia"]).reset_index(drop=True)
-
-    df["id_ponto"] = df["nome_praia"].apply(extract_point_code)
-    df["zona"] = df["nome_praia"].apply(classify_zona)
+def _posicao_no_grupo(ids):
+    # Equivalente a groupby(ids).cumcount() para ids já ordenados, sem o custo de um groupby
+    if len(ids) == 0: return np.zeros(0, dtype=np.int64)
+    inicios = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    tamanhos = np.diff(np.r_[inicios, len(ids)])
+    return np.arange(len(ids)) - np.repeat(inicios, tamanhos)
+
+def _normalizar_celulas(df_raw):
+    """Normaliza as células (Nome, Status, boletim) de várias tabelas de uma vez; devolve nome/sigla por boletim."""
+    ids_nome, nomes = _explodir_linhas(df_raw["Nome"])
+    validos = (nomes != "").to_numpy()
+    ids_nome, nomes = ids_nome[validos], nomes.to_numpy()[validos]
+
+    ids_sigla, siglas = _explodir_linhas(df_raw["Status"])
+    siglas = siglas.str.upper()
+    validos = siglas.isin(["P", "I"]).to_numpy()
+    ids_sigla, siglas = ids_sigla[validos], siglas.to_numpy()[validos]
+
+    # Com uma única sigla na célula todos os nomes a recebem; senão, o n-ésimo nome recebe a n-ésima sigla
+    contagem = np.bincount(ids_sigla, minlength=len(df_raw))
+    qtd_siglas = contagem[ids_nome]
+    primeira_sigla = np.r_[0, np.cumsum(contagem)][ids_nome]
+    posicao = np.where(qtd_siglas == 1, 0, _posicao_no_grupo(ids_nome))
+    pareados = posicao < qtd_siglas
+    df = pd.DataFrame({
+        "boletim": df_raw["boletim"].to_numpy()[ids_nome[pareados]],
+        "nome_praia": nomes[pareados],
+        "status_sigla": siglas[(primeira_sigla + posicao)[pareados]],
+    })
+
+    ruido = df["nome_praia"].str.lower().str.contains("|".join(TERMOS_RUIDO), regex=True)
+    df = df[~ruido]
+    df = df.assign(nome_praia=df["nome_praia"].str.replace(r"\s+", " ", regex=True).str.strip())
+    return df.drop_duplicates(subset=["boletim", "nome_praia"])
+
+def _celulas_brutas(boletins):
+    # Empilha as duas primeiras colunas de todas as tabelas, marcando a qual boletim cada linha pertence
+    nomes, siglas, ids = [], [], []
+    for i, tabelas_brutas in enumerate(boletins):
+        for t in tabelas_brutas:
+            if t.shape[1] < 2: continue
+            nomes.append(t.iloc[:, 0].to_numpy(dtype=object))
+            siglas.append(t.iloc[:, 1].to_numpy(dtype=object))
+            ids.append(np.full(len(t), i))
+    if not nomes:
+        return pd.DataFrame({"Nome": [], "Status": [], "boletim": np.zeros(0, dtype=np.int64)})
+    return pd.DataFrame({"Nome": np.concatenate(nomes), "Status": np.concatenate(siglas),
+                         "boletim": np.concatenate(ids)})
+
+def normalizar_tabelas_em_lote(boletins):
+    """Como _normalizar_tabelas, para uma lista de boletins (cada um uma lista de tabelas brutas) em uma só passada.
+
+    Devolve uma tabela de pontos por boletim, na mesma ordem. Útil para reprocessar o arquivo histórico inteiro.
+    """
+    df = _normalizar_celulas(_celulas_brutas(boletins))
+    grupos = {i: g.drop(columns="boletim").reset_index(drop=True) for i, g in df.groupby("boletim", sort=False)}
+    return [grupos.get(i, pd.DataFrame()) for i in range(len(boletins))]
+
+def _normalizar_tabelas(tabelas_brutas):
+    """Converte as tabelas brutas (Nome, Status, ...) na tabela de pontos sem duplicatas.
+
+    Cada célula pode trazer vários nomes/siglas separados por quebra de linha. Nomes e siglas válidas (P/I) são
+    pareados pela posição; se a célula tem uma única sigla, ela vale para todos os nomes da célula.
+    """
+    df = _normalizar_celulas(_celulas_brutas([tabelas_brutas]))
+    if df.empty: return pd.DataFrame()
+    return df.drop(columns="boletim").reset_index(drop=True)
+
+def _tabela_por_palavras(pagina):
+    """Remonta as linhas (Nome, Status) de uma página a partir das coordenadas das palavras do pdfplumber.
+
+    Cada linha de texto vira uma linha da tabela; a última palavra vai para a coluna Status quando está
+    separada do restante por um espaço maior que ESPACO_MIN_COLUNA, como a sigla P/I dos boletins.
+    """
+    palavras = sorted(pagina.extract_words(), key=lambda w: (w["top"], w["x0"]))
+    linhas = []
+    for palavra in palavras:
+        if linhas and abs(linhas[-1][0]["top"] - palavra["top"]) <= TOLERANCIA_LINHA:
+            linhas[-1].append(palavra)
+        else:
+            linhas.append([palavra])
+
+    registros = []
+    for linha in linhas:
+        linha.sort(key=lambda w: w["x0"])
+        if len(linha) >= 2 and linha[-1]["x0"] - linha[-2]["x1"] > ESPACO_MIN_COLUNA:
+            registros.append([" ".join(w["text"] for w in linha[:-1]), linha[-1]["text"]])
+        else:
+            registros.append([" ".join(w["text"] for w in linha), ""])
+    return pd.DataFrame(registros, columns=["Nome", "Status"])
+
+class DocumentoBoletim:
+    """Abre um boletim uma única vez e compartilha o documento entre os metadados e a extração das tabelas.
+
+    `origem` pode ser o caminho do PDF ou o seu conteúdo em bytes e `motor` um dos MOTORES_TABELA. Cada
+    etapa é calculada sob demanda e guardada, de modo que `metadados()` nunca dispara a extração de tabelas.
+    Falhas não interrompem o processamento, mas ficam em `erros` para quem precisar relatá-las.
+    """
+
+    def __init__(self, origem, motor=MOTOR_PADRAO):
+        if motor not in MOTORES_TABELA:
+            raise ValueError(f"Motor de tabelas desconhecido: {motor!r}. Use um de {MOTORES_TABELA}.")
+        self.origem = origem
+        self.motor = motor
+        self._pdf = None
+        self._metadados = None
+        self._pontos = None
+        self.erros = {}  # etapa -> exceção engolida (o processamento segue devolvendo vazio, como antes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def fechar(self):
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    def _fonte(self):
+        if isinstance(self.origem, (bytes, bytearray)):
+            return io.BytesIO(self.origem)
+        return self.origem
+
+    @property
+    def pdf(self):
+        if self._pdf is None:
+            import pdfplumber  # importado só quando um PDF é aberto, para não pesar no início dos scrapers
+            self._pdf = pdfplumber.open(self._fonte())
+        return self._pdf
+
+    def metadados(self):
+        """(numero_boletim, periodo) lidos apenas do texto da primeira página."""
+        if self._metadados is None:
+            try:
+                self._metadados = _metadados_do_texto(self.pdf.pages[0].extract_text())
+            except Exception as e:
+                self.erros["metadados"] = e
+                self._metadados = (None, None)
+        return self._metadados
+
+    def _tabelas_camelot(self):
+        # O camelot não aceita as páginas já abertas pelo pdfplumber; recebe o mesmo caminho/conteúdo.
+        # Ele carrega o OpenCV e é o import mais caro do projeto, por isso só entra quando é usado.
+        import camelot
+        tables = camelot.read_pdf(self._fonte(), pages="1-end", flavor="stream")
+        return [t.df for t in tables]
+
+    def _tabelas_pdfplumber(self):
+        # Reaproveita as páginas já abertas para os metadados, sem um segundo motor de PDF.
+        return [_tabela_por_palavras(pagina) for pagina in self.pdf.pages]
+
+    def pontos(self):
+        """Tabela normalizada de pontos (nome_praia, status_sigla), antes da expansão por dia."""
+        if self._pontos is None:
+            numero_boletim, periodo = self.metadados()
+            if not numero_boletim or not periodo:
+                self._pontos = pd.DataFrame()
+                return self._pontos
+            try:
+                if self.motor == "pdfplumber":
+                    tabelas_brutas = self._tabelas_pdfplumber()
+                else:
+                    tabelas_brutas = self._tabelas_camelot()
+            except Exception as e:
+                self.erros["extracao"] = e
+                tabelas_brutas = []
+            self._pontos = _normalizar_tabelas(tabelas_brutas)
+        return self._pontos
+
+    def processar(self, link_boletim="", expandir=True):
+        numero_boletim, periodo = self.metadados()
+        return montar_tabela_final(self.pontos(), numero_boletim, periodo, link_boletim, expandir)
+
+def extrair_metadados_pdf(caminho_pdf):
+    with DocumentoBoletim(caminho_pdf) as doc:
+        return doc.metadados()
+
+def extrair_pontos_pdf(caminho_pdf, motor=MOTOR_PADRAO):
+    """Retorna (numero_boletim, periodo, df_pontos) com a tabela normalizada de pontos, antes da expansão por dia."""
+    with DocumentoBoletim(caminho_pdf, motor) as doc:
+        numero_boletim, periodo = doc.metadados()
+        return numero_boletim, periodo, doc.pontos()
+
+def montar_tabela_final(df_pontos, numero_boletim, periodo, link_boletim="", expandir=True):
+    """Enriquece a tabela de pontos (zona, status, coordenadas) e a expande para uma linha por dia do período.
+
+    Com `expandir=False` devolve uma linha por ponto, com `data_inicio`/`data_fim` no lugar de `data_coleta`.
+    """
+    if df_pontos.empty: return pd.DataFrame()
+    df = df_pontos.copy()
+
+    df["id_ponto"] = df["nome_praia"].str[:3].str.strip().str.upper()
+    # Zona e coordenadas vêm do cadastro de pontos numa única junção; as palavras-chave do nome só
+    # classificam a zona de pontos que ainda não estão no cadastro
+    df = df.join(REGISTRO_PONTOS[["zona", "latitude", "longitude"]], on="id_ponto")
+    sem_cadastro = df["zona"].isna()
+    if sem_cadastro.any():
+        df.loc[sem_cadastro, "zona"] = df.loc[sem_cadastro, "nome_praia"].map(classify_zona)
     df["status"] = df["status_sigla"].map({"P": "Própria para banho", "I": "Imprópria para banho"})
-    
-    coords_series = df["id_ponto"].map(COORDENADAS_POR_CODIGO)
-    coords_df = coords_series.str.split(",", expand=True)
-    df["latitude"] = pd.to_numeric(coords_df[0], errors='coerce')
-    df["longitude"] = pd.to_numeric(coords_df[1], errors='coerce')
 
     df["numero_boletim"] = numero_boletim
     df["link_boletim"] = link_boletim
@@ -126,20 +318,23 @@ def processar_pdf_completo(caminho_pdf, link_boletim=""):
     # Adicionando a nova coluna com o período de validade
     df["periodo_validade"] = periodo
 
-    dias_periodo = expand_periodo(periodo)
-    if not dias_periodo: return pd.DataFrame()
-
-    df_final = pd.DataFrame()
-    for dia in dias_periodo:
-        df_dia = df.copy()
-        df_dia["data_coleta"] = dia
-        df_final = pd.concat([df_final, df_dia], ignore_index=True)
-
-    # Adicionando a nova coluna à lista final de colunas
-    colunas_finais = [
-        "id_ponto", "data_coleta", "nome_praia", "zona", "status",
-        "latitude", "longitude", "numero_boletim", "link_boletim", 
-        "data_extracao", "periodo_validade"
-    ]
-    df_final = df_final.reindex(columns=colunas_finais)
-    return df_final
\ No newline at end of file
+    intervalo = intervalo_periodo(periodo)
+    if intervalo is None: return pd.DataFrame()
+
+    if not expandir:
+        df["data_inicio"], df["data_fim"] = intervalo
+        return df.reindex(columns=COLUNAS_POR_PERIODO)
+
+    # Repete o bloco de pontos uma vez por dia (dia a dia, na ordem dos pontos) com uma única alocação
+    dias_periodo = pd.date_range(*intervalo, freq="D")
+    n_pontos = len(df)
+    df = df.reindex(columns=COLUNAS_FINAIS)
+    df_final = df.take(np.tile(np.arange(n_pontos), len(dias_periodo))).reset_index(drop=True)
+    df_final["data_coleta"] = np.repeat(dias_periodo.values, n_pontos)
+    return df_final
+
+def processar_pdf_completo(caminho_pdf, link_boletim="", motor=MOTOR_PADRAO, expandir=True):
+    """Processa o boletim inteiro. `motor="pdfplumber"` dispensa o camelot e usa as coordenadas das palavras;
+    `expandir=False` emite uma linha por ponto com o início e o fim do período em vez de uma por dia."""
+    with DocumentoBoletim(caminho_pdf, motor) as doc:
+        return doc.processar(link_boletim, expandir)
\ No newline at end of file
@@ -0,0 +1,69 @@
+# destinos.py - Interface comum dos lugares onde os boletins processados são gravados
+#
+# Implementações: DestinoPlanilha (escritor_planilha.py), DestinoSQLite (banco_sqlite.py) e
+# DestinoParquet (historico_parquet.py). Os scrapers e o importador só falam com esta interface.
+
+class Destino:
+    """Um lugar onde as linhas dos boletins são gravadas.
+
+    `boletins_existentes()` lê quais boletins o destino já tem; `adicionar(df)` enfileira as linhas de um ou mais
+    boletins e `descarregar()` grava tudo o que está na fila, devolvendo quantas linhas foram gravadas. Gravar de
+    novo um boletim que o destino já tem nunca duplica linhas.
+    """
+
+    nome = "destino"
+
+    def boletins_existentes(self):
+        raise NotImplementedError
+
+    def adicionar(self, df):
+        raise NotImplementedError
+
+    def descarregar(self):
+        raise NotImplementedError
+
+    def metricas(self):
+        """Contadores próprios do destino, para o resumo da execução."""
+        return {}
+
+    def fechar(self):
+        pass
+
+class Destinos:
+    """Vários destinos usados como um só.
+
+    Um boletim só conta como existente quando todos os destinos já o têm; assim um destino novo (ou que ficou
+    para trás) recebe os boletins que faltam, e os outros ignoram o que já possuem. A gravação é feita destino a
+    destino pelo chamador (iterando sobre este objeto), para que a falha de um não impeça os demais.
+    """
+
+    def __init__(self, destinos):
+        if not destinos:
+            raise ValueError("Nenhum destino configurado para gravar os boletins.")
+        self.destinos = list(destinos)
+        self.existentes_por_destino = {}
+
+    def __iter__(self):
+        return iter(self.destinos)
+
+    @property
+    def nomes(self):
+        return [destino.nome for destino in self.destinos]
+
+    def boletins_existentes(self):
+        self.existentes_por_destino = {destino.nome: set(destino.boletins_existentes()) for destino in self.destinos}
+        return set.intersection(*self.existentes_por_destino.values())
+
+    def adicionar(self, df):
+        for destino in self.destinos:
+            destino.adicionar(df)
+
+    def metricas(self):
+        metricas = {}
+        for destino in self.destinos:
+            metricas.update(destino.metricas())
+        return metricas
+
+    def fechar(self):
+        for destino in self.destinos:
+            destino.fechar()
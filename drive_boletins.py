@@ -0,0 +1,144 @@
+# drive_boletins.py - Download concorrente dos boletins do Google Drive, direto para a memória
+
+import io
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from googleapiclient.http import MediaIoBaseDownload
+from arquivos_json import PASTA_ESTADO, gravar_json
+from core_parser import numero_pelo_nome
+
+# --- Configurações ---
+DOWNLOADS_PARALELOS = 4                 # downloads simultâneos; também limita quantos PDFs ficam na memória
+TAMANHO_BLOCO_DOWNLOAD = 4 * 1024 * 1024
+# Arquivos do Drive já lidos sem erro: id -> numero_boletim (None se não é um boletim ou não tem pontos)
+ARQUIVO_IDS_DRIVE = os.path.join(PASTA_ESTADO, "ids_drive.json")
+# Maior modifiedTime já processado por pasta, para que as próximas listagens tragam só o que mudou
+ARQUIVO_MARCA_LISTAGEM = os.path.join(PASTA_ESTADO, "listagem_drive.json")
+ITENS_POR_PAGINA = 1000                 # máximo aceito pela API do Drive
+CAMPOS_LISTAGEM = "nextPageToken, files(id, name, modifiedTime)"
+
+# --- Listagem ---
+def listar_pdfs_drive(drive_service, consulta, modificados_desde=None, itens_por_pagina=ITENS_POR_PAGINA):
+    """Todos os arquivos que atendem `consulta`, seguindo o nextPageToken até a última página.
+
+    Com `modificados_desde` (um modifiedTime RFC 3339 do próprio Drive) só são pedidos os arquivos
+    alterados a partir dele. Devolve a lista de arquivos ({id, name, modifiedTime}) e o número de páginas lidas.
+    """
+    if modificados_desde:
+        consulta = f"{consulta} and modifiedTime >= '{modificados_desde}'"
+    arquivos, token, paginas = [], None, 0
+    while True:
+        resposta = drive_service.files().list(
+            q=consulta,
+            pageSize=itens_por_pagina,
+            pageToken=token,
+            fields=CAMPOS_LISTAGEM,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        ).execute()
+        paginas += 1
+        arquivos.extend(resposta.get("files", []))
+        token = resposta.get("nextPageToken")
+        if not token:
+            return arquivos, paginas
+
+def carregar_marca_listagem(id_pasta, caminho=ARQUIVO_MARCA_LISTAGEM):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f).get(id_pasta)
+    except (OSError, ValueError):
+        return None
+
+def salvar_marca_listagem(id_pasta, arquivos, caminho=ARQUIVO_MARCA_LISTAGEM):
+    """Avança a marca da pasta até o maior modifiedTime de `arquivos` (a marca nunca retrocede)."""
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            marcas = json.load(f)
+    except (OSError, ValueError):
+        marcas = {}
+    # Datas RFC 3339 em UTC, com o mesmo formato, se comparam como texto
+    datas = [a["modifiedTime"] for a in arquivos if a.get("modifiedTime")] + [marcas.get(id_pasta) or ""]
+    marcas[id_pasta] = max(datas) or None
+    gravar_json(caminho, marcas)
+    return marcas[id_pasta]
+
+# --- Ids já vistos ---
+def carregar_ids_vistos(caminho=ARQUIVO_IDS_DRIVE):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def salvar_ids_vistos(ids_vistos, caminho=ARQUIVO_IDS_DRIVE):
+    gravar_json(caminho, ids_vistos)
+
+def filtrar_novos(arquivos, boletins_existentes, ids_vistos=None):
+    """Descarta, sem baixar nada, os arquivos cujo boletim já está na planilha.
+
+    Um arquivo é pulado se o número no nome já é conhecido ou se o id já foi aberto antes e resultou num
+    boletim conhecido (ou em nenhum boletim). Os demais são devolvidos para download.
+    """
+    ids_vistos = ids_vistos or {}
+    novos = []
+    for arquivo in arquivos:
+        if arquivo["id"] in ids_vistos:
+            numero_boletim = ids_vistos[arquivo["id"]]
+            if numero_boletim is None or numero_boletim in boletins_existentes:
+                continue
+        elif numero_pelo_nome(arquivo.get("name")) in boletins_existentes:
+            continue
+        novos.append(arquivo)
+    return novos
+
+# --- Download ---
+def baixar_pdf(drive_service, file_id, tamanho_bloco=TAMANHO_BLOCO_DOWNLOAD):
+    """Conteúdo do arquivo do Drive em bytes, sem passar pelo disco."""
+    buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(buffer, drive_service.files().get_media(fileId=file_id), chunksize=tamanho_bloco)
+    done = False
+    while done is False:
+        _, done = downloader.next_chunk(num_retries=3)
+    return buffer.getvalue()
+
+def baixar_em_paralelo(arquivos, criar_servico, max_paralelos=DOWNLOADS_PARALELOS):
+    """Gera (arquivo, conteudo, erro, segundos) à medida que cada download termina.
+
+    O cliente da API do Google não é seguro entre threads, então cada thread cria o seu com `criar_servico()`.
+    No máximo `max_paralelos` arquivos ficam em andamento ou à espera do consumidor, o que limita a memória
+    usada e deixa o processamento de um PDF acontecer enquanto os próximos ainda estão sendo baixados.
+    """
+    local = threading.local()
+
+    def _baixar(arquivo):
+        if not hasattr(local, "servico"):
+            local.servico = criar_servico()
+        inicio = time.perf_counter()
+        try:
+            return baixar_pdf(local.servico, arquivo["id"]), time.perf_counter() - inicio
+        except Exception as e:
+            e.segundos = time.perf_counter() - inicio
+            raise
+
+    pendentes = iter(arquivos)
+    with ThreadPoolExecutor(max_workers=max_paralelos) as executor:
+        em_andamento = {}
+        for arquivo in pendentes:
+            em_andamento[executor.submit(_baixar, arquivo)] = arquivo
+            if len(em_andamento) >= max_paralelos:
+                break
+        while em_andamento:
+            concluidos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                arquivo = em_andamento.pop(futuro)
+                try:
+                    conteudo, segundos = futuro.result()
+                    yield arquivo, conteudo, None, segundos
+                except Exception as e:
+                    yield arquivo, None, e, getattr(e, "segundos", 0.0)
+                proximo = next(pendentes, None)
+                if proximo is not None:
+                    em_andamento[executor.submit(_baixar, proximo)] = proximo
@@ -0,0 +1,150 @@
+# escritor_planilha.py - Escrita em lote, com novas tentativas, na planilha do Google Sheets
+
+import time
+import random
+import requests
+import gspread
+from core_parser import COLUNAS_FINAIS
+from destinos import Destino
+
+# --- Configurações ---
+LINHAS_POR_LOTE = 5000        # limite de linhas por chamada de append_rows
+MAX_TENTATIVAS = 6
+ESPERA_INICIAL = 2.0          # segundos; dobra a cada nova tentativa
+ESPERA_MAXIMA = 64.0
+COLUNA_BOLETIM = COLUNAS_FINAIS.index("numero_boletim") + 1  # coluna (1-based) com o número do boletim
+
+def _erro_temporario(e):
+    # Cota excedida (429), erros 5xx do Google e falhas de rede valem uma nova tentativa; o resto é definitivo.
+    if isinstance(e, gspread.exceptions.APIError):
+        return e.code == 429 or e.code >= 500
+    return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, ConnectionError, TimeoutError))
+
+class EscritorPlanilha:
+    """Acumula as linhas de vários boletins e as envia à planilha no fim, em poucas chamadas.
+
+    Cada chamada de append_rows leva apenas boletins inteiros. Se uma chamada falha, o escritor espera
+    (backoff exponencial) e, antes de reenviar, confere na planilha quais boletins do lote já chegaram.
+    Assim uma resposta perdida de uma escrita que na verdade foi aplicada nunca duplica linhas.
+    """
+
+    def __init__(self, sheet, boletins_existentes=None, linhas_por_lote=LINHAS_POR_LOTE,
+                 max_tentativas=MAX_TENTATIVAS, espera_inicial=ESPERA_INICIAL, dormir=time.sleep, indice=None):
+        self.sheet = sheet
+        self.indice = indice  # IndiceBoletins opcional, atualizado a cada lote gravado
+        self.boletins_existentes = set(boletins_existentes or ())
+        self.linhas_por_lote = linhas_por_lote
+        self.max_tentativas = max_tentativas
+        self.espera_inicial = espera_inicial
+        self.dormir = dormir
+        self._pendentes = {}  # numero_boletim -> linhas, na ordem em que foram adicionados
+        self.chamadas_append = 0   # para as métricas da execução
+        self.novas_tentativas = 0
+
+    @property
+    def linhas_pendentes(self):
+        return sum(len(linhas) for linhas in self._pendentes.values())
+
+    def adicionar(self, df):
+        """Enfileira as linhas de `df`, agrupadas por boletim. Boletins já na planilha ou na fila são ignorados."""
+        if df.empty: return 0
+        adicionadas = 0
+        dados = df.fillna('').astype(str)
+        for numero_boletim, grupo in dados.groupby("numero_boletim", sort=False):
+            if numero_boletim in self.boletins_existentes or numero_boletim in self._pendentes:
+                continue
+            self._pendentes[numero_boletim] = grupo.values.tolist()
+            adicionadas += len(grupo)
+        return adicionadas
+
+    def _lotes(self):
+        # Agrupa boletins inteiros em lotes de até `linhas_por_lote` linhas (um boletim maior vira um lote sozinho)
+        lote, linhas_no_lote = [], 0
+        for numero_boletim, linhas in self._pendentes.items():
+            if lote and linhas_no_lote + len(linhas) > self.linhas_por_lote:
+                yield lote
+                lote, linhas_no_lote = [], 0
+            lote.append(numero_boletim)
+            linhas_no_lote += len(linhas)
+        if lote:
+            yield lote
+
+    def _boletins_na_planilha(self):
+        return set(self.sheet.col_values(COLUNA_BOLETIM)[1:])
+
+    def _enviar_lote(self, boletins):
+        conferir = False
+        for tentativa in range(self.max_tentativas):
+            try:
+                if conferir:
+                    # Confere o que já chegou antes de reenviar: a tentativa anterior pode ter sido aplicada. Se a
+                    # própria conferência falha, ela é repetida com a mesma espera; reenviar às cegas duplicaria
+                    # linhas, e esgotadas as tentativas o lote fica para a próxima execução.
+                    ja_gravados = self._boletins_na_planilha()
+                    boletins = [b for b in boletins if b not in ja_gravados]
+                    self.boletins_existentes.update(ja_gravados)
+                    if not boletins:
+                        return
+                linhas = [linha for b in boletins for linha in self._pendentes[b]]
+                self.chamadas_append += 1
+                self.sheet.append_rows(linhas, value_input_option="USER_ENTERED")
+                return
+            except Exception as e:
+                if not _erro_temporario(e) or tentativa == self.max_tentativas - 1:
+                    raise
+                espera = min(self.espera_inicial * 2 ** tentativa, ESPERA_MAXIMA)
+                espera += random.uniform(0, self.espera_inicial)
+                print(f"  -> Falha temporária ao acessar a planilha ({e}). Nova tentativa em {espera:.1f}s...")
+                self.novas_tentativas += 1
+                conferir = True
+                self.dormir(espera)
+
+    def _registrar_no_indice(self, boletins):
+        if self.indice is None: return
+        try:
+            self.indice.registrar({b: len(self._pendentes[b]) for b in boletins})
+        except Exception as e:
+            # Os dados já estão na planilha; na próxima execução o índice é detectado como desatualizado e refeito.
+            print(f"  -> Aviso: não foi possível atualizar o índice de boletins ({e}).")
+
+    def descarregar(self):
+        """Envia tudo o que está pendente. Devolve o número de linhas efetivamente enviadas nesta chamada."""
+        enviadas = 0
+        for boletins in list(self._lotes()):
+            self._enviar_lote(boletins)
+            self._registrar_no_indice(boletins)
+            for numero_boletim in boletins:
+                if numero_boletim not in self.boletins_existentes:
+                    enviadas += len(self._pendentes[numero_boletim])
+                    self.boletins_existentes.add(numero_boletim)
+                del self._pendentes[numero_boletim]
+        return enviadas
+
+class DestinoPlanilha(Destino):
+    """A aba de dados do Google Sheets como destino, escrita pelo EscritorPlanilha e conferida pelo IndiceBoletins."""
+
+    nome = "planilha"
+
+    def __init__(self, sheet, indice):
+        self.indice = indice
+        self.escritor = EscritorPlanilha(sheet, indice=indice)
+
+    def boletins_existentes(self):
+        # Lê o índice compacto (uma linha por boletim); se ele faltar ou estiver desatualizado, é refeito a partir da aba de dados
+        try:
+            existentes = self.indice.carregar()
+        except gspread.exceptions.APIError as e:
+            print(f"Erro de API ao buscar o índice de boletins: {e}.")
+            existentes = set()
+        self.escritor.boletins_existentes.update(existentes)
+        return existentes
+
+    def adicionar(self, df):
+        return self.escritor.adicionar(df)
+
+    def descarregar(self):
+        return self.escritor.descarregar()
+
+    def metricas(self):
+        return {"chamadas_append_rows": self.escritor.chamadas_append,
+                "novas_tentativas_planilha": self.escritor.novas_tentativas}
@@ -0,0 +1,240 @@
+# historico_parquet.py - Base histórica em Parquet (colunar), particionada por ano e boletim
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from core_parser import COLUNAS_FINAIS, COLUNAS_POR_PERIODO
+from registro_pontos import REGISTRO_PONTOS
+from destinos import Destino
+
+# --- Configurações ---
+PASTA_HISTORICO_PARQUET = "historico_parquet"
+ARQUIVO_CSV_PLANILHA = "historico_completo.csv"
+# A tabela de uma linha por período (expandir=False) tem outras colunas e fica em dataset e CSV próprios
+PASTA_HISTORICO_PARQUET_PERIODO = "historico_parquet_periodo"
+ARQUIVO_CSV_PLANILHA_PERIODO = "historico_periodo.csv"
+COLUNAS_PARTICAO = ["ano", "numero_boletim"]
+
+_TEXTO_REPETIDO = pa.dictionary(pa.int32(), pa.string())
+
+# Textos que se repetem em todas as linhas viram colunas de dicionário; datas e coordenadas ficam tipadas.
+_CAMPOS = {
+    "id_ponto": _TEXTO_REPETIDO,
+    "data_coleta": pa.date32(),
+    "data_inicio": pa.date32(),
+    "data_fim": pa.date32(),
+    "nome_praia": _TEXTO_REPETIDO,
+    "zona": _TEXTO_REPETIDO,
+    "status": _TEXTO_REPETIDO,
+    "latitude": pa.float64(),
+    "longitude": pa.float64(),
+    "link_boletim": _TEXTO_REPETIDO,
+    "data_extracao": pa.timestamp("s"),
+    "periodo_validade": _TEXTO_REPETIDO,
+}
+
+def _colunas_do_formato(df):
+    # Aceita tanto a tabela diária quanto a de uma linha por período (processar_pdf_completo(expandir=False))
+    return COLUNAS_FINAIS if "data_coleta" in df.columns else COLUNAS_POR_PERIODO
+
+def _esquema(colunas):
+    campos = [pa.field(c, _CAMPOS[c]) for c in colunas if c != "numero_boletim"]
+    return pa.schema(campos + [pa.field("ano", pa.int16()), pa.field("numero_boletim", pa.string())])
+
+def _ano_do_boletim(df):
+    # O ano do boletim é o do último dia de validade (ex.: 30/12/2024 a 05/01/2025 pertence a 2025)
+    coluna_data = "data_coleta" if "data_coleta" in df.columns else "data_fim"
+    datas = pd.to_datetime(df[coluna_data])
+    return datas.groupby(df["numero_boletim"]).transform("max").dt.year
+
+def _conferir_formato(colunas, colunas_gravadas, destino):
+    # Misturar os dois formatos deixa as linhas de um deles sem datas na leitura (o esquema vem das partições)
+    if colunas_gravadas is not None and ("data_coleta" in colunas) != ("data_coleta" in colunas_gravadas):
+        formato = "diário" if "data_coleta" in colunas_gravadas else "por período"
+        raise ValueError(f"'{destino}' já tem linhas no formato {formato}; grave este formato em outro "
+                         f"dataset/CSV (ex.: {PASTA_HISTORICO_PARQUET_PERIODO} e {ARQUIVO_CSV_PLANILHA_PERIODO}).")
+
+# --- Escrita ---
+def gravar_boletins(df, pasta=PASTA_HISTORICO_PARQUET, conferir_formato=True):
+    """Grava/atualiza no dataset apenas as partições dos boletins presentes em `df`; as demais não são reescritas.
+
+    `conferir_formato=False` dispensa a comparação com o esquema gravado, que lê o dataset inteiro; serve para
+    quem já a fez no começo da gravação (ver DestinoParquet).
+    """
+    if df.empty: return 0
+    colunas = _colunas_do_formato(df)
+    if conferir_formato:
+        _conferir_formato(colunas, colunas_gravadas(pasta), pasta)
+    df = df.reindex(columns=colunas).copy()
+    for coluna in ("latitude", "longitude"):
+        df[coluna] = pd.to_numeric(df[coluna], errors="coerce")
+    df["data_extracao"] = pd.to_datetime(df["data_extracao"])
+    df["ano"] = _ano_do_boletim(df)
+
+    esquema = _esquema(colunas)
+    tabela = pa.Table.from_pandas(df, preserve_index=False).select(esquema.names).cast(esquema)
+    pq.write_to_dataset(
+        tabela,
+        root_path=pasta,
+        partition_cols=COLUNAS_PARTICAO,
+        basename_template="parte-{i}.parquet",
+        existing_data_behavior="delete_matching",  # regravar um boletim substitui só a partição dele
+    )
+    return len(df)
+
+# --- Leitura ---
+def _dataset(pasta):
+    return ds.dataset(pasta, format="parquet", partitioning="hive")
+
+def colunas_gravadas(pasta=PASTA_HISTORICO_PARQUET):
+    """Colunas do dataset em `pasta`, ou None se ele ainda não tem nenhum boletim."""
+    if not boletins_gravados(pasta): return None
+    return _dataset(pasta).schema.names
+
+def boletins_gravados(pasta=PASTA_HISTORICO_PARQUET):
+    """Números dos boletins já presentes no dataset, lidos só dos nomes das partições."""
+    if not os.path.isdir(pasta): return set()
+    numeros = set()
+    for pasta_ano in os.listdir(pasta):
+        caminho_ano = os.path.join(pasta, pasta_ano)
+        if not pasta_ano.startswith("ano=") or not os.path.isdir(caminho_ano): continue
+        for pasta_boletim in os.listdir(caminho_ano):
+            if pasta_boletim.startswith("numero_boletim="):
+                numeros.add(pasta_boletim.split("=", 1)[1])
+    return numeros
+
+def carregar_historico(pasta=PASTA_HISTORICO_PARQUET, colunas=None, filtro=None):
+    """Carrega o histórico como DataFrame. `filtro` é uma expressão de pyarrow.dataset, ex.:
+    `ds.field("ano") == 2025`, e só as partições/colunas necessárias são lidas do disco."""
+    dataset = _dataset(pasta)
+    tabela = dataset.to_table(columns=colunas, filter=filtro)
+    df = tabela.to_pandas(date_as_object=False)
+    # Ordena por boletim para que o resultado seja estável entre execuções
+    if "numero_boletim" in df.columns:
+        df["numero_boletim"] = df["numero_boletim"].astype(str)
+        df = df.sort_values("numero_boletim", kind="stable").reset_index(drop=True)
+    if colunas is None:
+        df = df.reindex(columns=_colunas_do_formato(df))
+    return df
+
+# --- Exportação CSV (Google Sheets) ---
+def salvar_csv_planilha(df, arquivo=ARQUIVO_CSV_PLANILHA, acrescentar=False, conferir_formato=True):
+    """Grava no formato do CSV da planilha. Com `acrescentar=True` adiciona as linhas ao fim de um arquivo existente."""
+    df = df.copy()
+    for coluna in ("data_coleta", "data_inicio", "data_fim"):
+        if coluna in df.columns:
+            df[coluna] = pd.to_datetime(df[coluna]).dt.strftime("%Y-%m-%d")
+    if "data_extracao" in df.columns:
+        df["data_extracao"] = pd.to_datetime(df["data_extracao"]).dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    # Forçamos a conversão das colunas para texto com 15 casas decimais.
+    # Isso impede que o pandas use a formatação de localidade do sistema (com separador de milhar).
+    df['latitude'] = df['latitude'].apply(lambda x: f'{x:.15f}' if pd.notnull(x) else '')
+    df['longitude'] = df['longitude'].apply(lambda x: f'{x:.15f}' if pd.notnull(x) else '')
+
+    # Salvamos o resultado no CSV. O parâmetro 'decimal' aqui se torna redundante para as coordenadas, mas o mantemos por segurança.
+    if acrescentar and os.path.exists(arquivo) and os.path.getsize(arquivo) > 0:
+        if conferir_formato:
+            _conferir_formato(df.columns, pd.read_csv(arquivo, encoding="utf-8-sig", nrows=0).columns, arquivo)
+        df.to_csv(arquivo, mode='a', header=False, index=False, encoding='utf-8', decimal='.')
+    else:
+        df.to_csv(arquivo, index=False, encoding='utf-8-sig', decimal='.')
+
+def exportar_csv(pasta=PASTA_HISTORICO_PARQUET, arquivo=ARQUIVO_CSV_PLANILHA):
+    df = carregar_historico(pasta)
+    salvar_csv_planilha(df, arquivo)
+    return len(df)
+
+def importar_csv(arquivo=ARQUIVO_CSV_PLANILHA, pasta=PASTA_HISTORICO_PARQUET):
+    """Converte um CSV no formato do importador/planilha para o dataset Parquet."""
+    # round_trip evita que o parser rápido do pandas altere a última casa das coordenadas
+    tipos = {coluna: str for coluna in pd.read_csv(arquivo, encoding="utf-8-sig", nrows=0).columns}
+    tipos.update(latitude=float, longitude=float)
+    df = pd.read_csv(arquivo, encoding="utf-8-sig", dtype=tipos, keep_default_na=False,
+                     na_values={"latitude": [""], "longitude": [""]}, float_precision="round_trip")
+    return gravar_boletins(df, pasta)
+
+# --- Correções ---
+def corrigir_coordenadas(pasta=PASTA_HISTORICO_PARQUET, arquivo_csv=ARQUIVO_CSV_PLANILHA, registro=REGISTRO_PONTOS):
+    """Aplica ao dataset as coordenadas atuais do cadastro de pontos e regenera o CSV.
+
+    Boletins já importados não passam de novo pelo parser (o manifesto os pula), então uma correção em
+    coordenadas.py só chega a eles por aqui. Só as partições com alguma coordenada diferente são regravadas;
+    pontos fora do cadastro mantêm as coordenadas que têm. Devolve os boletins corrigidos.
+    """
+    if not boletins_gravados(pasta): return []
+    df = carregar_historico(pasta)
+    novas = df[["id_ponto"]].astype(str).join(registro[["latitude", "longitude"]], on="id_ponto")
+    cadastrado = df["id_ponto"].astype(str).isin(registro.index).to_numpy()
+    mudou = np.zeros(len(df), dtype=bool)
+    for coluna in ("latitude", "longitude"):
+        atual, nova = df[coluna].to_numpy(dtype="float64"), novas[coluna].to_numpy(dtype="float64")
+        mudou |= cadastrado & ~((atual == nova) | (np.isnan(atual) & np.isnan(nova)))
+        df.loc[cadastrado, coluna] = nova[cadastrado]
+    corrigidos = sorted(df.loc[mudou, "numero_boletim"].unique())
+    if corrigidos:
+        gravar_boletins(df[df["numero_boletim"].isin(corrigidos)], pasta)
+        if arquivo_csv:
+            exportar_csv(pasta, arquivo_csv)
+    return corrigidos
+
+# --- Destino (importador) ---
+class DestinoParquet(Destino):
+    """O dataset Parquet como destino, com o CSV da planilha gerado junto (`acrescentar_csv=False` o reescreve)."""
+
+    nome = "parquet"
+
+    def __init__(self, pasta=PASTA_HISTORICO_PARQUET, arquivo_csv=ARQUIVO_CSV_PLANILHA, acrescentar_csv=True):
+        self.pasta = pasta
+        self.arquivo_csv = arquivo_csv
+        self.acrescentar_csv = acrescentar_csv
+        self.existentes = set()
+        self._pendentes = []
+        self._formato_conferido = None  # colunas já comparadas com o dataset e o CSV nesta execução
+
+    def boletins_existentes(self):
+        self.existentes = boletins_gravados(self.pasta)
+        return self.existentes
+
+    def adicionar(self, df):
+        # Boletins já no dataset ficam de fora para não repetir linhas no CSV, que só recebe acréscimos
+        if df.empty: return 0
+        df = df[~df["numero_boletim"].astype(str).isin(self.existentes)]
+        if not df.empty:
+            self._pendentes.append(df)
+        return len(df)
+
+    def descarregar(self):
+        if not self._pendentes: return 0
+        df = pd.concat(self._pendentes, ignore_index=True)
+        # O formato gravado é conferido uma vez por execução, não a cada boletim: ler o esquema percorre o dataset
+        colunas = _colunas_do_formato(df)
+        conferir = colunas != self._formato_conferido
+        gravar_boletins(df, self.pasta, conferir_formato=conferir)
+        if self.arquivo_csv:
+            salvar_csv_planilha(df, self.arquivo_csv, acrescentar=self.acrescentar_csv, conferir_formato=conferir)
+        self._formato_conferido = colunas
+        self.existentes.update(df["numero_boletim"].astype(str))
+        self._pendentes = []
+        return len(df)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte o histórico entre o dataset Parquet e o CSV da planilha.")
+    parser.add_argument("--pasta", default=PASTA_HISTORICO_PARQUET, help="Pasta do dataset Parquet.")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--de-csv", metavar="CSV", help="Importa um CSV existente para o dataset Parquet.")
+    grupo.add_argument("--para-csv", metavar="CSV", help="Exporta o dataset Parquet para um CSV da planilha.")
+    grupo.add_argument("--corrigir-coordenadas", metavar="CSV", nargs="?", const=ARQUIVO_CSV_PLANILHA,
+                       help="Aplica as coordenadas de coordenadas.py ao dataset e regenera o CSV (padrão: %(const)s).")
+    args = parser.parse_args()
+    if args.de_csv:
+        print(f"{importar_csv(args.de_csv, args.pasta)} linhas gravadas em '{args.pasta}'.")
+    elif args.corrigir_coordenadas:
+        corrigidos = corrigir_coordenadas(args.pasta, args.corrigir_coordenadas)
+        print(f"{len(corrigidos)} boletim(ns) com coordenadas corrigidas em '{args.pasta}' e '{args.corrigir_coordenadas}'.")
+    else:
+        print(f"{exportar_csv(args.pasta, args.para_csv)} linhas exportadas para '{args.para_csv}'.")
@@ -1,55 +1,229 @@
 # importador_local.py (VERSÃO FINAL E DEFINITIVA)
 
 import os
+import json
+import time
+import argparse
 import pandas as pd
-from core_parser import processar_pdf_completo
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core_parser import processar_pdf_completo, MOTORES_TABELA, MOTOR_PADRAO
+from cache_boletins import processar_pdf_com_cache, hash_arquivo
+from arquivos_json import gravar_json
+from banco_sqlite import DestinoSQLite
+from destinos import Destinos
+from historico_parquet import (ARQUIVO_CSV_PLANILHA_PERIODO, PASTA_HISTORICO_PARQUET, PASTA_HISTORICO_PARQUET_PERIODO,
+                               DestinoParquet)
 
 # --- CONFIGURAÇÃO ---
 # Coloque aqui o caminho para a pasta onde você extraiu todos os PDFs
-PASTA_DOS_PDFS = r"C:\Users\ayala\Desktop\projeto-balneabilidade\pdfs_historicos" 
+PASTA_DOS_PDFS = r"C:\Users\ayala\Desktop\projeto-balneabilidade\pdfs_historicos"
 ARQUIVO_SAIDA_CSV = "historico_completo.csv"
+PASTA_SAIDA_PARQUET = PASTA_HISTORICO_PARQUET
+# Saídas do formato de uma linha por período (--por-periodo), que não pode ir para o mesmo dataset/CSV
+ARQUIVO_SAIDA_CSV_PERIODO = ARQUIVO_CSV_PLANILHA_PERIODO
+PASTA_SAIDA_PARQUET_PERIODO = PASTA_HISTORICO_PARQUET_PERIODO
+# PDFs já importados (hash do arquivo -> boletim); arquivos com "_" no início são ignorados pelo dataset
+NOME_MANIFESTO = "_manifesto.json"
+ARQUIVO_MANIFESTO = os.path.join(PASTA_SAIDA_PARQUET, NOME_MANIFESTO)
+# Número de processos usados no modo em lote (1 = processamento serial)
+NUM_PROCESSOS = os.cpu_count() or 1
+# Reaproveita as tabelas já extraídas de PDFs que não mudaram (ver cache_boletins.py)
+USAR_CACHE = True
+# False grava uma linha por ponto e boletim (data_inicio/data_fim) em vez de uma linha por dia
+EXPANDIR_DIAS = True
+# Banco SQLite local gravado junto com o dataset Parquet e o CSV (None = desligado; ver banco_sqlite.py)
+ARQUIVO_SQLITE = None
 
-def main():
-    print(f"Iniciando importador local da pasta: {PASTA_DOS_PDFS}")
-    
-    lista_dfs = []
-    
-    arquivos_pdf = [f for f in os.listdir(PASTA_DOS_PDFS) if f.lower().endswith('.pdf')]
-    total_arquivos = len(arquivos_pdf)
-    print(f"Encontrados {total_arquivos} arquivos PDF para processar.")
-
-    for i, nome_arquivo in enumerate(arquivos_pdf):
-        caminho_completo = os.path.join(PASTA_DOS_PDFS, nome_arquivo)
-        print(f"Processando arquivo {i+1}/{total_arquivos}: {nome_arquivo}...")
-        
-        df_pdf = processar_pdf_completo(caminho_completo)
-        
-        if not df_pdf.empty:
-            lista_dfs.append(df_pdf)
-            print(f"  -> Sucesso! {len(df_pdf)} linhas extraídas.")
+def saidas(expandir=EXPANDIR_DIAS):
+    """(pasta do dataset Parquet, arquivo CSV) do formato escolhido."""
+    if expandir:
+        return PASTA_SAIDA_PARQUET, ARQUIVO_SAIDA_CSV
+    return PASTA_SAIDA_PARQUET_PERIODO, ARQUIVO_SAIDA_CSV_PERIODO
+
+def abrir_destinos(arquivo_sqlite=ARQUIVO_SQLITE, acrescentar_csv=True, expandir=EXPANDIR_DIAS):
+    destinos = [DestinoParquet(*saidas(expandir), acrescentar_csv)]
+    if arquivo_sqlite:
+        destinos.append(DestinoSQLite(arquivo_sqlite))
+    return Destinos(destinos)
+
+# --- Processamento em Lote ---
+def _processar_arquivo(caminho_completo, usar_cache=USAR_CACHE, motor=MOTOR_PADRAO, expandir=EXPANDIR_DIAS):
+    # Executado dentro de cada processo do pool. Qualquer erro fica isolado no próprio arquivo.
+    inicio = time.perf_counter()
+    try:
+        if usar_cache:
+            df_pdf = processar_pdf_com_cache(caminho_completo, motor=motor, expandir=expandir)
         else:
-            print(f"  -> Aviso: Nenhum dado extraído de {nome_arquivo}.")
+            df_pdf = processar_pdf_completo(caminho_completo, motor=motor, expandir=expandir)
+        erro = None
+    except Exception as e:
+        df_pdf = pd.DataFrame()
+        erro = str(e)
+    return df_pdf, time.perf_counter() - inicio, erro
+
+def _relatar(concluidos, total, caminho, df_pdf, segundos, erro):
+    nome_arquivo = os.path.basename(caminho)
+    print(f"[{concluidos}/{total}] {nome_arquivo} ({segundos:.2f}s)")
+    if erro:
+        print(f"  -> Erro: {erro}")
+    elif df_pdf.empty:
+        print(f"  -> Aviso: Nenhum dado extraído de {nome_arquivo}.")
+    else:
+        print(f"  -> Sucesso! {len(df_pdf)} linhas extraídas.")
+
+def processar_em_fluxo(caminhos, num_processos=NUM_PROCESSOS, usar_cache=USAR_CACHE, motor=MOTOR_PADRAO,
+                       expandir=EXPANDIR_DIAS):
+    """Gera (indice, caminho, df, segundos, erro) à medida que cada PDF termina, sem acumular os resultados."""
+    total = len(caminhos)
+    if num_processos <= 1 or total <= 1:
+        for i, caminho in enumerate(caminhos):
+            df_pdf, segundos, erro = _processar_arquivo(caminho, usar_cache, motor, expandir)
+            _relatar(i + 1, total, caminho, df_pdf, segundos, erro)
+            yield i, caminho, df_pdf, segundos, erro
+        return
+
+    with ProcessPoolExecutor(max_workers=min(num_processos, total)) as executor:
+        futuros = {executor.submit(_processar_arquivo, caminho, usar_cache, motor, expandir): i for i, caminho in enumerate(caminhos)}
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            i = futuros.pop(futuro)
+            try:
+                df_pdf, segundos, erro = futuro.result()
+            except Exception as e:
+                # O processo do pool morreu (ex.: falta de memória); o restante do lote continua.
+                df_pdf, segundos, erro = pd.DataFrame(), 0.0, f"falha no processo de trabalho: {e}"
+            _relatar(concluidos, total, caminhos[i], df_pdf, segundos, erro)
+            yield i, caminhos[i], df_pdf, segundos, erro
+
+def processar_em_lote(caminhos, num_processos=NUM_PROCESSOS, usar_cache=USAR_CACHE, motor=MOTOR_PADRAO,
+                      expandir=EXPANDIR_DIAS):
+    """Processa os PDFs em paralelo e devolve [(caminho, df, segundos, erro), ...] na mesma ordem de `caminhos`."""
+    resultados = [None] * len(caminhos)
+    for i, caminho, df_pdf, segundos, erro in processar_em_fluxo(caminhos, num_processos, usar_cache, motor, expandir):
+        resultados[i] = (caminho, df_pdf, segundos, erro)
+    return resultados
+
+# --- Importação Incremental ---
+def carregar_manifesto(caminho=None):
+    """Manifesto dos PDFs já importados: {hash do arquivo: {"arquivo", "numero_boletim", "linhas"}}."""
+    caminho = caminho or ARQUIVO_MANIFESTO
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def salvar_manifesto(manifesto, caminho=None):
+    caminho = caminho or ARQUIVO_MANIFESTO
+    gravar_json(caminho, manifesto)
+
+def caminho_manifesto(expandir=EXPANDIR_DIAS):
+    # Cada formato tem o seu manifesto: um PDF importado por dia ainda precisa entrar no dataset por período
+    return os.path.join(saidas(expandir)[0], NOME_MANIFESTO)
+
+def _entrada_manifesto(caminho, df_pdf):
+    numero_boletim = str(df_pdf["numero_boletim"].iloc[0]) if not df_pdf.empty else None
+    return {"arquivo": os.path.basename(caminho), "numero_boletim": numero_boletim, "linhas": len(df_pdf)}
+
+def importar_incremental(pasta_pdfs=PASTA_DOS_PDFS, num_processos=NUM_PROCESSOS, usar_cache=USAR_CACHE,
+                         motor=MOTOR_PADRAO, expandir=EXPANDIR_DIAS, arquivo_sqlite=ARQUIVO_SQLITE):
+    """Processa só os PDFs ausentes do manifesto e grava as linhas de cada um nos destinos assim que ficam prontas.
+
+    Um banco SQLite novo não recebe os PDFs que já estão no manifesto; para preenchê-lo com o histórico,
+    use `python banco_sqlite.py --de-parquet historico_parquet`.
+    """
+    print(f"Iniciando importação incremental da pasta: {pasta_pdfs}")
+    pasta_parquet, arquivo_csv = saidas(expandir)
+    arquivo_manifesto = caminho_manifesto(expandir)
+    manifesto = carregar_manifesto(arquivo_manifesto)
+    destinos = abrir_destinos(arquivo_sqlite, expandir=expandir)
+    boletins_existentes = destinos.boletins_existentes()
+
+    arquivos_pdf = [f for f in os.listdir(pasta_pdfs) if f.lower().endswith('.pdf')]
+    hashes = {os.path.join(pasta_pdfs, f): hash_arquivo(os.path.join(pasta_pdfs, f)) for f in arquivos_pdf}
+    caminhos_novos = [caminho for caminho, hash_pdf in hashes.items() if hash_pdf not in manifesto]
+    print(f"Encontrados {len(arquivos_pdf)} arquivos PDF, {len(caminhos_novos)} ainda não importados.")
+    if not caminhos_novos:
+        print("Nada a fazer: o dataset já está atualizado.")
+        destinos.fechar()
+        return
+
+    # O manifesto vai para o disco uma vez, no fim (ou na interrupção). Um boletim gravado sem chegar ao
+    # manifesto é só processado de novo na próxima execução: os destinos já o têm e ignoram as linhas.
+    linhas_gravadas = 0
+    try:
+        for _, caminho, df_pdf, _, erro in processar_em_fluxo(caminhos_novos, num_processos, usar_cache, motor, expandir):
+            if erro:
+                continue  # fica fora do manifesto para ser tentado de novo na próxima execução
+            entrada = _entrada_manifesto(caminho, df_pdf)
+            numero_boletim = entrada["numero_boletim"]
+            if numero_boletim and numero_boletim in boletins_existentes:
+                print(f"  -> Boletim {numero_boletim} já está em {', '.join(destinos.nomes)}; linhas ignoradas.")
+            elif numero_boletim:
+                destinos.adicionar(df_pdf)
+                for destino in destinos:
+                    destino.descarregar()
+                boletins_existentes.add(numero_boletim)
+                linhas_gravadas += len(df_pdf)
+            manifesto[hashes[caminho]] = entrada
+    finally:
+        salvar_manifesto(manifesto, arquivo_manifesto)
+        destinos.fechar()
+    print("-" * 50)
+    print(f"Importação incremental finalizada: {linhas_gravadas} novas linhas em '{pasta_parquet}' e '{arquivo_csv}'"
+          + (f" e no banco '{arquivo_sqlite}'." if arquivo_sqlite else "."))
+
+def main(pasta_pdfs=PASTA_DOS_PDFS, num_processos=NUM_PROCESSOS, usar_cache=USAR_CACHE, motor=MOTOR_PADRAO,
+         expandir=EXPANDIR_DIAS, arquivo_sqlite=ARQUIVO_SQLITE):
+    print(f"Iniciando importador local da pasta: {pasta_pdfs}")
+
+    arquivos_pdf = [f for f in os.listdir(pasta_pdfs) if f.lower().endswith('.pdf')]
+    total_arquivos = len(arquivos_pdf)
+    print(f"Encontrados {total_arquivos} arquivos PDF para processar com {num_processos} processo(s).")
+
+    inicio = time.perf_counter()
+    caminhos = [os.path.join(pasta_pdfs, nome_arquivo) for nome_arquivo in arquivos_pdf]
+    resultados = processar_em_lote(caminhos, num_processos, usar_cache, motor, expandir)
+    lista_dfs = [df_pdf for _, df_pdf, _, _ in resultados if not df_pdf.empty]
+    falhas = [os.path.basename(caminho) for caminho, _, _, erro in resultados if erro]
+    print(f"\nLote concluído em {time.perf_counter() - inicio:.2f}s ({len(falhas)} arquivo(s) com erro).")
+    for nome_arquivo in falhas:
+        print(f"  -> Falhou: {nome_arquivo}")
 
     if not lista_dfs:
         print("Nenhum dado foi processado. Encerrando.")
         return
-        
+
     print("\nJuntando todos os dados...")
     df_final = pd.concat(lista_dfs, ignore_index=True)
-    
-    # --- CORREÇÃO APLICADA AQUI ---
-    # Forçamos a conversão das colunas para texto com 15 casas decimais.
-    # Isso impede que o pandas use a formatação de localidade do sistema (com separador de milhar).
-    df_final['latitude'] = df_final['latitude'].apply(lambda x: f'{x:.15f}' if pd.notnull(x) else '')
-    df_final['longitude'] = df_final['longitude'].apply(lambda x: f'{x:.15f}' if pd.notnull(x) else '')
-    
-    # Salvamos o resultado no CSV. O parâmetro 'decimal' aqui se torna redundante para as coordenadas, mas o mantemos por segurança.
-    df_final.to_csv(ARQUIVO_SAIDA_CSV, index=False, encoding='utf-8-sig', decimal='.')
-    
+
+    # O dataset Parquet é a base canônica; o CSV continua sendo gerado (do zero) para importar no Google Sheets.
+    destinos = abrir_destinos(arquivo_sqlite, acrescentar_csv=False, expandir=expandir)
+    destinos.adicionar(df_final)
+    for destino in destinos:
+        destino.descarregar()
+    destinos.fechar()
+    # Registra os PDFs lidos sem erro, para que a próxima importação incremental não refaça todos eles
+    salvar_manifesto({hash_arquivo(caminho): _entrada_manifesto(caminho, df_pdf)
+                      for caminho, df_pdf, _, erro in resultados if not erro}, caminho_manifesto(expandir))
+
     print("-" * 50)
     print("PROCESSO FINALIZADO COM SUCESSO!")
-    print(f"Total de {len(df_final)} linhas salvas no arquivo '{ARQUIVO_SAIDA_CSV}'.")
+    pasta_parquet, arquivo_csv = saidas(expandir)
+    print(f"Total de {len(df_final)} linhas salvas em '{pasta_parquet}' e no arquivo '{arquivo_csv}'"
+          + (f" e no banco '{arquivo_sqlite}'." if arquivo_sqlite else "."))
     print("Agora você pode importar este arquivo para o Google Sheets.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Importa os boletins em PDF de uma pasta local para o CSV histórico.")
+    parser.add_argument("--pasta", default=PASTA_DOS_PDFS, help="Pasta com os PDFs dos boletins.")
+    parser.add_argument("--processos", type=int, default=NUM_PROCESSOS, help="Número de processos em paralelo (1 = serial).")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache e reprocessa todos os PDFs.")
+    parser.add_argument("--motor", choices=MOTORES_TABELA, default=MOTOR_PADRAO, help="Motor de extração das tabelas.")
+    parser.add_argument("--por-periodo", action="store_true", help="Uma linha por ponto e boletim, sem expandir os dias.")
+    parser.add_argument("--incremental", action="store_true", help="Processa só os PDFs que ainda não foram importados.")
+    parser.add_argument("--sqlite", metavar="ARQUIVO", default=ARQUIVO_SQLITE, help="Grava também neste banco SQLite local.")
+    args = parser.parse_args()
+    if args.incremental:
+        importar_incremental(args.pasta, args.processos, not args.sem_cache, args.motor, not args.por_periodo, args.sqlite)
+    else:
+        main(args.pasta, args.processos, not args.sem_cache, args.motor, not args.por_periodo, args.sqlite)
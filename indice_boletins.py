@@ -0,0 +1,83 @@
+# indice_boletins.py - Índice compacto (uma linha por boletim) mantido numa aba própria da planilha
+
+from datetime import datetime
+import gspread
+from gspread.utils import rowcol_to_a1
+from escritor_planilha import COLUNA_BOLETIM
+
+# --- Configurações ---
+NOME_PAGINA_INDICE = "IndiceBoletins"
+CABECALHO_INDICE = ["numero_boletim", "linhas", "data_registro"]
+
+class IndiceBoletins:
+    """Lista dos boletins já gravados na aba de dados, com quantas linhas cada um ocupa.
+
+    Ler o índice custa uma linha por boletim, em vez de uma célula por linha diária da aba de dados.
+    Se o índice não existe ou não bate com o fim da aba de dados (linhas escritas por fora do pipeline, ou
+    uma escrita no índice que falhou), ele é reconstruído a partir da coluna de boletins da aba de dados.
+    """
+
+    def __init__(self, sheet, aba_indice):
+        self.sheet = sheet
+        self.aba_indice = aba_indice
+        self.contagens = {}  # numero_boletim -> linhas na aba de dados, na ordem de gravação
+
+    @classmethod
+    def abrir(cls, sheet, nome_pagina=NOME_PAGINA_INDICE):
+        """Abre (ou cria, se ainda não existir) a aba de índice da mesma planilha de `sheet`."""
+        spreadsheet = sheet.spreadsheet
+        try:
+            aba_indice = spreadsheet.worksheet(nome_pagina)
+        except gspread.exceptions.WorksheetNotFound:
+            aba_indice = spreadsheet.add_worksheet(title=nome_pagina, rows=1000, cols=len(CABECALHO_INDICE))
+            # Sem o cabeçalho, os boletins registrados depois fariam a próxima leitura refazer o índice inteiro
+            aba_indice.update(values=[CABECALHO_INDICE], range_name="A1", value_input_option="RAW")
+        return cls(sheet, aba_indice)
+
+    def carregar(self):
+        """Devolve o conjunto de boletins gravados, reconstruindo o índice se estiver ausente ou desatualizado."""
+        valores = self.aba_indice.get_all_values()
+        if not valores or valores[0] != CABECALHO_INDICE:
+            print("Índice de boletins ausente. Reconstruindo a partir da aba de dados...")
+            return self.reconstruir()
+        try:
+            self.contagens = {linha[0]: int(linha[1]) for linha in valores[1:] if linha and linha[0]}
+        except (IndexError, ValueError):
+            print("Índice de boletins inválido. Reconstruindo a partir da aba de dados...")
+            return self.reconstruir()
+        if not self._consistente():
+            print("Índice de boletins desatualizado. Reconstruindo a partir da aba de dados...")
+            return self.reconstruir()
+        return set(self.contagens)
+
+    def _consistente(self):
+        # Confere só duas células da aba de dados: a última linha prevista pelo índice deve ser do último
+        # boletim do índice, e a linha seguinte deve estar vazia.
+        ultima_linha = sum(self.contagens.values()) + 1  # +1 pelo cabeçalho
+        intervalo = f"{rowcol_to_a1(ultima_linha, COLUNA_BOLETIM)}:{rowcol_to_a1(ultima_linha + 1, COLUNA_BOLETIM)}"
+        celulas = [linha[0] if linha else "" for linha in self.sheet.get(intervalo)]
+        celulas += [""] * (2 - len(celulas))
+        if self.contagens and celulas[0] != next(reversed(self.contagens)):
+            return False
+        return celulas[1] == ""
+
+    def reconstruir(self):
+        contagens = {}
+        for numero_boletim in self.sheet.col_values(COLUNA_BOLETIM)[1:]:
+            if numero_boletim:
+                contagens[numero_boletim] = contagens.get(numero_boletim, 0) + 1
+        self.contagens = contagens
+        agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        linhas = [CABECALHO_INDICE] + [[numero, str(qtd), agora] for numero, qtd in contagens.items()]
+        self.aba_indice.clear()
+        self.aba_indice.update(values=linhas, range_name="A1", value_input_option="RAW")
+        return set(contagens)
+
+    def registrar(self, contagens):
+        """Acrescenta ao índice os boletins recém-gravados na aba de dados ({numero_boletim: linhas})."""
+        novos = {numero: qtd for numero, qtd in contagens.items() if numero not in self.contagens}
+        if not novos: return
+        agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.aba_indice.append_rows([[numero, str(qtd), agora] for numero, qtd in novos.items()],
+                                    value_input_option="RAW")
+        self.contagens.update(novos)
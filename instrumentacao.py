@@ -0,0 +1,112 @@
+# instrumentacao.py - Eventos estruturados, contadores e tempos por etapa dos scrapers, com resumo em JSON
+
+import os
+import json
+import time
+import platform
+from datetime import datetime, timezone
+from contextlib import contextmanager
+
+# --- Configurações ---
+PASTA_METRICAS = "metricas"   # publicada como artefato pelo GitHub Actions
+
+def _agora():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+def percentil(valores, p):
+    """Percentil `p` (0-100) com interpolação linear entre os vizinhos; 0.0 para uma lista vazia."""
+    if not valores: return 0.0
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * p / 100
+    i = int(k)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (k - i)
+
+class Execucao:
+    """Registra o que acontece numa execução de um scraper.
+
+    Cada evento vira uma linha JSON em `<pasta>/<script>-eventos.jsonl`, e `finalizar()` grava em
+    `<pasta>/<script>-resumo.json` os contadores, as estatísticas de cada etapa e o resultado de cada boletim.
+    Os prints continuam sendo a saída para quem lê o log; estes arquivos são para comparar execuções.
+    """
+
+    def __init__(self, script, pasta=PASTA_METRICAS):
+        self.script = script
+        self.pasta = pasta
+        self.inicio = _agora()
+        self._inicio_relogio = time.perf_counter()
+        self.contadores = {}
+        self.tempos = {}      # etapa -> [segundos, ...]
+        self.erros = {}       # etapa -> quantidade
+        self.boletins = []
+        os.makedirs(pasta, exist_ok=True)
+        self._eventos = open(os.path.join(pasta, f"{script}-eventos.jsonl"), "w", encoding="utf-8")
+        self.evento("inicio", python=platform.python_version())
+
+    def evento(self, tipo, **campos):
+        registro = {"momento": _agora(), "script": self.script, "evento": tipo, **campos}
+        self._eventos.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+        self._eventos.flush()
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def registrar_tempo(self, etapa, segundos, erro=None, **campos):
+        self.tempos.setdefault(etapa, []).append(segundos)
+        if erro is not None:
+            self.erros[etapa] = self.erros.get(etapa, 0) + 1
+        self.evento("etapa", etapa=etapa, segundos=round(segundos, 4), erro=None if erro is None else repr(erro), **campos)
+
+    @contextmanager
+    def etapa(self, nome, **campos):
+        """Cronometra o bloco como uma execução da etapa `nome`; um erro é registrado e propagado."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.registrar_tempo(nome, time.perf_counter() - inicio, erro=e, **campos)
+            raise
+        self.registrar_tempo(nome, time.perf_counter() - inicio, **campos)
+
+    def boletim(self, numero_boletim, resultado, **campos):
+        """Resultado de um boletim: "novo", "existente", "sem_dados" ou "erro", com linhas, origem etc."""
+        registro = {"numero_boletim": numero_boletim, "resultado": resultado, **campos}
+        self.boletins.append(registro)
+        self.contar(f"boletins_{resultado}")
+        self.evento("boletim", **registro)
+
+    def resumo(self, status):
+        duracao = time.perf_counter() - self._inicio_relogio
+        etapas = {}
+        for nome, tempos in self.tempos.items():
+            etapas[nome] = {
+                "execucoes": len(tempos),
+                "erros": self.erros.get(nome, 0),
+                "total_s": round(sum(tempos), 4),
+                "p50_ms": round(percentil(tempos, 50) * 1000, 2),
+                "p95_ms": round(percentil(tempos, 95) * 1000, 2),
+                "max_ms": round(max(tempos) * 1000, 2),
+            }
+        com_resultado = [b for b in self.boletins if b["resultado"] != "existente"]
+        falhas = sum(1 for b in com_resultado if b["resultado"] in ("erro", "sem_dados"))
+        return {
+            "script": self.script,
+            "status": status,
+            "inicio": self.inicio,
+            "fim": _agora(),
+            "duracao_s": round(duracao, 3),
+            "contadores": self.contadores,
+            "etapas": etapas,
+            "taxa_falha_boletins": round(falhas / len(com_resultado), 4) if com_resultado else 0.0,
+            "boletins": self.boletins,
+        }
+
+    def finalizar(self, status="ok"):
+        """Grava o resumo da execução e devolve o caminho do arquivo."""
+        resumo = self.resumo(status)
+        self.evento("fim", status=status, duracao_s=resumo["duracao_s"])
+        self._eventos.close()
+        caminho = os.path.join(self.pasta, f"{self.script}-resumo.json")
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2, default=str)
+        return caminho
@@ -0,0 +1,69 @@
+# registro_pontos.py - Cadastro dos pontos de coleta (zona, coordenadas e nome), montado uma vez na importação
+
+import sys
+import numpy as np
+import pandas as pd
+from coordenadas import COORDENADAS_POR_CODIGO, NOMES_POR_CODIGO
+
+# --- Configurações ---
+# A última letra do código do ponto indica a zona (ex.: 12C fica no Centro)
+ZONAS_POR_SUFIXO = {"L": "Leste", "C": "Centro", "O": "Oeste"}
+# Coordenadas fora desta caixa não estão no litoral de Fortaleza
+LIMITES_LATITUDE = (-3.90, -3.65)
+LIMITES_LONGITUDE = (-38.65, -38.35)
+COLUNAS_REGISTRO = ["zona", "latitude", "longitude", "nome_canonico"]
+
+def _coordenadas(texto):
+    try:
+        latitude, longitude = (float(parte) for parte in texto.split(","))
+    except (AttributeError, ValueError):
+        return np.nan, np.nan
+    return latitude, longitude
+
+def montar_registro(coordenadas=COORDENADAS_POR_CODIGO, nomes=NOMES_POR_CODIGO):
+    """Tabela indexada por id_ponto com zona, latitude/longitude em float e o nome do ponto nos boletins."""
+    codigos = sorted(set(coordenadas) | set(nomes))
+    latitudes, longitudes = zip(*(_coordenadas(coordenadas.get(codigo)) for codigo in codigos)) if codigos else ((), ())
+    registro = pd.DataFrame({
+        "zona": [ZONAS_POR_SUFIXO.get(codigo[-1:]) for codigo in codigos],
+        "latitude": np.array(latitudes, dtype="float64"),
+        "longitude": np.array(longitudes, dtype="float64"),
+        "nome_canonico": [nomes.get(codigo) for codigo in codigos],
+    }, index=pd.Index(codigos, name="id_ponto"))
+    return registro
+
+def validar_registro(registro):
+    """Lista de problemas do cadastro: zona desconhecida, coordenada ausente ou fora de Fortaleza, nome divergente."""
+    problemas = []
+    for codigo, ponto in registro.iterrows():
+        if ponto["zona"] is None:
+            problemas.append(f"{codigo}: sufixo sem zona conhecida")
+        if np.isnan(ponto["latitude"]) or np.isnan(ponto["longitude"]):
+            problemas.append(f"{codigo}: coordenadas ausentes ou ilegíveis")
+            continue
+        if not LIMITES_LATITUDE[0] <= ponto["latitude"] <= LIMITES_LATITUDE[1]:
+            problemas.append(f"{codigo}: latitude {ponto['latitude']} fora de Fortaleza")
+        if not LIMITES_LONGITUDE[0] <= ponto["longitude"] <= LIMITES_LONGITUDE[1]:
+            problemas.append(f"{codigo}: longitude {ponto['longitude']} fora de Fortaleza")
+        if ponto["nome_canonico"] is not None and not ponto["nome_canonico"].startswith(codigo):
+            problemas.append(f"{codigo}: nome não começa pelo código ({ponto['nome_canonico']!r})")
+    return problemas
+
+def _descartar_coordenadas_invalidas(registro):
+    # Uma coordenada errada iria para a planilha em todas as linhas do ponto; melhor deixá-la em branco
+    fora = ~(registro["latitude"].between(*LIMITES_LATITUDE) & registro["longitude"].between(*LIMITES_LONGITUDE))
+    registro.loc[fora, ["latitude", "longitude"]] = np.nan
+    return registro
+
+REGISTRO_PONTOS = montar_registro()
+PROBLEMAS_REGISTRO = validar_registro(REGISTRO_PONTOS)
+if PROBLEMAS_REGISTRO:
+    print(f"Aviso: {len(PROBLEMAS_REGISTRO)} problema(s) no cadastro de pontos (rode registro_pontos.py para ver).")
+    REGISTRO_PONTOS = _descartar_coordenadas_invalidas(REGISTRO_PONTOS)
+
+if __name__ == "__main__":
+    print(montar_registro().to_string(columns=["zona", "latitude", "longitude"]))
+    for problema in PROBLEMAS_REGISTRO:
+        print(f"  -> {problema}")
+    print(f"{len(REGISTRO_PONTOS)} pontos, {len(PROBLEMAS_REGISTRO)} problema(s).")
+    sys.exit(1 if PROBLEMAS_REGISTRO else 0)
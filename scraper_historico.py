@@ -1,15 +1,18 @@
 # scraper_historico.py (VERSÃO COM LANTERNA DE DEPURAÇÃO)
 
 import gspread
-import pandas as pd
 import os
-import io
 import json
+import time
+import argparse
 import httplib2
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
-from core_parser import processar_pdf_completo, extrair_metadados_pdf
+from drive_boletins import (DOWNLOADS_PARALELOS, baixar_em_paralelo, carregar_ids_vistos, carregar_marca_listagem,
+                            filtrar_novos, listar_pdfs_drive, salvar_ids_vistos, salvar_marca_listagem)
+from instrumentacao import Execucao
+# Os destinos e o cache dos boletins (pandas, core_parser, pyarrow no SQLite) são importados só quando usados:
+# o banco SQLite só com --sqlite, e o parser só quando a listagem traz algum arquivo para baixar.
 
 httplib2.Http.DEFAULT_TIMEOUT = 60
 
@@ -18,7 +21,9 @@ NOME_ARQUIVO_CREDENCIAL = "credentials.json"
 NOME_PLANILHA = "balneabilidade_fortaleza" # Verifique se este nome está EXATO
 NOME_PAGINA = "DadosBalneabilidade"
 ID_PASTA_DRIVE = "1EVjIW4bITy1Jh5uqIFQ2ornZGkBgCSPe" # <<<!!! GARANTA QUE ESTE É O ID DA SUA CÓPIA !!!>>>
-ARQUIVO_PDF_TEMP = "boletim_historico_temp.pdf"
+# Destinos dos boletins: a planilha e/ou um banco SQLite local (None = sem banco; ver banco_sqlite.py)
+USAR_PLANILHA = True
+ARQUIVO_SQLITE = None
 
 # --- Funções do Google ---
 def conectar_google_apis():
@@ -33,86 +38,164 @@ def conectar_google_apis():
     sheet_client = gspread.authorize(creds)
     spreadsheet = sheet_client.open(NOME_PLANILHA)
     sheet = spreadsheet.worksheet(NOME_PAGINA)
-    drive_service = build('drive', 'v3', credentials=creds)
-    return sheet, drive_service
+    # Cada thread de download precisa do seu próprio cliente do Drive
+    criar_servico_drive = lambda: build('drive', 'v3', credentials=creds, cache_discovery=False)
+    return sheet, criar_servico_drive
 
-def obter_boletins_existentes(sheet):
-    try:
-        return set(sheet.col_values(8)[1:])
-    except gspread.exceptions.APIError as e:
-        print(f"Erro de API ao buscar colunas: {e}.")
-        return set()
-
-def adicionar_dados_planilha(sheet, df):
-    dados_para_adicionar = df.fillna('').astype(str).values.tolist()
-    if dados_para_adicionar:
-        sheet.append_rows(dados_para_adicionar, value_input_option="USER_ENTERED")
+def abrir_destinos(sheet, usar_planilha=USAR_PLANILHA, arquivo_sqlite=ARQUIVO_SQLITE):
+    from destinos import Destinos
+    destinos = []
+    if usar_planilha:
+        from escritor_planilha import DestinoPlanilha
+        from indice_boletins import IndiceBoletins
+        destinos.append(DestinoPlanilha(sheet, IndiceBoletins.abrir(sheet)))
+    if arquivo_sqlite:
+        from banco_sqlite import DestinoSQLite
+        destinos.append(DestinoSQLite(arquivo_sqlite))
+    return Destinos(destinos)
 
 # --- Lógica Principal ---
-def main():
+def main(listagem_completa=False, usar_planilha=USAR_PLANILHA, arquivo_sqlite=ARQUIVO_SQLITE):
+    execucao = Execucao("scraper_historico")
+    status = "erro"
+    try:
+        status = executar(execucao, listagem_completa, usar_planilha, arquivo_sqlite)
+    finally:
+        print(f"Resumo da execução gravado em {execucao.finalizar(status)}.")
+
+def executar(execucao, listagem_completa=False, usar_planilha=USAR_PLANILHA, arquivo_sqlite=ARQUIVO_SQLITE):
     print("Iniciando scraper histórico (versão com depuração)...")
     
     try:
-        sheet, drive_service = conectar_google_apis()
-        boletins_existentes = obter_boletins_existentes(sheet)
-        print(f"Encontrados {len(boletins_existentes)} boletins na planilha.")
+        with execucao.etapa("conexao_google"):
+            sheet, criar_servico_drive = conectar_google_apis()
+            drive_service = criar_servico_drive()
+            destinos = abrir_destinos(sheet, usar_planilha, arquivo_sqlite)
+        with execucao.etapa("leitura_indice"):
+            boletins_existentes = destinos.boletins_existentes()
+        for nome, existentes in destinos.existentes_por_destino.items():
+            execucao.contar(f"boletins_em_{nome}", len(existentes))
+            print(f"Encontrados {len(existentes)} boletins em {nome}.")
     except Exception as e:
         print(f"Erro ao conectar com as APIs do Google: {e}")
-        return
+        return "erro_conexao"
 
     try:
         # --- NOSSA LANTERNA DE DEPURAÇÃO ---
         print(f"--- DEBUG: Buscando na pasta com ID: {ID_PASTA_DRIVE} ---")
         
         query = f"'{ID_PASTA_DRIVE}' in parents and name contains 'FORTALEZA' and mimeType='application/pdf'"
-        
-        response = drive_service.files().list(
-            q=query,
-            pageSize=1000,
-            fields='files(id, name)',
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True
-        ).execute()
-        
-        files = response.get('files', [])
-        print(f"Encontrados {len(files)} boletins de Fortaleza no Google Drive.")
+        # Depois da primeira execução, só os arquivos criados ou alterados desde a última são listados
+        marca = None if listagem_completa else carregar_marca_listagem(ID_PASTA_DRIVE)
+        with execucao.etapa("listagem_drive", incremental=bool(marca)):
+            files, paginas = listar_pdfs_drive(drive_service, query, modificados_desde=marca)
+        execucao.contar("paginas_listadas", paginas)
+        execucao.contar("arquivos_listados", len(files))
+        desde = f" alterados desde {marca}" if marca else ""
+        print(f"Encontrados {len(files)} boletins de Fortaleza{desde} no Google Drive ({paginas} página(s)).")
 
     except Exception as e:
         print(f"Erro ao listar arquivos do Google Drive: {e}")
-        return
+        return "erro_listagem"
+
+    # Boletins já conhecidos pelo nome do arquivo (ou pelo id, de execuções anteriores) nem são baixados
+    ids_vistos = carregar_ids_vistos()
+    arquivos_listados = files
+    files = filtrar_novos(sorted(files, key=lambda x: x['name']), boletins_existentes, ids_vistos)
+    execucao.contar("arquivos_pulados_sem_download", len(arquivos_listados) - len(files))
+    print(f"{len(files)} arquivo(s) a baixar ({DOWNLOADS_PARALELOS} downloads em paralelo).")
+    if files:
+        with execucao.etapa("importacoes"):
+            from cache_boletins import DocumentoComCache
 
-    # O resto do código continua igual...
+    # As linhas de todos os boletins novos são enviadas juntas no fim, em poucas chamadas à API
     novos_boletins_processados = 0
-    for file in sorted(files, key=lambda x: x['name']):
+    erros = 0
+    for file, conteudo, erro, segundos in baixar_em_paralelo(files, criar_servico_drive):
+        execucao.registrar_tempo("download", segundos, erro=erro, arquivo=file.get('name'))
+        if erro:
+            print(f"  -> Erro ao baixar o arquivo {file.get('name')}: {erro}")
+            execucao.boletim(None, "erro", arquivo=file.get('name'), etapa="download", erro=repr(erro))
+            erros += 1
+            continue
+        execucao.contar("bytes_baixados", len(conteudo))
         try:
-            request = drive_service.files().get_media(fileId=file.get('id'))
-            fh = io.FileIO(ARQUIVO_PDF_TEMP, 'wb')
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while done is False:
-                _, done = downloader.next_chunk()
-            
-            numero_boletim, _ = extrair_metadados_pdf(ARQUIVO_PDF_TEMP)
-            if not numero_boletim or numero_boletim in boletins_existentes:
-                continue
-            
-            print(f"Processando novo boletim: {numero_boletim} ({file.get('name')})")
-            link_drive = f"https://drive.google.com/file/d/{file.get('id')}/view"
-            df_novo = processar_pdf_completo(ARQUIVO_PDF_TEMP, link_boletim=link_drive)
+            # O PDF é processado a partir da memória enquanto os próximos downloads continuam
+            with DocumentoComCache(conteudo) as doc:
+                with execucao.etapa("metadados"):
+                    numero_boletim, _ = doc.metadados()
+                # Uma falha ao ler os metadados pode ser passageira; só um PDF lido sem erro fica marcado como visto
+                if "metadados" not in doc.erros:
+                    ids_vistos[file.get('id')] = numero_boletim
+                if not numero_boletim:
+                    execucao.boletim(None, "sem_dados", arquivo=file.get('name'), erro=repr(doc.erros.get("metadados")))
+                    if "metadados" in doc.erros:
+                        erros += 1
+                    continue
+                if numero_boletim in boletins_existentes:
+                    execucao.boletim(numero_boletim, "existente", arquivo=file.get('name'))
+                    continue
+
+                print(f"Processando novo boletim: {numero_boletim} ({file.get('name')})")
+                link_drive = f"https://drive.google.com/file/d/{file.get('id')}/view"
+                inicio = time.perf_counter()
+                with execucao.etapa("extracao", numero_boletim=numero_boletim):
+                    df_novo = doc.processar(link_boletim=link_drive)
+                segundos_extracao = time.perf_counter() - inicio
             
             if not df_novo.empty:
-                adicionar_dados_planilha(sheet, df_novo)
+                destinos.adicionar(df_novo)
                 boletins_existentes.add(numero_boletim)
                 novos_boletins_processados += 1
-                print(f"  -> Adicionado com sucesso.")
+                execucao.contar("linhas_produzidas", len(df_novo))
+                execucao.boletim(numero_boletim, "novo", arquivo=file.get('name'), linhas=len(df_novo),
+                                 bytes=len(conteudo), segundos_download=round(segundos, 4),
+                                 segundos_extracao=round(segundos_extracao, 4))
+                print(f"  -> {len(df_novo)} linhas aguardando gravação.")
+            elif doc.erros:
+                execucao.boletim(numero_boletim, "sem_dados", arquivo=file.get('name'), erro=repr(doc.erros.get("extracao")))
+                erros += 1
+            else:
+                # Lido sem erro e sem pontos (ex.: os boletins mensais): o resultado é definitivo, o arquivo não é
+                # baixado de novo e não segura a marca da listagem
+                execucao.boletim(numero_boletim, "sem_dados", arquivo=file.get('name'))
+                ids_vistos[file.get('id')] = None
             
         except Exception as e:
             print(f"  -> Erro inesperado ao processar o arquivo {file.get('name')}: {e}")
-        finally:
-            if os.path.exists(ARQUIVO_PDF_TEMP):
-                os.remove(ARQUIVO_PDF_TEMP)
+            execucao.boletim(None, "erro", arquivo=file.get('name'), etapa="processamento", erro=repr(e))
+            erros += 1
+
+    status = "ok" if not erros else "parcial"
+    # Cada destino é gravado mesmo que outro falhe
+    for destino in destinos:
+        try:
+            with execucao.etapa(f"escrita_{destino.nome}"):
+                linhas_enviadas = destino.descarregar()
+            execucao.contar(f"linhas_enviadas_{destino.nome}", linhas_enviadas)
+            print(f"\n{linhas_enviadas} linhas gravadas em {destino.nome}.")
+        except Exception as e:
+            print(f"\nErro ao gravar em {destino.nome}: {e}.")
+            status = "erro_escrita"
+    for nome, valor in destinos.metricas().items():
+        execucao.contar(nome, valor)
+    destinos.fechar()
+    # A marca só avança quando tudo o que foi listado chegou a todos os destinos; senão a próxima execução relista.
+    # Um boletim cuja leitura falhou (doc.erros) também conta como erro: a marca não pode passar por ele
+    if not erros and status != "erro_escrita":
+        salvar_marca_listagem(ID_PASTA_DRIVE, arquivos_listados)
+    salvar_ids_vistos(ids_vistos)
 
     print(f"\nScraper histórico finalizado. Total de novos boletins processados: {novos_boletins_processados}.")
+    return status
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Importa para a planilha os boletins da pasta do Google Drive.")
+    parser.add_argument("--listagem-completa", action="store_true",
+                        help="Lista a pasta inteira, ignorando a marca da última execução.")
+    parser.add_argument("--sqlite", metavar="ARQUIVO", default=ARQUIVO_SQLITE, help="Grava também neste banco SQLite local.")
+    parser.add_argument("--sem-planilha", action="store_true", help="Não grava no Google Sheets (exige --sqlite).")
+    args = parser.parse_args()
+    if args.sem_planilha and not args.sqlite:
+        parser.error("--sem-planilha exige --sqlite: os boletins precisam de ao menos um destino.")
+    main(args.listagem_completa, usar_planilha=USAR_PLANILHA and not args.sem_planilha, arquivo_sqlite=args.sqlite)
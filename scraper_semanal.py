@@ -1,25 +1,32 @@
 # scraper_semanal.py (VERSÃO FINAL PARA GITHUB ACTIONS)
 
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import gspread
-import pandas as pd
 import os
 import json
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from core_parser import processar_pdf_completo, extrair_metadados_pdf
+import argparse
+from busca_http import BuscaCondicional
+from instrumentacao import Execucao
+# gspread, as credenciais do Google, os destinos e o core_parser (pandas, pdfplumber, camelot) são importados só
+# depois que a página da SEMACE mostra um boletim ainda não gravado: na semana sem novidade a execução termina sem eles.
+# benchmarks/bench_importacao.py confere que continua assim.
 
 # --- Configurações ---
 URL_BASE = "https://www.semace.ce.gov.br/boletim-de-balneabilidade/"
 NOME_ARQUIVO_CREDENCIAL = "credentials.json"
 NOME_PLANILHA = "balneabilidade_fortaleza" # <<<!!! TROQUE PELO NOME EXATO DA SUA PLANILHA !!!>>>
 NOME_PAGINA = "DadosBalneabilidade"
-ARQUIVO_PDF_TEMP = "boletim_semanal_temp.pdf"
+PASTA_PDF_TEMP = "boletins_semanal_temp"
+# Quantos links mais recentes da página são conferidos a cada execução (1 = apenas o último boletim)
+RECUPERAR_ULTIMOS = 8
+# Destinos dos boletins: a planilha e/ou um banco SQLite local (None = sem banco; ver banco_sqlite.py)
+USAR_PLANILHA = True
+ARQUIVO_SQLITE = None
 
 # --- Funções do Google Sheets ---
 def conectar_google_apis():
+    import gspread
+    from google.oauth2.service_account import Credentials
     scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive.readonly"]
     google_creds_json = os.getenv('GOOGLE_CREDS')
     if google_creds_json:
@@ -33,74 +40,177 @@ def conectar_google_apis():
     sheet = spreadsheet.worksheet(NOME_PAGINA)
     return sheet, None # Retorna None para drive_service, já que não é usado aqui
 
-def obter_boletins_existentes(sheet):
-    try:
-        return set(sheet.col_values(8)[1:])
-    except gspread.exceptions.APIError as e:
-        print(f"Erro de API ao buscar colunas: {e}.")
-        return set()
-
-def adicionar_dados_planilha(sheet, df):
-    dados_para_adicionar = df.fillna('').astype(str).values.tolist()
-    if dados_para_adicionar:
-        sheet.append_rows(dados_para_adicionar, value_input_option="USER_ENTERED")
+def abrir_destinos(usar_planilha=USAR_PLANILHA, arquivo_sqlite=ARQUIVO_SQLITE):
+    from destinos import Destinos
+    destinos = []
+    if usar_planilha:
+        from escritor_planilha import DestinoPlanilha
+        from indice_boletins import IndiceBoletins
+        sheet, _ = conectar_google_apis()
+        destinos.append(DestinoPlanilha(sheet, IndiceBoletins.abrir(sheet)))
+    if arquivo_sqlite:
+        from banco_sqlite import DestinoSQLite
+        destinos.append(DestinoSQLite(arquivo_sqlite))
+    return Destinos(destinos)
 
 # --- Lógica Principal ---
-def main():
-    print("Iniciando scraper semanal...")
+def main(recuperar=RECUPERAR_ULTIMOS, usar_planilha=USAR_PLANILHA, arquivo_sqlite=ARQUIVO_SQLITE):
+    execucao = Execucao("scraper_semanal")
+    status = "erro"
     try:
-        sheet, _ = conectar_google_apis()
-        boletins_existentes = obter_boletins_existentes(sheet)
-        print(f"Encontrados {len(boletins_existentes)} boletins na planilha.")
-    except Exception as e:
-        print(f"Erro ao conectar com o Google Sheets: {e}")
-        return
+        status = executar(execucao, recuperar, usar_planilha, arquivo_sqlite)
+    finally:
+        print(f"Resumo da execução gravado em {execucao.finalizar(status)}.")
+
+def executar(execucao, recuperar=RECUPERAR_ULTIMOS, usar_planilha=USAR_PLANILHA, arquivo_sqlite=ARQUIVO_SQLITE):
+    print("Iniciando scraper semanal...")
+    busca = BuscaCondicional()
 
+    # O site é consultado antes de conectar ao Google: numa semana sem boletim novo a execução termina com um 304
     try:
-        res = requests.get(URL_BASE)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
+        with execucao.etapa("listagem_site"):
+            html = busca.buscar_texto(URL_BASE)
+        if html is None:
+            execucao.contar("respostas_304")
+            print("A página de boletins não mudou desde a última execução. Encerrando.")
+            return "sem_novidades"
+        soup = BeautifulSoup(html, "html.parser")
         links_boletim = [a['href'] for a in soup.find_all('a', href=True) if "Boletim das Praias de Fortaleza" in a.get_text()]
         if not links_boletim:
             print("Nenhum link de boletim de Fortaleza encontrado na página.")
-            return
-        ultimo_boletim_url = urljoin(URL_BASE, links_boletim[0])
-        print(f"URL do último boletim: {ultimo_boletim_url}")
+            return "sem_links"
+        # Os links mais recentes vêm primeiro; além do último, os anteriores cobrem semanas em que a execução
+        # falhou e semanas com mais de um boletim publicado
+        urls_boletim = list(dict.fromkeys(urljoin(URL_BASE, link) for link in links_boletim))[:recuperar]
+        execucao.contar("links_conferidos", len(urls_boletim))
+        print(f"URL do último boletim: {urls_boletim[0]}")
     except Exception as e:
         print(f"Erro ao buscar link no site da SEMACE: {e}")
-        return
+        return "erro_site"
+
+    urls_pendentes = [url for url in urls_boletim if not busca.ja_processado(url)]
+    if not urls_pendentes:
+        print(f"Os {len(urls_boletim)} boletins mais recentes já foram gravados em execuções anteriores. Encerrando.")
+        busca.salvar()
+        return "sem_novidades"
+
+    with execucao.etapa("importacoes"):
+        from core_parser import DocumentoBoletim, numero_pelo_nome
 
     try:
-        res_pdf = requests.get(ultimo_boletim_url, stream=True)
-        res_pdf.raise_for_status()
-        with open(ARQUIVO_PDF_TEMP, "wb") as f:
-            f.write(res_pdf.content)
+        with execucao.etapa("conexao_destinos"):
+            destinos = abrir_destinos(usar_planilha, arquivo_sqlite)
+        with execucao.etapa("leitura_indice"):
+            boletins_existentes = destinos.boletins_existentes()
+        for nome, existentes in destinos.existentes_por_destino.items():
+            execucao.contar(f"boletins_em_{nome}", len(existentes))
+            print(f"Encontrados {len(existentes)} boletins em {nome}.")
     except Exception as e:
-        print(f"Erro ao baixar o PDF: {e}")
-        return
-
-    numero_boletim, _ = extrair_metadados_pdf(ARQUIVO_PDF_TEMP)
-    if not numero_boletim or numero_boletim in boletins_existentes:
-        if numero_boletim:
-            print(f"Boletim {numero_boletim} já existe na planilha. Encerrando.")
-        else:
-            print("Não foi possível extrair o número do boletim do PDF baixado.")
-        if os.path.exists(ARQUIVO_PDF_TEMP):
-            os.remove(ARQUIVO_PDF_TEMP)
-        return
-
-    print(f"Boletim {numero_boletim} é novo. Processando...")
-    df_novo = processar_pdf_completo(ARQUIVO_PDF_TEMP, link_boletim=ultimo_boletim_url)
-
-    if not df_novo.empty:
-        adicionar_dados_planilha(sheet, df_novo)
-        print(f"{len(df_novo)} linhas adicionadas à planilha com sucesso.")
-    else:
-        print("O processamento do PDF não retornou dados.")
+        print(f"Erro ao abrir os destinos dos boletins: {e}")
+        return "erro_conexao"
+
+    # Quando o número do boletim aparece na URL, os já gravados em todos os destinos nem são baixados
+    for url in urls_pendentes:
+        numero_boletim = numero_pelo_nome(url)
+        if numero_boletim in boletins_existentes:
+            busca.marcar_processado(url, numero_boletim)
+            execucao.boletim(numero_boletim, "existente", url=url)
+    urls_pendentes = [url for url in urls_pendentes if not busca.ja_processado(url)]
+    # Um PDF pendente precisa ser baixado por inteiro mesmo que já tenha vindo antes (o processamento ou a
+    # gravação falhou); com os validadores antigos o servidor responderia 304 e ele seria pulado de novo
+    for url in urls_pendentes:
+        busca.descartar_validadores(url)
+    print(f"{len(urls_pendentes)} boletim(ns) a verificar.")
+
+    # Os PDFs são baixados em paralelo e cada um é processado assim que chega; a escrita é uma só no fim
+    novos, falhas = {}, 0
+    for url, caminho_pdf, erro, segundos in busca.baixar_varios(urls_pendentes, PASTA_PDF_TEMP):
+        execucao.registrar_tempo("download", segundos, erro=erro, url=url)
+        if erro:
+            print(f"Erro ao baixar o PDF {url}: {erro}")
+            execucao.boletim(None, "erro", url=url, etapa="download", erro=repr(erro))
+            falhas += 1
+            continue
+        if caminho_pdf is None:
+            execucao.contar("respostas_304")
+            continue  # 304: o PDF não mudou desde que foi gravado
+        tamanho = os.path.getsize(caminho_pdf)
+        execucao.contar("bytes_baixados", tamanho)
+        try:
+            with DocumentoBoletim(caminho_pdf) as doc:
+                with execucao.etapa("metadados"):
+                    numero_boletim, _ = doc.metadados()
+                if not numero_boletim:
+                    print(f"Não foi possível extrair o número do boletim de {url}.")
+                    execucao.boletim(None, "sem_dados", url=url, erro=repr(doc.erros.get("metadados")))
+                    if "metadados" in doc.erros:
+                        falhas += 1
+                    else:
+                        # Lido sem erro: o resultado não muda de uma execução para outra e o link não é conferido de novo
+                        busca.marcar_processado(url, None)
+                elif numero_boletim in boletins_existentes or numero_boletim in novos.values():
+                    print(f"Boletim {numero_boletim} já foi gravado.")
+                    busca.marcar_processado(url, numero_boletim)
+                    execucao.boletim(numero_boletim, "existente", url=url)
+                else:
+                    print(f"Boletim {numero_boletim} é novo. Processando...")
+                    with execucao.etapa("extracao", numero_boletim=numero_boletim):
+                        df_novo = doc.processar(link_boletim=url)
+                    if df_novo.empty and doc.erros:
+                        print(f"  -> O processamento do boletim {numero_boletim} não retornou dados.")
+                        execucao.boletim(numero_boletim, "sem_dados", url=url, erro=repr(doc.erros.get("extracao")))
+                        falhas += 1
+                    elif df_novo.empty:
+                        # Lido sem erro e sem pontos (ex.: os boletins mensais): não há o que gravar nem o que tentar de novo
+                        print(f"  -> O boletim {numero_boletim} não tem pontos de coleta.")
+                        busca.marcar_processado(url, numero_boletim)
+                        execucao.boletim(numero_boletim, "sem_dados", url=url)
+                    else:
+                        destinos.adicionar(df_novo)
+                        novos[url] = numero_boletim
+                        execucao.contar("linhas_produzidas", len(df_novo))
+                        execucao.boletim(numero_boletim, "novo", url=url, linhas=len(df_novo), bytes=tamanho,
+                                         segundos_download=round(segundos, 4))
+        except Exception as e:
+            print(f"Erro ao processar o PDF {url}: {e}")
+            execucao.boletim(None, "erro", url=url, etapa="processamento", erro=repr(e))
+            falhas += 1
+        finally:
+            os.remove(caminho_pdf)
+
+    status = "ok" if not falhas else "parcial"
+    # Cada destino é gravado mesmo que outro falhe; o que não foi gravado em todos é refeito na próxima execução
+    for destino in destinos if novos else ():
+        try:
+            with execucao.etapa(f"escrita_{destino.nome}"):
+                linhas_enviadas = destino.descarregar()
+            execucao.contar(f"linhas_enviadas_{destino.nome}", linhas_enviadas)
+            print(f"{linhas_enviadas} linhas de {len(novos)} boletim(ns) gravadas em {destino.nome}.")
+        except Exception as e:
+            print(f"Erro ao gravar em {destino.nome}: {e}")
+            status = "erro_escrita"
+    for nome, valor in destinos.metricas().items():
+        execucao.contar(nome, valor)
+    destinos.fechar()
+
+    # Só depois da escrita o estado vai para o disco
+    if status != "erro_escrita":
+        for url, numero_boletim in novos.items():
+            busca.marcar_processado(url, numero_boletim)
+        if falhas:
+            busca.descartar_validadores(URL_BASE)
+        busca.salvar()
 
-    if os.path.exists(ARQUIVO_PDF_TEMP):
-        os.remove(ARQUIVO_PDF_TEMP)
-    print("Scraper semanal finalizado.")
+    print(f"Scraper semanal finalizado ({busca.bytes_baixados} bytes baixados do site da SEMACE).")
+    return status
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Grava na planilha os boletins mais recentes do site da SEMACE.")
+    parser.add_argument("--recuperar", type=int, default=RECUPERAR_ULTIMOS,
+                        help="Quantos links mais recentes conferir (1 = apenas o último boletim).")
+    parser.add_argument("--sqlite", metavar="ARQUIVO", default=ARQUIVO_SQLITE, help="Grava também neste banco SQLite local.")
+    parser.add_argument("--sem-planilha", action="store_true", help="Não grava no Google Sheets (exige --sqlite).")
+    args = parser.parse_args()
+    if args.sem_planilha and not args.sqlite:
+        parser.error("--sem-planilha exige --sqlite: os boletins precisam de ao menos um destino.")
+    main(args.recuperar, usar_planilha=USAR_PLANILHA and not args.sem_planilha, arquivo_sqlite=args.sqlite)